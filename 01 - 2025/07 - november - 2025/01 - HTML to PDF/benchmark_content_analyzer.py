@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Verificación y benchmark del análisis de contenido de html_to_pdf_converter.py
+
+Compara el conteo sobre el árbol que construye WeasyPrint (scan_html_tree)
+con las búsquedas por expresiones regulares que usaba ContentAnalyzer:
+
+1. Equivalencia: documentos generados con encabezados, párrafos, imágenes y
+   tablas deben dar exactamente los mismos conteos con ambos métodos.
+2. Diferencias esperadas: casos en los que las expresiones regulares
+   contaban de más o de menos (<thead> como celda, <pre> como párrafo,
+   tablas anidadas, etiquetas en comentarios o scripts). Se muestran ambos
+   resultados para documentarlos.
+3. Rendimiento: tiempo y pico de memoria con HTML grande generado. El
+   análisis del HTML se mide aparte: convert() ya lo hace para renderizar,
+   así que el costo añadido por ContentAnalyzer es solo el conteo.
+
+El árbol se construye como WeasyPrint (HTML.etree_element) y, si WeasyPrint
+no está disponible, con el mismo parser HTML5 que usa (tinyhtml5 o html5lib).
+
+Uso:
+    python benchmark_content_analyzer.py
+    python benchmark_content_analyzer.py --size-mb 20
+
+Autor: Tutorial Python
+Fecha: 2025
+"""
+
+import re
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from pathlib import Path
+
+from html_to_pdf_converter import scan_html_tree, ensure_weasyprint
+
+
+def load_tree_builder():
+    """Función texto → árbol, con el mismo parser que WeasyPrint (o None)"""
+    has_weasyprint, _ = ensure_weasyprint()
+    if has_weasyprint:
+        from html_to_pdf_converter import HTML
+        return lambda html_content: HTML(string=html_content).etree_element
+    try:
+        import tinyhtml5
+        return lambda html_content: tinyhtml5.parse(html_content, namespace_html_elements=False)
+    except ImportError:
+        pass
+    try:
+        import html5lib
+        return lambda html_content: html5lib.parse(html_content, namespaceHTMLElements=False)
+    except ImportError:
+        return None
+
+
+build_tree = load_tree_builder()
+
+
+# ============================================================================
+# MÉTODO ANTERIOR (REFERENCIA)
+# ============================================================================
+
+def analyze_with_regex(html_content: str) -> dict:
+    """Conteos de las versiones anteriores de analyze_tables y get_statistics"""
+    tables = re.findall(r'<table[^>]*>(.*?)</table>', html_content, re.DOTALL)
+    per_table = [
+        (len(re.findall(r'<tr', table)), len(re.findall(r'<td|<th', table)))
+        for table in tables
+    ]
+    return {
+        'headings': len(re.findall(r'<h[1-6]', html_content)),
+        'paragraphs': len(re.findall(r'<p[^>]*>', html_content)),
+        'images': len(re.findall(r'<img', html_content)),
+        'tables': len(re.findall(r'<table', html_content)),
+        'per_table': per_table,
+    }
+
+
+def count_tree(root) -> dict:
+    structure = scan_html_tree(root)
+    return {
+        'headings': structure.headings,
+        'paragraphs': structure.paragraphs,
+        'images': structure.images,
+        'tables': len(structure.tables),
+        'per_table': [(t['rows'], t['cells']) for t in structure.tables],
+    }
+
+
+# ============================================================================
+# DOCUMENTOS DE PRUEBA
+# ============================================================================
+
+def generate_document(rng: random.Random, blocks: int) -> str:
+    """HTML con la estructura de una memoria de cálculo (sin casos ambiguos para las regex)"""
+    parts = ['<!DOCTYPE html><html><head><meta charset="utf-8"><style>td { padding: 2px; }</style>'
+             '</head><body>']
+    for _ in range(blocks):
+        kind = rng.choice(['h', 'p', 'img', 'table'])
+        if kind == 'h':
+            level = rng.randint(1, 6)
+            parts.append(f'<h{level} class="titulo">Sección {rng.randint(1, 99)}</h{level}>')
+        elif kind == 'p':
+            parts.append(f'<p style="margin: 0">Cálculo de carga &amp; <b>resultado</b> {rng.random():.3f}</p>')
+        elif kind == 'img':
+            parts.append(f'<img src="figura_{rng.randint(1, 9)}.png" alt="figura"/>')
+        else:
+            columns = rng.randint(1, 6)
+            rows = [
+                '<tr>' + ''.join(f'<td>{rng.randint(0, 999)}</td>' for _ in range(columns)) + '</tr>'
+                for _ in range(rng.randint(0, 30))
+            ]
+            header = '<tr>' + '<th>Col</th>' * columns + '</tr>' if rng.random() < 0.5 else ''
+            parts.append(f'<table class="datos" border="1">{header}{"".join(rows)}</table>')
+    parts.append('</body></html>')
+    return '\n'.join(parts)
+
+
+# Casos donde las expresiones regulares no reflejaban la estructura real
+KNOWN_DIFFERENCES = [
+    ('<thead> contado como celda (<th)',
+     '<table><thead><tr><th>A</th></tr></thead><tbody><tr><td>1</td></tr></tbody></table>'),
+    ('<pre>, <param> y <path> contados como párrafos',
+     '<p>texto</p><pre>código</pre><svg><path d="M0 0"/></svg>'),
+    ('tabla anidada: la regex corta la externa en el primer </table>',
+     '<table><tr><td><table><tr><td>x</td></tr></table></td></tr><tr><td>y</td></tr></table>'),
+    ('etiquetas dentro de comentarios y scripts',
+     '<!-- <table><tr><td></td></tr></table> --><script>var s = "<p><img>";</script><p>real</p>'),
+    ('<track> contado como fila (<tr)',
+     '<table><tr><td><video><track src="a.vtt"></video></td></tr></table>'),
+]
+
+
+def check_equivalence(documents: int, seed: int = 2025) -> int:
+    rng = random.Random(seed)
+    mismatches = 0
+    for index in range(documents):
+        html_content = generate_document(rng, rng.randint(1, 200))
+        expected = analyze_with_regex(html_content)
+        actual = count_tree(build_tree(html_content))
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"  ❌ Documento {index}: regex={expected} árbol={actual}")
+    status = "✓" if not mismatches else "❌"
+    print(f"{status} Equivalencia: {documents} documentos generados, {mismatches} diferencia(s)")
+    return mismatches
+
+
+def show_known_differences(real_documents):
+    print("\nDiferencias esperadas (la regex se equivocaba):")
+    cases = list(KNOWN_DIFFERENCES)
+    for path in real_documents:
+        cases.append((f'documento real: {path.name}', path.read_text(encoding='utf-8')))
+    for description, html_content in cases:
+        expected = analyze_with_regex(html_content)
+        actual = count_tree(build_tree(html_content))
+        changed = {k: (expected[k], actual[k]) for k in expected if expected[k] != actual[k]}
+        print(f"  • {description}")
+        if changed:
+            for key, (old, new) in changed.items():
+                print(f"      {key}: regex={old} → árbol={new}")
+        else:
+            print("      sin diferencias")
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def measure(function, argument):
+    """Tiempo y memoria en ejecuciones separadas: tracemalloc ralentiza las pasadas en Python"""
+    start = time.perf_counter()
+    result = function(argument)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function(argument)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, result
+
+
+def benchmark(size_mb: float):
+    rng = random.Random(7)
+    parts = []
+    total = 0
+    while total < size_mb * 1024 * 1024:
+        block = generate_document(rng, 200)
+        parts.append(block)
+        total += len(block)
+    html_content = '\n'.join(parts)
+
+    print(f"\nBenchmark con {len(html_content) / 1024 / 1024:.1f} MB de HTML:")
+    start = time.perf_counter()
+    root = build_tree(html_content)
+    print(f"  (análisis HTML5 del árbol: {time.perf_counter() - start:.2f}s, "
+          f"lo hace WeasyPrint en convert() en cualquier caso)")
+    print(f"  {'Método':<18} {'Tiempo':>9} {'Memoria pico':>13}")
+    results = []
+    for name, function, argument in (('regex', analyze_with_regex, html_content),
+                                     ('árbol', count_tree, root)):
+        elapsed, peak, result = measure(function, argument)
+        results.append(result)
+        print(f"  {name:<18} {elapsed:>8.2f}s {peak:>11.1f}MB")
+    if results[0] != results[1]:
+        print("  ❌ Los resultados no coinciden")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verificación y benchmark de ContentAnalyzer')
+    parser.add_argument('--documents', type=int, default=300, help='Documentos generados para la equivalencia')
+    parser.add_argument('--size-mb', type=float, default=5, help='Tamaño del HTML del benchmark (por defecto: 5 MB)')
+    parser.add_argument('--skip-benchmark', action='store_true', help='Solo verificar equivalencia')
+    args = parser.parse_args()
+
+    if build_tree is None:
+        print("❌ Se necesita WeasyPrint (o tinyhtml5 / html5lib) para construir el árbol")
+        return 1
+
+    mismatches = check_equivalence(args.documents)
+    show_known_differences(sorted(Path(__file__).resolve().parent.glob('*.html')))
+    if not args.skip_benchmark:
+        benchmark(args.size_mb)
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
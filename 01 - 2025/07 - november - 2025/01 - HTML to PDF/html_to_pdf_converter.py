@@ -10,11 +10,22 @@ Fecha: 2025
 """
 
 import os
+import re
 import sys
+import html
+import json
 import math
+import time
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections import Counter
+from operator import attrgetter
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional, List
+from urllib.parse import unquote, urlsplit
 import logging
+import logging.handlers
 from datetime import datetime
 
 HTML = None
@@ -37,34 +48,44 @@ def ensure_weasyprint():
 # CONFIGURACIÓN DE LOGGING
 # ============================================================================
 
-def setup_logging(log_file: str = "conversion.log") -> logging.Logger:
-    """Configura logging para el script"""
-    logger = logging.getLogger("HTMLtoPDFConverter")
-    logger.setLevel(logging.DEBUG)
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# En modo batch el log consolidado indica qué proceso escribió cada línea
+BATCH_LOG_FORMAT = '%(asctime)s - %(processName)s - %(levelname)s - %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+# Sin handlers al importar: solo main() configura archivo y consola, así
+# importar el módulo (benchmark, otros scripts) no crea conversion.log
+logger = logging.getLogger("HTMLtoPDFConverter")
+logger.setLevel(logging.DEBUG)
+
+
+def setup_logging(log_file: str = "conversion.log", log_format: str = LOG_FORMAT) -> logging.Logger:
+    """
+    Configura el log del script: archivo (DEBUG) y consola (INFO)
+    
+    Los procesos del modo batch no lo llaman: envían sus registros al
+    proceso principal (ver _batch_worker_init), el único que escribe el log.
+    """
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
     
     # Handler para archivo
     file_handler = logging.FileHandler(log_file, encoding='utf-8')
     file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(logging.Formatter(log_format, datefmt=LOG_DATE_FORMAT))
     
     # Handler para consola
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
-    
-    # Formato
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
+    console_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
     
     logger.addHandler(file_handler)
     logger.addHandler(console_handler)
     
     return logger
 
-logger = setup_logging()
-
 
 # ============================================================================
 # CONSTANTES DE CONFIGURACIÓN PDF
@@ -87,8 +108,6 @@ CONTENT_HEIGHT_MM = PAGE_HEIGHT_MM - MARGIN_TOP_MM - MARGIN_BOTTOM_MM
 MM_TO_PX = 96 / 25.4
 PX_TO_MM = 25.4 / 96
 
-logger.info(f"Configuración PDF - A4: {PAGE_WIDTH_MM}x{PAGE_HEIGHT_MM}mm")
-logger.info(f"Área de contenido: {CONTENT_WIDTH_MM}x{CONTENT_HEIGHT_MM}mm")
 
 
 # ============================================================================
@@ -171,12 +190,80 @@ ul, ol {
 # ANÁLISIS DE CONTENIDO Y CÁLCULOS DE DIMENSIONAMIENTO
 # ============================================================================
 
+class HTMLStructure:
+    """
+    Conteos de la estructura del documento: encabezados, párrafos, imágenes
+    y filas/celdas de cada tabla (lista de dicts con 'id', 'rows', 'cells').
+    """
+    
+    def __init__(self, headings: int, paragraphs: int, images: int, tables: List[dict]):
+        self.headings = headings
+        self.paragraphs = paragraphs
+        self.images = images
+        self.tables = tables
+
+
+def scan_html_tree(root) -> HTMLStructure:
+    """
+    Cuenta la estructura sobre el árbol que WeasyPrint ya construyó
+    (`HTML.etree_element`), sin volver a analizar el HTML.
+    
+    Los recorridos con Element.iter() y Counter se hacen en C: en
+    benchmark_content_analyzer.py cuesta lo mismo que las expresiones
+    regulares anteriores. Las filas y celdas se asignan a la tabla más
+    interna que las contiene (las tablas anidadas se cuentan por separado)
+    y los comentarios y el texto de <script>/<style> no son elementos.
+    Los ids de tabla siguen el orden del documento, como en
+    measure_table_heights.
+    """
+    tag_of = attrgetter('tag')
+    counts = Counter(map(tag_of, root.iter()))
+    
+    tables = list(root.iter('table'))
+    own: Dict[int, Tuple[int, int]] = {}
+    # En orden inverso: las tablas anidadas (posteriores) ya tienen sus conteos
+    for table in reversed(tables):
+        inner = Counter(map(tag_of, table.iter()))
+        nested = [own[id(child)] for child in table.iter('table') if child is not table]
+        own[id(table)] = (
+            inner['tr'] - sum(rows for rows, _ in nested),
+            inner['td'] + inner['th'] - sum(cells for _, cells in nested),
+        )
+    
+    return HTMLStructure(
+        headings=sum(counts[f'h{level}'] for level in range(1, 7)),
+        paragraphs=counts['p'],
+        images=counts['img'],
+        tables=[
+            {'id': index, 'rows': own[id(table)][0], 'cells': own[id(table)][1]}
+            for index, table in enumerate(tables, 1)
+        ],
+    )
+
+
+# Recursos enlazados (src de <img>/<script>, href de <link>) para la clave del
+# modo batch. Basta un superconjunto: una referencia de más solo añade un hash
+RESOURCE_PATTERN = re.compile(
+    r"""<(?:img|script|link)\b[^>]*?\b(?:src|href)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""",
+    re.IGNORECASE
+)
+
+
+def find_resource_references(html_content: str) -> List[str]:
+    """URLs de imágenes, scripts y hojas de estilo referenciadas en el HTML"""
+    return [
+        html.unescape(next(value for value in match.groups() if value is not None))
+        for match in RESOURCE_PATTERN.finditer(html_content)
+    ]
+
+
 class ContentAnalyzer:
     """Analiza HTML para optimizar saltos de página"""
     
     def __init__(self, html_path: str):
         self.html_path = html_path
         self.html_content = self._load_html()
+        self._structure: Optional[HTMLStructure] = None
         logger.info(f"HTML cargado: {html_path}")
     
     def _load_html(self) -> str:
@@ -191,44 +278,52 @@ class ContentAnalyzer:
             logger.error(f"Error al leer HTML: {e}")
             raise
     
+    def use_tree(self, root):
+        """Analiza el árbol ya construido por WeasyPrint (el que se va a renderizar)"""
+        self._structure = scan_html_tree(root)
+    
+    @property
+    def structure(self) -> HTMLStructure:
+        """
+        Resultado del análisis, compartido por todos los métodos. Si aún no
+        se llamó a use_tree(), se construye el árbol con WeasyPrint.
+        """
+        if self._structure is None:
+            has_weasyprint, import_error = ensure_weasyprint()
+            if not has_weasyprint:
+                raise ImportError(import_error)
+            self.use_tree(HTML(string=self.html_content).etree_element)
+        return self._structure
+    
     def analyze_tables(self) -> dict:
         """Analiza tablas en el HTML"""
-        import re
-        
-        tables = re.findall(r'<table[^>]*>(.*?)</table>', self.html_content, re.DOTALL)
         analysis = {
-            'total_tables': len(tables),
+            'total_tables': len(self.structure.tables),
             'tables': []
         }
         
-        for idx, table in enumerate(tables, 1):
-            rows = len(re.findall(r'<tr', table))
-            cells = len(re.findall(r'<td|<th', table))
+        for table in self.structure.tables:
+            rows, cells = table['rows'], table['cells']
             
             analysis['tables'].append({
-                'id': idx,
+                'id': table['id'],
                 'rows': rows,
                 'cells': cells,
                 'avg_cells_per_row': cells // max(rows, 1)
             })
             
-            logger.info(f"Tabla {idx}: {rows} filas, {cells} celdas")
+            logger.info(f"Tabla {table['id']}: {rows} filas, {cells} celdas")
         
         return analysis
     
     def get_statistics(self) -> dict:
         """Obtiene estadísticas generales del documento"""
-        import re
-        
-        headings = len(re.findall(r'<h[1-6]', self.html_content))
-        paragraphs = len(re.findall(r'<p[^>]*>', self.html_content))
-        images = len(re.findall(r'<img', self.html_content))
-        
+        structure = self.structure
         return {
-            'headings': headings,
-            'paragraphs': paragraphs,
-            'images': images,
-            'tables': len(re.findall(r'<table', self.html_content))
+            'headings': structure.headings,
+            'paragraphs': structure.paragraphs,
+            'images': structure.images,
+            'tables': len(structure.tables)
         }
 
 
@@ -272,6 +367,8 @@ class HTMLtoPDFConverter:
         self.html_path = html_path
         self.output_path = output_path or self._generate_output_path()
         self.analyzer = ContentAnalyzer(html_path)
+        # Alturas reales de las tablas, disponibles tras convert()
+        self.table_layout: dict = {}
         
         logger.info(f"Entrada: {self.html_path}")
         logger.info(f"Salida: {self.output_path}")
@@ -294,52 +391,164 @@ class HTMLtoPDFConverter:
         
         return True
     
-    def calculate_table_heights(self) -> dict:
-        """Calcula alturas aproximadas de tablas para planificación de saltos"""
-        analysis = self.analyzer.analyze_tables()
+    def local_resources(self) -> List[Path]:
+        """Archivos locales referenciados por el HTML (imágenes, hojas de estilo, scripts)"""
+        base_dir = Path(self.html_path).resolve().parent
+        resources = []
+        for reference in find_resource_references(self.analyzer.html_content):
+            parts = urlsplit(reference)
+            if parts.scheme not in ('', 'file') or parts.netloc or not parts.path:
+                continue  # http(s), data:, //cdn...: no son archivos locales
+            resources.append(base_dir / unquote(parts.path))
+        return sorted(set(resources))
+    
+    def content_key(self, enable_css_injection: bool = True) -> str:
+        """
+        Hash de todo lo que determina el PDF: el HTML, los archivos locales
+        que referencia y el CSS inyectado. Si no cambia, el PDF tampoco.
+        """
+        digest = hashlib.sha256()
+        digest.update(self.analyzer.html_content.encode('utf-8'))
+        if enable_css_injection:
+            digest.update(PAGE_BREAK_CSS.encode('utf-8'))
+        for resource in self.local_resources():
+            digest.update(f"\0{resource}\0".encode('utf-8'))
+            try:
+                digest.update(resource.read_bytes())
+            except OSError:
+                digest.update(b"<missing>")
+        return digest.hexdigest()
+    
+    def estimate_table_heights(self) -> dict:
+        """
+        Alturas aproximadas por número de filas (sin layout)
         
+        Respaldo de measure_table_heights cuando la versión de WeasyPrint
+        no expone las cajas del layout.
+        """
         # Estimaciones (pueden ajustarse según estilos CSS reales)
         ROW_HEIGHT_MM = 8  # altura estimada por fila
         HEADER_HEIGHT_MM = 10  # altura estimada del encabezado
         
         results = {}
-        for table in analysis['tables']:
-            total_height = (
-                HEADER_HEIGHT_MM +
-                (table['rows'] - 1) * ROW_HEIGHT_MM
-            )
-            
-            # Comparar con altura disponible
-            pages_needed = math.ceil(total_height / CONTENT_HEIGHT_MM)
-            fits_in_page = total_height <= CONTENT_HEIGHT_MM
+        for table in self.analyzer.analyze_tables()['tables']:
+            height_mm = HEADER_HEIGHT_MM + max(table['rows'] - 1, 0) * ROW_HEIGHT_MM
+            fits_in_page = height_mm <= CONTENT_HEIGHT_MM
             
             results[table['id']] = {
                 'rows': table['rows'],
-                'estimated_height_mm': total_height,
-                'pages_needed': pages_needed,
+                'height_mm': height_mm,
+                'estimated': True,
+                'pages': [],
+                'pages_needed': max(1, math.ceil(height_mm / CONTENT_HEIGHT_MM)),
                 'fits_in_page': fits_in_page,
+                'split': False,
                 'warning': not fits_in_page
             }
             
             if fits_in_page:
-                logger.info(
-                    f"Tabla {table['id']}: {total_height:.1f}mm "
-                    f"(cabe en página)"
-                )
+                logger.info(f"Tabla {table['id']}: ~{height_mm:.1f}mm estimados (cabe en página)")
             else:
                 logger.warning(
-                    f"Tabla {table['id']}: {total_height:.1f}mm "
-                    f"(requiere {pages_needed} páginas)"
+                    f"Tabla {table['id']}: ~{height_mm:.1f}mm estimados "
+                    f"(requiere {results[table['id']]['pages_needed']} páginas)"
                 )
         
         return results
     
-    def convert(self, enable_css_injection: bool = True) -> Tuple[bool, str]:
+    def measure_table_heights(self, html_document, document) -> dict:
+        """
+        Mide las tablas en el documento ya renderizado por WeasyPrint
+        
+        Las alturas salen de las cajas reales del layout (celdas con texto
+        ajustado, imágenes, estilos del HTML), no de una estimación por
+        filas. Una tabla partida entre páginas suma la altura de sus
+        fragmentos.
+        
+        Las cajas del layout (`page._page_box`) no son API pública de
+        WeasyPrint; si no están disponibles se usa estimate_table_heights().
+        
+        Args:
+            html_document: Objeto weasyprint.HTML usado para renderizar
+            document: Resultado de html_document.render()
+        """
+        # Las tablas del árbol en orden de documento: mismo id que en ContentAnalyzer
+        table_ids = {
+            id(element): index
+            for index, element in enumerate(html_document.etree_element.iter('table'), 1)
+        }
+        rows_by_id = {table['id']: table['rows'] for table in self.analyzer.structure.tables}
+        
+        measured = {}
+        content_height_mm = CONTENT_HEIGHT_MM
+        try:
+            for page_number, page in enumerate(document.pages, 1):
+                page_box = getattr(page, '_page_box', None)
+                if page_box is None:
+                    raise AttributeError("la página no expone _page_box")
+                content_height_mm = page_box.height * PX_TO_MM
+                for box in page_box.descendants():
+                    # La caja "wrapper" incluye el <caption>; una por fragmento de página
+                    if not getattr(box, 'is_table_wrapper', False):
+                        continue
+                    table_id = table_ids.get(id(box.element))
+                    if table_id is None:
+                        continue
+                    entry = measured.setdefault(table_id, {'height_px': 0.0, 'pages': []})
+                    entry['height_px'] += box.margin_height()
+                    if page_number not in entry['pages']:
+                        entry['pages'].append(page_number)
+        except AttributeError as e:
+            logger.warning(
+                f"No se pueden leer las cajas del layout de WeasyPrint ({e}); "
+                f"se estiman las alturas por número de filas"
+            )
+            return self.estimate_table_heights()
+        
+        results = {}
+        for table_id, entry in sorted(measured.items()):
+            height_mm = entry['height_px'] * PX_TO_MM
+            fits_in_page = height_mm <= content_height_mm
+            pages_spanned = len(entry['pages'])
+            
+            results[table_id] = {
+                'rows': rows_by_id.get(table_id, 0),
+                'height_mm': height_mm,
+                'estimated': False,
+                'pages': entry['pages'],
+                'pages_needed': max(1, math.ceil(height_mm / content_height_mm)),
+                'fits_in_page': fits_in_page,
+                # Cabía en una página y aun así quedó partida
+                'split': fits_in_page and pages_spanned > 1,
+                'warning': not fits_in_page or pages_spanned > 1
+            }
+            
+            page_range = f"pág. {entry['pages'][0]}" if pages_spanned == 1 else \
+                f"págs. {entry['pages'][0]}-{entry['pages'][-1]}"
+            if not fits_in_page:
+                logger.warning(
+                    f"Tabla {table_id}: {height_mm:.1f}mm, más alta que la página "
+                    f"({content_height_mm:.0f}mm), {page_range}"
+                )
+            elif pages_spanned > 1:
+                logger.warning(
+                    f"Tabla {table_id}: {height_mm:.1f}mm, cabe en una página "
+                    f"pero quedó partida ({page_range})"
+                )
+            else:
+                logger.info(f"Tabla {table_id}: {height_mm:.1f}mm (cabe en página, {page_range})")
+        
+        return results
+    
+    def convert(self, enable_css_injection: bool = True,
+                keep_temp_html: bool = False) -> Tuple[bool, str]:
         """
         Realiza la conversión de HTML a PDF
         
         Args:
             enable_css_injection: Si True, inyecta CSS de control de saltos
+            keep_temp_html: Si True, guarda el HTML con el CSS inyectado
+                (archivo _temp.html junto al original) para depuración
         
         Returns:
             Tupla (éxito: bool, mensaje: str)
@@ -358,18 +567,6 @@ class HTMLtoPDFConverter:
             logger.info("INICIANDO CONVERSIÓN HTML → PDF")
             logger.info("=" * 70)
             
-            # Analizar contenido
-            stats = self.analyzer.get_statistics()
-            logger.info(f"Estadísticas del documento:")
-            logger.info(f"  - Encabezados: {stats['headings']}")
-            logger.info(f"  - Párrafos: {stats['paragraphs']}")
-            logger.info(f"  - Tablas: {stats['tables']}")
-            logger.info(f"  - Imágenes: {stats['images']}")
-            
-            # Calcular dimensionamiento de tablas
-            logger.info("\nAnálisis de tablas:")
-            table_analysis = self.calculate_table_heights()
-            
             # Cargar HTML
             html_content = self.analyzer.html_content
             
@@ -377,11 +574,13 @@ class HTMLtoPDFConverter:
             if enable_css_injection:
                 html_content = inject_page_break_css(html_content)
             
-            # Guardar HTML modificado temporalmente (para debugging)
-            temp_html = self.html_path.replace('.html', '_temp.html')
-            with open(temp_html, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            logger.info(f"HTML temporal guardado: {temp_html}")
+            # El HTML modificado se pasa en memoria; copia en disco solo para depurar
+            if keep_temp_html:
+                input_path = Path(self.html_path)
+                temp_html = input_path.with_name(input_path.stem + '_temp.html')
+                with open(temp_html, 'w', encoding='utf-8') as f:
+                    f.write(html_content)
+                logger.info(f"HTML temporal guardado: {temp_html}")
             
             # Convertir con WeasyPrint
             logger.info("\nConvirtiendo a PDF con WeasyPrint...")
@@ -390,11 +589,29 @@ class HTMLtoPDFConverter:
                        f"{MARGIN_BOTTOM_MM}mm (inferior), "
                        f"{MARGIN_LEFT_MM}mm (lateral)")
             
-            HTML(string=html_content).write_pdf(
-                self.output_path,
-                zoom=1.0,
-                presentational_hints=True
-            )
+            # base_url: las rutas relativas (imágenes, CSS) se resuelven junto al HTML original
+            html_document = HTML(string=html_content, base_url=str(Path(self.html_path).resolve()))
+            
+            # Analizar contenido sobre el mismo árbol que se va a renderizar
+            self.analyzer.use_tree(html_document.etree_element)
+            # Analizar contenido
+            stats = self.analyzer.get_statistics()
+            logger.info(f"Estadísticas del documento:")
+            logger.info(f"  - Encabezados: {stats['headings']}")
+            logger.info(f"  - Párrafos: {stats['paragraphs']}")
+            logger.info(f"  - Tablas: {stats['tables']}")
+            logger.info(f"  - Imágenes: {stats['images']}")
+            
+            # Un único layout: el CSS de saltos se aplica al renderizar, las
+            # alturas de las tablas se leen de ese mismo resultado y el PDF
+            # se escribe desde él sin volver a maquetar
+            document = html_document.render(presentational_hints=True)
+            logger.info(f"Documento renderizado: {len(document.pages)} páginas")
+            
+            logger.info("\nAnálisis de tablas (alturas medidas en el layout):")
+            self.table_layout = self.measure_table_heights(html_document, document)
+            
+            document.write_pdf(self.output_path, zoom=1.0)
             
             logger.info(f"✓ PDF generado exitosamente")
             
@@ -416,6 +633,187 @@ class HTMLtoPDFConverter:
             return False, f"Error: {e}"
 
 
+# ============================================================================
+# CONVERSIÓN POR LOTES (DIRECTORIOS)
+# ============================================================================
+
+# Manifiesto con el hash de contenido de cada PDF generado en modo batch
+BATCH_MANIFEST_NAME = '.html_to_pdf_cache.json'
+
+_worker_options: dict = {}
+
+
+def collect_html_files(directory: str) -> List[Path]:
+    """Busca los HTML de un directorio (recursivo), sin las copias _temp.html de depuración"""
+    return sorted(
+        path for path in Path(directory).rglob('*')
+        if path.is_file()
+        and path.suffix.lower() in ('.html', '.htm')
+        and not path.stem.endswith('_temp')
+    )
+
+
+def batch_output_path(html_file: Path, base: Path, output_dir: Optional[str] = None) -> Path:
+    """PDF de un archivo del lote: junto al HTML o bajo output_dir con la misma estructura"""
+    if not output_dir:
+        return html_file.with_name(html_file.stem + '_converted.pdf')
+    relative = html_file.relative_to(base)
+    return Path(output_dir) / relative.with_name(relative.stem + '.pdf')
+
+
+def load_batch_manifest(path: Path) -> Dict[str, str]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('files', {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def save_batch_manifest(path: Path, entries: Dict[str, str]):
+    try:
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'files': entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"No se pudo guardar el manifiesto {path}: {e}")
+
+
+def _batch_worker_init(log_queue, enable_css_injection: bool, keep_temp_html: bool):
+    """Prepara cada proceso del pool: log hacia el proceso principal y WeasyPrint cargado una vez"""
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _worker_options.update(enable_css_injection=enable_css_injection,
+                           keep_temp_html=keep_temp_html)
+    ensure_weasyprint()
+
+
+def _batch_worker_convert(html_file: str, output_pdf: str, previous_key: Optional[str]) -> dict:
+    """Convierte un HTML en un proceso del pool (o lo omite si no cambió)"""
+    start = time.perf_counter()
+    result = {'file': html_file, 'output': output_pdf, 'success': False,
+              'skipped': False, 'key': None, 'message': '', 'seconds': 0.0}
+    try:
+        converter = HTMLtoPDFConverter(html_file, output_pdf)
+        result['key'] = converter.content_key(_worker_options['enable_css_injection'])
+        if result['key'] == previous_key and os.path.exists(output_pdf):
+            logger.info(f"Sin cambios, se omite: {html_file}")
+            result.update(success=True, skipped=True, message='sin cambios')
+        else:
+            success, message = converter.convert(**_worker_options)
+            result.update(success=success, message=message)
+    except Exception as e:
+        logger.error(f"Error con {html_file}: {e}", exc_info=True)
+        result['message'] = f"Error: {e}"
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def convert_directory(directory: str, output_dir: Optional[str] = None,
+                      jobs: Optional[int] = None, enable_css_injection: bool = True,
+                      keep_temp_html: bool = False, force: bool = False) -> List[dict]:
+    """
+    Convierte todos los HTML de un directorio en un pool de procesos
+    
+    Los procesos envían sus registros por una cola al proceso principal, que
+    los escribe en un único log. Los PDF cuyo hash de contenido coincide con
+    el del manifiesto (y que siguen existiendo) no se vuelven a generar.
+    
+    Returns:
+        Lista de resultados por archivo (ordenada por ruta)
+    """
+    base = Path(directory)
+    files = collect_html_files(directory)
+    if not files:
+        logger.error(f"No se encontraron archivos HTML en: {directory}")
+        return []
+    
+    manifest_path = Path(output_dir or base) / BATCH_MANIFEST_NAME
+    manifest = {} if force else load_batch_manifest(manifest_path)
+    
+    tasks = []
+    for html_file in files:
+        output_pdf = batch_output_path(html_file, base, output_dir)
+        output_pdf.parent.mkdir(parents=True, exist_ok=True)
+        relative = str(html_file.relative_to(base))
+        tasks.append((relative, str(html_file), str(output_pdf), manifest.get(relative)))
+    
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(tasks)))
+    logger.info("=" * 70)
+    logger.info(f"MODO BATCH: {len(tasks)} archivo(s) con {jobs} proceso(s)")
+    logger.info("=" * 70)
+    
+    # Consola solo con errores: el detalle de cada archivo va al log consolidado
+    console_handlers = [h for h in logger.handlers if not isinstance(h, logging.FileHandler)]
+    console_levels = [h.level for h in console_handlers]
+    for handler in console_handlers:
+        handler.setLevel(logging.ERROR)
+    
+    log_queue = multiprocessing.Queue()
+    listener = logging.handlers.QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+    listener.start()
+    
+    start = time.perf_counter()
+    results = []
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_batch_worker_init,
+                                 initargs=(log_queue, enable_css_injection, keep_temp_html)) as pool:
+            futures = {
+                pool.submit(_batch_worker_convert, html_file, output_pdf, previous_key): relative
+                for relative, html_file, output_pdf, previous_key in tasks
+            }
+            for future in as_completed(futures):
+                relative = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # El proceso murió (p. ej. memoria agotada): se registra y se sigue
+                    result = {'file': relative, 'output': None, 'success': False, 'skipped': False,
+                              'key': None, 'message': f"Proceso interrumpido: {e}", 'seconds': 0.0}
+                result['relative'] = relative
+                results.append(result)
+                
+                if result['skipped']:
+                    print(f"  [{len(results)}/{len(tasks)}] ⏭️  {relative} (sin cambios)")
+                elif result['success']:
+                    print(f"  [{len(results)}/{len(tasks)}] ✓ {relative} ({result['seconds']:.1f}s)")
+                else:
+                    print(f"  [{len(results)}/{len(tasks)}] ❌ {relative}: {result['message']}")
+    finally:
+        listener.stop()
+        for handler, level in zip(console_handlers, console_levels):
+            handler.setLevel(level)
+    
+    elapsed = time.perf_counter() - start
+    results.sort(key=lambda r: r['relative'])
+    
+    # Solo los PDF correctos quedan en el manifiesto; los fallidos se reintentan
+    for result in results:
+        if result['success'] and result['key']:
+            manifest[result['relative']] = result['key']
+        else:
+            manifest.pop(result['relative'], None)
+    save_batch_manifest(manifest_path, manifest)
+    
+    log_batch_summary(results, elapsed)
+    return results
+
+
+def log_batch_summary(results: List[dict], elapsed: float):
+    """Registra el resumen del lote en el log consolidado y en consola"""
+    converted = [r for r in results if r['success'] and not r['skipped']]
+    skipped = [r for r in results if r['skipped']]
+    failed = [r for r in results if not r['success']]
+    
+    logger.info("=" * 70)
+    logger.info(f"RESUMEN BATCH: {len(converted)} convertidos, {len(skipped)} sin cambios, "
+                f"{len(failed)} con error en {elapsed:.1f}s")
+    for result in failed:
+        logger.error(f"  {result['relative']}: {result['message']}")
+    logger.info("=" * 70)
+
+
 # ============================================================================
 # FUNCIÓN PRINCIPAL
 # ============================================================================
@@ -432,20 +830,41 @@ Ejemplos de uso:
   python html_to_pdf_converter.py index_2.html
   python html_to_pdf_converter.py index_2.html -o memoria_2025.pdf
   python html_to_pdf_converter.py index_2.html --no-css-injection
+  python html_to_pdf_converter.py informes/ -o pdfs/ -j 8
+  python html_to_pdf_converter.py informes/ --force
         """
     )
     
     parser.add_argument(
         'html_file',
-        help='Ruta del archivo HTML a convertir'
+        help='Ruta del archivo HTML a convertir, o un directorio para convertir todos sus HTML'
     )
     
     parser.add_argument(
         '-o', '--output',
-        help='Ruta del archivo PDF de salida (opcional)',
+        help='Ruta del archivo PDF de salida, o directorio de salida en modo batch (opcional)',
         default=None
     )
     
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=None,
+        help='Procesos en paralelo en modo batch (default: número de CPUs)'
+    )
+    
+    parser.add_argument(
+        '-f', '--force',
+        action='store_true',
+        help='Modo batch: reconvierte aunque el contenido no haya cambiado'
+    )
+    
+    parser.add_argument(
+        '--keep-temp-html',
+        action='store_true',
+        help='Guarda el HTML con el CSS inyectado (_temp.html) para depuración'
+    )
+    
     parser.add_argument(
         '--no-css-injection',
         action='store_true',
@@ -459,13 +878,36 @@ Ejemplos de uso:
     )
     
     args = parser.parse_args()
+    batch_mode = os.path.isdir(args.html_file)
+    
+    setup_logging(args.log_file, BATCH_LOG_FORMAT if batch_mode else LOG_FORMAT)
+    logger.info(f"Configuración PDF - A4: {PAGE_WIDTH_MM}x{PAGE_HEIGHT_MM}mm")
+    logger.info(f"Área de contenido: {CONTENT_WIDTH_MM}x{CONTENT_HEIGHT_MM}mm")
+    
+    # Modo batch: un directorio completo con un único log consolidado
+    if batch_mode:
+        results = convert_directory(
+            args.html_file,
+            output_dir=args.output,
+            jobs=args.jobs,
+            enable_css_injection=not args.no_css_injection,
+            keep_temp_html=args.keep_temp_html,
+            force=args.force
+        )
+        failed = [r for r in results if not r['success']]
+        if results and not failed:
+            print(f"\n✓ {len(results)} archivo(s) procesados (log: {args.log_file})")
+            return 0
+        print(f"\n❌ {len(failed)} de {len(results)} archivo(s) con error (log: {args.log_file})")
+        return 1
     
     # Crear convertidor
     converter = HTMLtoPDFConverter(args.html_file, args.output)
     
     # Realizar conversión
     success, message = converter.convert(
-        enable_css_injection=not args.no_css_injection
+        enable_css_injection=not args.no_css_injection,
+        keep_temp_html=args.keep_temp_html
     )
     
     # Mostrar resultado
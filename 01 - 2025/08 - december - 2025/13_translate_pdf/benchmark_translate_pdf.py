@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark del Traductor de PDFs
+===============================
+
+Mide velocidad y memoria de las etapas de translate_pdf_cli.py sin depender
+de servicios de traducción externos. Genera PDFs de prueba con reportlab
+(encabezado, pie y texto repetido, como un informe real) y ejecuta dos suites:
+
+  salida    compara los modos de salida "reflujo" y "superpuesto" con una
+            traducción simulada en memoria.
+  pipeline  ejecuta el proceso completo (extracción, segmentación, traducción
+            y generación del PDF) contra servidor_traduccion_simulado.py, con
+            latencia, errores y 429 configurables, y reporta páginas/s,
+            peticiones, aciertos de caché y pico de memoria. Las peticiones
+            las hace TraductorSimulado al endpoint del servicio elegido
+            (--servicio); deep-translator no interviene.
+
+Cada medición se ejecuta en un proceso nuevo para que el pico de memoria
+(RSS) de un caso no contamine al siguiente.
+
+Uso:
+    python3 benchmark_translate_pdf.py
+    python3 benchmark_translate_pdf.py --paginas 500
+    python3 benchmark_translate_pdf.py --pdf informe.pdf
+    python3 benchmark_translate_pdf.py --suite pipeline --archivos 4 --latencia 120 --tasa-429 0.02
+
+Autor: Generado automáticamente
+Fecha: Diciembre 2025
+Requiere: pdfplumber, reportlab, pypdf
+"""
+
+import os
+import sys
+
+# Verificar versión de Python
+if sys.version_info < (3, 6):
+    print("Error: Se requiere Python 3.6 o superior.", file=sys.stderr)
+    sys.exit(1)
+import argparse
+import contextlib
+import io
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows
+
+import translate_pdf_cli as tp
+import servidor_traduccion_simulado as servidor_simulado
+
+
+PARRAFO_PRUEBA = (
+    "The quarterly report summarizes operational results for each region. "
+    "Revenue grew in most markets while costs remained under control. "
+    "Detailed figures for every business unit are listed in the annex."
+)
+
+
+# ============================================================================
+# UTILIDADES
+# ============================================================================
+def pico_rss_mb() -> float:
+    """Pico de memoria residente del proceso actual, en MB."""
+    if resource is None:
+        return float("nan")
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB; macOS, bytes
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def generar_pdf_de_prueba(ruta: str, paginas: int) -> str:
+    """Genera un PDF de prueba con encabezado, pie de página y párrafos."""
+    if tp.SimpleDocTemplate is None:
+        raise ImportError("reportlab no está instalado")
+
+    lienzo = tp.canvas.Canvas(ruta, pagesize=tp.A4)
+    ancho, alto = tp.A4
+    for numero in range(1, paginas + 1):
+        lienzo.setFont("Helvetica-Bold", 9)
+        lienzo.drawString(50, alto - 40, "ACME Corporation - Annual Operations Report")
+        lienzo.setFont("Helvetica", 11)
+        y = alto - 90
+        for parrafo in range(6):
+            texto = f"Section {numero}.{parrafo + 1}. {PARRAFO_PRUEBA}"
+            for linea in tp.simpleSplit(texto, "Helvetica", 11, ancho - 100):
+                lienzo.drawString(50, y, linea)
+                y -= 14
+            y -= 10
+        lienzo.setFont("Helvetica", 8)
+        lienzo.drawString(50, 30, "Confidential - for internal use only")
+        lienzo.drawRightString(ancho - 50, 30, str(numero))
+        lienzo.showPage()
+    lienzo.save()
+    return ruta
+
+
+def traduccion_simulada(paginas: List[Dict]) -> List[Dict]:
+    """Sustituye al servicio de traducción: devuelve el texto en mayúsculas."""
+    return [{
+        **pagina,
+        "texto_traducido": pagina["texto"].upper(),
+        "traducida": pagina["tiene_texto"],
+    } for pagina in paginas]
+
+
+# ============================================================================
+# MEDICIONES (se ejecutan en un proceso aparte)
+# ============================================================================
+def _medir_modo_salida(ruta_pdf: str, modo: str) -> Dict:
+    """Extrae, "traduce" y genera el PDF en el modo indicado."""
+    ruta_salida = os.path.join(tempfile.mkdtemp(), f"salida_{modo}.pdf")
+    superpuesto = modo == "superpuesto"
+
+    inicio = time.perf_counter()
+    paginas = list(tp.iterar_paginas_pdf(ruta_pdf, procesos=1, con_bloques=superpuesto))
+    t_extraccion = time.perf_counter() - inicio
+
+    paginas = traduccion_simulada(paginas)
+
+    inicio = time.perf_counter()
+    if superpuesto:
+        exito = tp.generar_pdf_superpuesto(ruta_pdf, paginas, ruta_salida)
+    else:
+        exito = tp.generar_pdf_traducido(paginas, ruta_salida)
+    t_generacion = time.perf_counter() - inicio
+
+    return {
+        "modo": modo,
+        "exito": exito,
+        "paginas": len(paginas),
+        "extraccion_s": t_extraccion,
+        "generacion_s": t_generacion,
+        "pico_rss_mb": pico_rss_mb(),
+        "tamano_salida_mb": os.path.getsize(ruta_salida) / (1024 * 1024) if exito else 0.0,
+    }
+
+
+def _medir_pipeline(rutas_pdf: List[str], endpoint: str, trabajos: int,
+                    servicio: str, max_peticiones: float) -> Dict:
+    """Traduce los PDFs con el pipeline de la CLI contra el servidor simulado."""
+    os.environ[tp.ENV_ENDPOINT_TRADUCCION] = endpoint
+    args = argparse.Namespace(
+        origen="en", destino="es", servicio=servicio, modo="reflujo",
+        ocr=False, ocr_idioma="", ocr_dpi=300, reiniciar=True,
+        output=tempfile.mkdtemp(), trabajos=trabajos, procesos=None,
+    )
+    cache = tp.CacheTraduccion()
+    limitador = tp.LimitadorTasa(max_peticiones)
+
+    inicio = time.perf_counter()
+    # La CLI informa del progreso por stdout; aquí solo interesan las cifras
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultados = tp.traducir_lote_archivos(rutas_pdf, args, None, cache, limitador)
+    duracion = time.perf_counter() - inicio
+
+    stats = cache.estadisticas()
+    consultas = stats["hits"] + stats["misses"]
+    return {
+        "archivos": len(rutas_pdf),
+        "trabajos": trabajos,
+        "errores": sum(1 for r in resultados if r["estado"] != "ok"),
+        "paginas": sum(r.get("paginas", 0) for r in resultados),
+        "segundos": duracion,
+        "peticiones": limitador.peticiones,
+        "tasa_cache": stats["hits"] / consultas if consultas else 0.0,
+        "pico_rss_mb": pico_rss_mb(),
+    }
+
+
+def en_proceso_nuevo(funcion, *args):
+    """Ejecuta funcion(*args) en un proceso recién creado (spawn) y devuelve su resultado."""
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as pool:
+        return pool.submit(funcion, *args).result()
+
+
+def benchmark_modos_salida(ruta_pdf: str) -> List[Dict]:
+    """Compara los modos de salida reflujo y superpuesto."""
+    return [en_proceso_nuevo(_medir_modo_salida, ruta_pdf, modo) for modo in tp.MODOS_SALIDA]
+
+
+def imprimir_modos_salida(resultados: List[Dict]):
+    print(f"{'Modo':<12} {'Págs':>6} {'Extracción':>11} {'Generación':>11} {'Págs/s':>8} {'RSS pico':>10} {'Salida':>9}")
+    for r in resultados:
+        total = r["extraccion_s"] + r["generacion_s"]
+        print(
+            f"{r['modo']:<12} {r['paginas']:>6} {r['extraccion_s']:>10.2f}s {r['generacion_s']:>10.2f}s "
+            f"{r['paginas'] / total if total else 0:>8.1f} {r['pico_rss_mb']:>8.1f}MB "
+            f"{r['tamano_salida_mb']:>7.2f}MB"
+        )
+
+
+def benchmark_pipeline(rutas_pdf: List[str], opciones_servidor: Dict, trabajos: int,
+                       servicio: str, max_peticiones: float) -> List[Dict]:
+    """Un archivo, el lote en serie y el lote en paralelo, contra el mismo servidor."""
+    servidor, estado = servidor_simulado.iniciar_servidor(0, **opciones_servidor)
+    endpoint = f"http://127.0.0.1:{servidor.server_address[1]}"
+    casos = [
+        ("1 archivo", rutas_pdf[:1], 1),
+        ("lote serie", rutas_pdf, 1),
+        ("lote paralelo", rutas_pdf, trabajos),
+    ]
+    resultados = []
+    try:
+        for nombre, rutas, n_trabajos in casos:
+            estado.reiniciar()
+            resultado = en_proceso_nuevo(
+                _medir_pipeline, rutas, endpoint, n_trabajos, servicio, max_peticiones
+            )
+            servidor_stats = estado.estadisticas()
+            resultado.update(
+                caso=nombre,
+                http_429=servidor_stats["limitadas_429"],
+                http_500=servidor_stats["errores"],
+            )
+            resultados.append(resultado)
+    finally:
+        servidor.shutdown()
+    return resultados
+
+
+def imprimir_pipeline(resultados: List[Dict]):
+    print(f"{'Caso':<14} {'PDFs':>4} {'Hilos':>5} {'Págs':>6} {'Tiempo':>8} {'Págs/s':>7} "
+          f"{'Petic.':>7} {'429/500':>8} {'Caché':>6} {'RSS pico':>10}")
+    for r in resultados:
+        print(
+            f"{r['caso']:<14} {r['archivos']:>4} {r['trabajos']:>5} {r['paginas']:>6} "
+            f"{r['segundos']:>7.2f}s {r['paginas'] / r['segundos'] if r['segundos'] else 0:>7.1f} "
+            f"{r['peticiones']:>7} {str(r['http_429']) + '/' + str(r['http_500']):>8} "
+            f"{r['tasa_cache']:>6.0%} {r['pico_rss_mb']:>8.1f}MB"
+            + (f"  ⚠️  {r['errores']} archivo(s) con errores" if r["errores"] else "")
+        )
+
+
+# ============================================================================
+# FUNCIÓN PRINCIPAL
+# ============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del traductor de PDFs (sin red)")
+    parser.add_argument("--pdf", default="", help="PDF a usar (por defecto se genera uno de prueba)")
+    parser.add_argument("--paginas", type=int, default=200, help="Páginas del PDF de prueba (default: 200)")
+    parser.add_argument("--suite", default="todo", choices=["todo", "salida", "pipeline"],
+                        help="Mediciones a ejecutar (default: todo)")
+    parser.add_argument("--archivos", type=int, default=3,
+                        help="PDFs del lote en la suite pipeline (default: 3)")
+    parser.add_argument("--trabajos", type=int, default=3,
+                        help="PDFs en paralelo en el caso 'lote paralelo' (default: 3)")
+    parser.add_argument("--servicio", default="google", choices=["google", "mymemory"],
+                        help="Endpoint simulado a usar: /m (google) o /get (mymemory) (default: google)")
+    parser.add_argument("--max-peticiones", type=float, default=0,
+                        help="Límite de peticiones/s de la CLI; 0 = sin límite (default: 0)")
+    parser.add_argument("--latencia", type=float, default=50.0,
+                        help="Latencia del servidor simulado en ms (default: 50)")
+    parser.add_argument("--tasa-error", type=float, default=0.0,
+                        help="Probabilidad de error 500 del servidor simulado (0-1)")
+    parser.add_argument("--tasa-429", type=float, default=0.0,
+                        help="Probabilidad de respuesta 429 del servidor simulado (0-1)")
+    args = parser.parse_args()
+
+    if tp.pdfplumber is None or tp.SimpleDocTemplate is None or tp.PdfWriter is None:
+        print("❌ Faltan dependencias. Ejecuta:")
+        print("   pip install pdfplumber reportlab pypdf")
+        sys.exit(1)
+
+    ruta_pdf = args.pdf
+    if not ruta_pdf:
+        ruta_pdf = os.path.join(tempfile.mkdtemp(), f"prueba_{args.paginas}.pdf")
+        print(f"📄 Generando PDF de prueba ({args.paginas} páginas)...")
+        generar_pdf_de_prueba(ruta_pdf, args.paginas)
+
+    if args.suite in ("todo", "salida"):
+        print()
+        print("=" * 72)
+        print("🖨️  MODOS DE SALIDA: reflujo vs superpuesto")
+        print("=" * 72)
+        imprimir_modos_salida(benchmark_modos_salida(ruta_pdf))
+        print()
+
+    if args.suite in ("todo", "pipeline"):
+        # Copias del PDF con otro nombre: mismo contenido, como informes de una misma plantilla
+        rutas = [ruta_pdf]
+        for i in range(2, args.archivos + 1):
+            copia = os.path.join(tempfile.mkdtemp(), f"copia_{i}.pdf")
+            with open(ruta_pdf, "rb") as origen, open(copia, "wb") as destino:
+                destino.write(origen.read())
+            rutas.append(copia)
+
+        print()
+        print("=" * 96)
+        print(f"🌐 PIPELINE COMPLETO contra servidor simulado ({args.latencia:g} ms, "
+              f"{args.tasa_error:.0%} errores, {args.tasa_429:.0%} 429)")
+        print("=" * 96)
+        opciones_servidor = {
+            "latencia_ms": args.latencia,
+            "tasa_error": args.tasa_error,
+            "tasa_429": args.tasa_429,
+            "semilla": 1,
+        }
+        imprimir_pipeline(benchmark_pipeline(
+            rutas, opciones_servidor, args.trabajos, args.servicio, args.max_peticiones
+        ))
+        print()
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nOperación cancelada por el usuario.", file=sys.stderr)
+        sys.exit(130)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Servidor de Traducción Simulado
+===============================
+
+Servidor HTTP local que imita los endpoints de los servicios de traducción,
+para probar y medir el traductor de PDFs sin conexión a internet. Con
+TRANSLATE_PDF_ENDPOINT la CLI no usa deep-translator: su TraductorSimulado
+pide /m con --servicio google y /get con --servicio mymemory.
+
+    GET /m?sl=en&tl=es&q=...          → Google Translate (versión móvil, HTML)
+    GET /get?langpair=en|es&q=...     → MyMemory (JSON)
+    GET /stats                        → contadores de peticiones (JSON)
+    GET /reset                        → reinicia los contadores
+
+La "traducción" devuelve el texto en mayúsculas, de modo que conserva la
+longitud y los saltos de línea. Se puede simular latencia, errores 500 y
+respuestas 429 (límite de peticiones) con una probabilidad dada.
+
+Para apuntar la CLI a este servidor:
+
+    python3 servidor_traduccion_simulado.py --puerto 8765 --latencia 80
+    TRANSLATE_PDF_ENDPOINT=http://127.0.0.1:8765 python3 translate_pdf_cli.py doc.pdf -d es
+
+Autor: Generado automáticamente
+Fecha: Diciembre 2025
+Requiere: solo la biblioteca estándar
+"""
+
+import sys
+
+# Verificar versión de Python
+if sys.version_info < (3, 7):
+    print("Error: Se requiere Python 3.7 o superior.", file=sys.stderr)
+    sys.exit(1)
+import argparse
+import html
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+# ============================================================================
+# CLASE: Configuración y estadísticas del servidor
+# ============================================================================
+class EstadoServidor:
+    """Comportamiento simulado y contadores compartidos entre peticiones."""
+
+    def __init__(self, latencia_ms: float = 0.0, variacion_ms: float = 0.0,
+                 tasa_error: float = 0.0, tasa_429: float = 0.0, semilla: Optional[int] = None):
+        self.latencia_ms = latencia_ms
+        self.variacion_ms = variacion_ms
+        self.tasa_error = tasa_error
+        self.tasa_429 = tasa_429
+        self._azar = random.Random(semilla)
+        self._lock = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self._lock:
+            self.peticiones = 0
+            self.ok = 0
+            self.errores = 0
+            self.limitadas = 0
+            self.caracteres = 0
+            self.concurrentes = 0
+            self.max_concurrentes = 0
+
+    def decidir(self) -> Tuple[int, float]:
+        """Devuelve (código HTTP, segundos de latencia) para la siguiente petición."""
+        with self._lock:
+            self.peticiones += 1
+            sorteo = self._azar.random()
+            latencia = max(0.0, self.latencia_ms + self._azar.uniform(-1, 1) * self.variacion_ms)
+        if sorteo < self.tasa_429:
+            return 429, latencia / 1000
+        if sorteo < self.tasa_429 + self.tasa_error:
+            return 500, latencia / 1000
+        return 200, latencia / 1000
+
+    def registrar(self, codigo: int, caracteres: int):
+        with self._lock:
+            if codigo == 200:
+                self.ok += 1
+                self.caracteres += caracteres
+            elif codigo == 429:
+                self.limitadas += 1
+            else:
+                self.errores += 1
+
+    def entrar(self):
+        with self._lock:
+            self.concurrentes += 1
+            self.max_concurrentes = max(self.max_concurrentes, self.concurrentes)
+
+    def salir(self):
+        with self._lock:
+            self.concurrentes -= 1
+
+    def estadisticas(self) -> Dict:
+        with self._lock:
+            return {
+                "peticiones": self.peticiones,
+                "ok": self.ok,
+                "errores": self.errores,
+                "limitadas_429": self.limitadas,
+                "caracteres": self.caracteres,
+                "max_concurrentes": self.max_concurrentes,
+            }
+
+
+def traduccion_simulada(texto: str) -> str:
+    return texto.upper()
+
+
+# ============================================================================
+# MANEJADOR HTTP
+# ============================================================================
+class ManejadorTraduccion(BaseHTTPRequestHandler):
+    estado: EstadoServidor  # asignado al crear el servidor
+
+    def log_message(self, formato, *args):
+        pass  # sin registro por petición: el servidor se usa en benchmarks
+
+    def _responder(self, codigo: int, cuerpo: str, tipo: str):
+        datos = cuerpo.encode("utf-8")
+        self.send_response(codigo)
+        self.send_header("Content-Type", f"{tipo}; charset=utf-8")
+        self.send_header("Content-Length", str(len(datos)))
+        if codigo == 429:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parametros = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if url.path == "/stats":
+            self._responder(200, json.dumps(self.estado.estadisticas()), "application/json")
+            return
+        if url.path == "/reset":
+            self.estado.reiniciar()
+            self._responder(200, "{}", "application/json")
+            return
+        if url.path not in ("/m", "/get"):
+            self._responder(404, "no encontrado", "text/plain")
+            return
+
+        self.estado.entrar()
+        try:
+            codigo, latencia = self.estado.decidir()
+            if latencia:
+                time.sleep(latencia)
+            texto = parametros.get("q", "")
+            self.estado.registrar(codigo, len(texto))
+
+            if codigo != 200:
+                self._responder(codigo, "error simulado", "text/plain")
+            elif url.path == "/m":
+                self._responder(
+                    200,
+                    '<html><body><div class="result-container">'
+                    f"{html.escape(traduccion_simulada(texto))}</div></body></html>",
+                    "text/html",
+                )
+            else:
+                self._responder(200, json.dumps({
+                    "responseData": {"translatedText": traduccion_simulada(texto)},
+                    "responseStatus": 200,
+                    "matches": [],
+                }), "application/json")
+        finally:
+            self.estado.salir()
+
+
+def iniciar_servidor(puerto: int = 0, **opciones) -> Tuple[ThreadingHTTPServer, EstadoServidor]:
+    """Arranca el servidor en un hilo de fondo; puerto 0 elige uno libre.
+
+    La URL base queda en f"http://127.0.0.1:{servidor.server_address[1]}".
+    Detenerlo con servidor.shutdown().
+    """
+    estado = EstadoServidor(**opciones)
+    manejador = type("Manejador", (ManejadorTraduccion,), {"estado": estado})
+    servidor = ThreadingHTTPServer(("127.0.0.1", puerto), manejador)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, estado
+
+
+# ============================================================================
+# FUNCIÓN PRINCIPAL
+# ============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de traducción simulado (Google /m y MyMemory /get)")
+    parser.add_argument("--puerto", type=int, default=8765, help="Puerto de escucha (default: 8765)")
+    parser.add_argument("--latencia", type=float, default=50.0, help="Latencia por petición en ms (default: 50)")
+    parser.add_argument("--variacion", type=float, default=0.0, help="Variación aleatoria de la latencia en ms")
+    parser.add_argument("--tasa-error", type=float, default=0.0, help="Probabilidad de responder 500 (0-1)")
+    parser.add_argument("--tasa-429", type=float, default=0.0, help="Probabilidad de responder 429 (0-1)")
+    parser.add_argument("--semilla", type=int, default=None, help="Semilla para resultados reproducibles")
+    args = parser.parse_args()
+
+    servidor, estado = iniciar_servidor(
+        args.puerto, latencia_ms=args.latencia, variacion_ms=args.variacion,
+        tasa_error=args.tasa_error, tasa_429=args.tasa_429, semilla=args.semilla,
+    )
+    url = f"http://127.0.0.1:{servidor.server_address[1]}"
+    print(f"🌐 Servidor simulado en {url}")
+    print(f"   export TRANSLATE_PDF_ENDPOINT={url}")
+    print("   Ctrl+C para detener")
+    try:
+        while True:
+            time.sleep(3600)
+    finally:
+        servidor.shutdown()
+        print(f"\n📊 {json.dumps(estado.estadisticas())}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(0)
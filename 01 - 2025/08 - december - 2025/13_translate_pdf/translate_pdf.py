@@ -10,6 +10,7 @@ preservando el formato básico y generando un nuevo PDF con el texto traducido.
 Autor: Generado automáticamente
 Fecha: Diciembre 2025
 Requiere: pdfplumber, reportlab, deep-translator, tkinter
+Opcional: pytesseract + Tesseract (OCR de páginas escaneadas)
 """
 
 import os
@@ -23,9 +24,11 @@ import logging
 import threading
 import time
 import hashlib
+import itertools
+from collections import deque
 from pathlib import Path
-from typing import Optional, List, Dict, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Dict, Tuple, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from functools import lru_cache
 
 # ============================================================================
@@ -53,6 +56,12 @@ try:
 except ImportError:
     SimpleDocTemplate = None
 
+# OCR opcional para páginas escaneadas
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
 # ============================================================================
 # TRADUCCIÓN
 # ============================================================================
@@ -116,6 +125,54 @@ SERVICIOS_TRADUCCION = {
     # "DeepL (requiere API key)": "deepl",
 }
 
+# Páginas que se traducen juntas; los segmentos repetidos dentro del lote
+# (encabezados, pies de página) se envían una sola vez.
+PAGINAS_POR_LOTE = 20
+
+# Páginas que extrae cada proceso trabajador por tarea.
+PAGINAS_POR_TAREA = 25
+
+# Idiomas de Tesseract para el OCR opcional (auto → inglés)
+OCR_LANG_MAP = {
+    "es": "spa",
+    "en": "eng",
+    "fr": "fra",
+    "de": "deu",
+    "it": "ita",
+    "pt": "por",
+    "ru": "rus",
+    "zh-CN": "chi_sim",
+    "zh-TW": "chi_tra",
+    "ja": "jpn",
+    "ko": "kor",
+    "ar": "ara",
+    "hi": "hin",
+    "nl": "nld",
+    "pl": "pol",
+    "tr": "tur",
+    "sv": "swe",
+    "da": "dan",
+    "no": "nor",
+    "fi": "fin",
+    "el": "ell",
+    "he": "heb",
+    "th": "tha",
+    "vi": "vie",
+    "id": "ind",
+    "ms": "msa",
+    "ca": "cat",
+    "uk": "ukr",
+    "cs": "ces",
+    "ro": "ron",
+    "hu": "hun",
+}
+
+# Resoluciones ofrecidas para rasterizar páginas escaneadas
+OCR_DPI_OPCIONES = ["150", "200", "300", "400"]
+
+# Texto OCR guardado por huella de la imagen de la página
+DIR_CACHE_OCR = os.path.join(os.path.expanduser("~"), ".cache", "translate_pdf", "ocr")
+
 MYMEMORY_LANG_MAP = {
     "es": "es-ES",
     "en": "en-GB",
@@ -188,57 +245,262 @@ class CacheTraduccion:
 # ============================================================================
 # FUNCIONES DE EXTRACCIÓN DE TEXTO
 # ============================================================================
-def extraer_texto_pdf(ruta_pdf: str, paginas: Optional[List[int]] = None) -> List[Dict]:
+def contar_paginas_pdf(ruta_pdf: str) -> int:
+    """Devuelve el número de páginas del PDF."""
+    if pdfplumber is None:
+        raise ImportError("pdfplumber no está instalado. Ejecuta: pip install pdfplumber")
+    with pdfplumber.open(ruta_pdf) as pdf:
+        return len(pdf.pages)
+
+
+def indices_a_extraer(total_paginas: int, paginas: Optional[List[int]] = None) -> List[int]:
     """
-    Extrae el texto de un PDF página por página usando pdfplumber.
+    Convierte números de página (1-indexed) en índices válidos (0-indexed).
     
-    Args:
-        ruta_pdf: Ruta al archivo PDF
-        paginas: Lista opcional de números de página (1-indexed) a extraer.
-                 Si es None, extrae todas las páginas.
-    
-    Returns:
-        Lista de diccionarios con información de cada página:
-        [{"numero": 1, "texto": "...", "tiene_texto": True/False}, ...]
+    Si paginas es None se devuelven todos los índices del documento.
     """
-    if pdfplumber is None:
-        raise ImportError("pdfplumber no está instalado. Ejecuta: pip install pdfplumber")
+    if paginas:
+        return [p - 1 for p in paginas if 0 < p <= total_paginas]
+    return list(range(total_paginas))
+
+
+def _extraer_rango(ruta_pdf: str, indices: List[int]) -> List[Dict]:
+    """
+    Extrae el texto de un rango de páginas.
     
+    Se ejecuta en un proceso trabajador: cada proceso abre su propia copia del
+    PDF, de modo que no hay que enviar objetos de pdfplumber entre procesos.
+    """
     resultados = []
     
     with pdfplumber.open(ruta_pdf) as pdf:
-        total_paginas = len(pdf.pages)
-        logger.info(f"PDF abierto: {total_paginas} páginas detectadas")
-        
-        # Determinar qué páginas procesar
-        if paginas:
-            # Convertir a 0-indexed y validar
-            indices = [p - 1 for p in paginas if 0 < p <= total_paginas]
-        else:
-            indices = range(total_paginas)
-        
         for idx in indices:
             pagina = pdf.pages[idx]
             texto = pagina.extract_text() or ""
             
-            # Detectar si la página parece ser una imagen escaneada (sin texto)
-            tiene_texto = len(texto.strip()) > 10
-            
             resultados.append({
                 "numero": idx + 1,
                 "texto": texto,
-                "tiene_texto": tiene_texto,
+                # Detectar si la página parece ser una imagen escaneada (sin texto)
+                "tiene_texto": len(texto.strip()) > 10,
                 "ancho": pagina.width,
                 "alto": pagina.height
             })
             
-            if not tiene_texto:
+            # Liberar las cachés de objetos y layout que pdfplumber guarda por página
+            pagina.close()
+    
+    return resultados
+
+
+def iterar_paginas_pdf(
+    ruta_pdf: str,
+    paginas: Optional[List[int]] = None,
+    procesos: Optional[int] = None
+) -> Iterator[Dict]:
+    """
+    Extrae el texto de un PDF como generador, repartiendo rangos de páginas
+    entre varios procesos.
+    
+    Las páginas se entregan en orden en cuanto su rango está listo, así que la
+    traducción puede empezar con las primeras mientras las siguientes se
+    siguen extrayendo. Solo hay unos pocos rangos en vuelo a la vez, lo que
+    limita la memoria usada en documentos muy grandes.
+    
+    Args:
+        ruta_pdf: Ruta al archivo PDF
+        paginas: Lista opcional de números de página (1-indexed) a extraer.
+                 Si es None, extrae todas las páginas.
+        procesos: Número de procesos trabajadores (default: núcleos de CPU)
+    
+    Yields:
+        Diccionarios con información de cada página:
+        {"numero": 1, "texto": "...", "tiene_texto": True/False, ...}
+    """
+    total_paginas = contar_paginas_pdf(ruta_pdf)
+    logger.info(f"PDF abierto: {total_paginas} páginas detectadas")
+    
+    indices = indices_a_extraer(total_paginas, paginas)
+    rangos = [indices[i:i + PAGINAS_POR_TAREA] for i in range(0, len(indices), PAGINAS_POR_TAREA)]
+    procesos = procesos or os.cpu_count() or 1
+    
+    def _avisar(resultados: List[Dict]) -> Iterator[Dict]:
+        for pagina in resultados:
+            if not pagina["tiene_texto"]:
                 logger.warning(
-                    f"Página {idx + 1}: Sin texto detectable. "
+                    f"Página {pagina['numero']}: Sin texto detectable. "
                     "Podría ser una imagen escaneada (requiere OCR con pytesseract)"
                 )
+            yield pagina
     
-    return resultados
+    # Documentos pequeños: no compensa arrancar procesos
+    if procesos <= 1 or len(rangos) <= 1:
+        for rango in rangos:
+            yield from _avisar(_extraer_rango(ruta_pdf, rango))
+        return
+    
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        rangos_restantes = iter(rangos)
+        # Como máximo 2 rangos por proceso en vuelo
+        en_vuelo = deque(
+            pool.submit(_extraer_rango, ruta_pdf, rango)
+            for rango in itertools.islice(rangos_restantes, procesos * 2)
+        )
+        try:
+            while en_vuelo:
+                resultados = en_vuelo.popleft().result()
+                siguiente = next(rangos_restantes, None)
+                if siguiente is not None:
+                    en_vuelo.append(pool.submit(_extraer_rango, ruta_pdf, siguiente))
+                yield from _avisar(resultados)
+        finally:
+            # Si el consumidor se detiene (cancelación), no extraer más rangos
+            for futuro in en_vuelo:
+                futuro.cancel()
+
+
+def extraer_texto_pdf(ruta_pdf: str, paginas: Optional[List[int]] = None) -> List[Dict]:
+    """
+    Extrae el texto de un PDF página por página usando pdfplumber.
+    
+    Versión no incremental de iterar_paginas_pdf: devuelve todas las páginas
+    en una lista.
+    
+    Args:
+        ruta_pdf: Ruta al archivo PDF
+        paginas: Lista opcional de números de página (1-indexed) a extraer.
+                 Si es None, extrae todas las páginas.
+    
+    Returns:
+        Lista de diccionarios con información de cada página:
+        [{"numero": 1, "texto": "...", "tiene_texto": True/False}, ...]
+    """
+    return list(iterar_paginas_pdf(ruta_pdf, paginas))
+
+
+def agrupar_en_lotes(iterable: Iterable, tamano: int) -> Iterator[List]:
+    """Agrupa los elementos de un iterable en listas de hasta `tamano` elementos."""
+    iterador = iter(iterable)
+    while True:
+        lote = list(itertools.islice(iterador, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+# ============================================================================
+# OCR DE PÁGINAS ESCANEADAS (opcional)
+# ============================================================================
+def _ocr_pagina(ruta_pdf: str, idx: int, dpi: int, idioma_ocr: str, dir_cache: str) -> str:
+    """
+    Rasteriza una página y extrae su texto con Tesseract.
+    
+    Se ejecuta en un proceso trabajador. El texto se guarda en disco con la
+    huella SHA-256 de la imagen de la página, de modo que una página ya
+    reconocida (en este u otro documento) no vuelve a pasar por Tesseract.
+    
+    Args:
+        ruta_pdf: Ruta al archivo PDF
+        idx: Índice de la página (0-indexed)
+        dpi: Resolución de rasterizado
+        idioma_ocr: Idioma(s) de Tesseract (ej: "spa", "spa+eng")
+        dir_cache: Directorio de la caché de OCR
+    
+    Returns:
+        Texto reconocido
+    """
+    with pdfplumber.open(ruta_pdf) as pdf:
+        pagina = pdf.pages[idx]
+        imagen = pagina.to_image(resolution=dpi).original
+        pagina.close()
+    
+    huella = hashlib.sha256()
+    huella.update(f"{imagen.mode}:{imagen.size}:{idioma_ocr}:".encode("utf-8"))
+    huella.update(imagen.tobytes())
+    ruta_cache = os.path.join(dir_cache, huella.hexdigest() + ".txt")
+    
+    if os.path.exists(ruta_cache):
+        with open(ruta_cache, encoding="utf-8") as f:
+            return f.read()
+    
+    texto = pytesseract.image_to_string(imagen, lang=idioma_ocr)
+    
+    # Escritura atómica: varios procesos pueden reconocer la misma imagen
+    os.makedirs(dir_cache, exist_ok=True)
+    ruta_tmp = f"{ruta_cache}.{os.getpid()}.tmp"
+    with open(ruta_tmp, "w", encoding="utf-8") as f:
+        f.write(texto)
+    os.replace(ruta_tmp, ruta_cache)
+    return texto
+
+
+def _completar_ocr(pagina: Dict, futuro) -> Dict:
+    """Sustituye el texto de una página escaneada por el resultado del OCR."""
+    if futuro is None:
+        return pagina
+    try:
+        texto = futuro.result()
+    except Exception as e:
+        logger.warning(f"Página {pagina['numero']}: OCR fallido ({e})")
+        return pagina
+    
+    logger.info(f"Página {pagina['numero']}: {len(texto.strip())} caracteres reconocidos por OCR")
+    return {**pagina, "texto": texto, "tiene_texto": len(texto.strip()) > 10, "ocr": True}
+
+
+def aplicar_ocr(
+    paginas: Iterable[Dict],
+    ruta_pdf: str,
+    idioma_ocr: str = "eng",
+    dpi: int = 300,
+    procesos: Optional[int] = None
+) -> Iterator[Dict]:
+    """
+    Etapa de OCR: reconoce solo las páginas sin capa de texto.
+    
+    Las páginas con texto pasan sin cambios; las marcadas como posible imagen
+    escaneada se rasterizan a `dpi` y se envían a un grupo de procesos con
+    Tesseract. Las páginas se entregan en el orden original, de modo que el
+    resultado entra en el mismo flujo de traducción.
+    
+    Args:
+        paginas: Páginas extraídas (por ejemplo, de iterar_paginas_pdf)
+        ruta_pdf: Ruta al archivo PDF
+        idioma_ocr: Idioma(s) de Tesseract
+        dpi: Resolución de rasterizado
+        procesos: Número de procesos con Tesseract (default: núcleos de CPU)
+    
+    Yields:
+        Páginas con el texto reconocido en las que antes no tenían texto
+    """
+    if pytesseract is None:
+        raise ImportError("pytesseract no está instalado. Ejecuta: pip install pytesseract Pillow")
+    
+    procesos = procesos or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        cola = deque()
+        try:
+            for pagina in paginas:
+                futuro = None
+                if not pagina["tiene_texto"]:
+                    futuro = pool.submit(
+                        _ocr_pagina, ruta_pdf, pagina["numero"] - 1, dpi, idioma_ocr, DIR_CACHE_OCR
+                    )
+                cola.append((pagina, futuro))
+                
+                # Entregar las páginas listas del principio de la cola; si hay
+                # demasiadas esperando, bloquearse en la primera
+                while cola and (cola[0][1] is None or cola[0][1].done() or len(cola) > procesos * 4):
+                    yield _completar_ocr(*cola.popleft())
+            
+            while cola:
+                yield _completar_ocr(*cola.popleft())
+        finally:
+            for _, futuro in cola:
+                if futuro is not None:
+                    futuro.cancel()
+            if hasattr(paginas, "close"):
+                paginas.close()
 
 
 def dividir_texto_en_chunks(texto: str, max_chars: int = 4500) -> List[str]:
@@ -296,6 +558,54 @@ def dividir_texto_en_chunks(texto: str, max_chars: int = 4500) -> List[str]:
     return chunks
 
 
+def segmentar_texto(texto: str) -> List[str]:
+    """
+    Divide el texto de una página en segmentos (una línea por segmento).
+    
+    Los encabezados, pies de página y numeraciones suelen ocupar líneas
+    propias, así que al segmentar por líneas quedan como segmentos idénticos
+    entre páginas y pueden deduplicarse.
+    """
+    return [linea.strip() for linea in texto.split('\n')]
+
+
+def es_segmento_traducible(segmento: str) -> bool:
+    """Descarta segmentos vacíos o sin letras (números de página, separadores)."""
+    return len(segmento) >= 2 and any(c.isalpha() for c in segmento)
+
+
+def empaquetar_segmentos(segmentos: List[str], max_chars: int = 4500) -> List[List[str]]:
+    """
+    Agrupa segmentos en lotes lo más llenos posible sin superar max_chars.
+    
+    Args:
+        segmentos: Segmentos a empaquetar, en orden de aparición
+        max_chars: Máximo de caracteres por lote (incluye los saltos de línea)
+    
+    Returns:
+        Lista de lotes, cada uno una lista de segmentos
+    """
+    lotes = []
+    lote_actual = []
+    tamano_actual = 0
+    
+    for segmento in segmentos:
+        # +1 por el salto de línea que separa los segmentos dentro del lote
+        tamano = len(segmento) + (1 if lote_actual else 0)
+        if lote_actual and tamano_actual + tamano > max_chars:
+            lotes.append(lote_actual)
+            lote_actual = []
+            tamano = len(segmento)
+            tamano_actual = 0
+        lote_actual.append(segmento)
+        tamano_actual += tamano
+    
+    if lote_actual:
+        lotes.append(lote_actual)
+    
+    return lotes
+
+
 # ============================================================================
 # FUNCIONES DE TRADUCCIÓN
 # ============================================================================
@@ -437,6 +747,141 @@ def traducir_pagina(
     }
 
 
+def traducir_segmentos(
+    segmentos: List[str],
+    idioma_origen: str,
+    idioma_destino: str,
+    servicio: str,
+    cache: CacheTraduccion,
+    max_chars: int = 4500
+) -> Dict[str, str]:
+    """
+    Traduce segmentos únicos empaquetándolos en el menor número de peticiones.
+    
+    Cada lote se envía como un único texto con un segmento por línea y la
+    respuesta se reparte de vuelta línea a línea. Si el servicio une o parte
+    líneas, ese lote se traduce segmento a segmento.
+    
+    Args:
+        segmentos: Segmentos sin duplicados
+        idioma_origen: Código del idioma origen
+        idioma_destino: Código del idioma destino
+        servicio: Servicio de traducción
+        cache: Instancia de CacheTraduccion (se consulta y actualiza por segmento)
+        max_chars: Máximo de caracteres por petición
+    
+    Returns:
+        Diccionario {segmento: traducción}
+    """
+    traducciones = {}
+    pendientes = []
+    
+    for segmento in segmentos:
+        traduccion_cacheada = cache.obtener(segmento, idioma_origen, idioma_destino) if cache else None
+        if traduccion_cacheada:
+            traducciones[segmento] = traduccion_cacheada
+        else:
+            pendientes.append(segmento)
+    
+    # Segmentos más largos que un lote completo: se trocean como antes
+    for segmento in [s for s in pendientes if len(s) > max_chars]:
+        partes = [
+            traducir_texto(chunk, idioma_origen, idioma_destino, servicio, cache)
+            for chunk in dividir_texto_en_chunks(segmento, max_chars)
+        ]
+        traducciones[segmento] = " ".join(partes)
+    
+    lotes = empaquetar_segmentos([s for s in pendientes if len(s) <= max_chars], max_chars)
+    logger.info(
+        f"{len(segmentos)} segmentos únicos, {len(segmentos) - len(pendientes)} en caché, "
+        f"{len(lotes)} petición(es)"
+    )
+    
+    for i, lote in enumerate(lotes):
+        texto_lote = "\n".join(lote)
+        traduccion_lote = traducir_texto(texto_lote, idioma_origen, idioma_destino, servicio)
+        lineas = traduccion_lote.split("\n")
+        
+        if len(lineas) == len(lote):
+            # Si la traducción es idéntica al original (p. ej. tras fallar los
+            # reintentos) se usa, pero no se guarda en caché
+            guardar_en_cache = cache is not None and traduccion_lote != texto_lote
+            for segmento, linea in zip(lote, lineas):
+                traducciones[segmento] = linea.strip() or segmento
+                if guardar_en_cache:
+                    cache.guardar(segmento, traducciones[segmento], idioma_origen, idioma_destino)
+        else:
+            logger.debug("El lote no conservó los saltos de línea; traduciendo por segmento")
+            for segmento in lote:
+                traducciones[segmento] = traducir_texto(
+                    segmento, idioma_origen, idioma_destino, servicio, cache
+                )
+        
+        # Pequeña pausa entre lotes para evitar rate limiting
+        if i < len(lotes) - 1:
+            time.sleep(0.3)
+    
+    return traducciones
+
+
+def traducir_documento(
+    paginas: List[Dict],
+    idioma_origen: str,
+    idioma_destino: str,
+    servicio: str,
+    cache: CacheTraduccion,
+    max_chars: int = 4500
+) -> List[Dict]:
+    """
+    Traduce varias páginas a la vez deduplicando los segmentos repetidos.
+    
+    Los encabezados, pies y textos legales que se repiten en cada página se
+    traducen una sola vez, de modo que el número de peticiones depende del
+    texto único y no del número de páginas.
+    
+    Args:
+        paginas: Páginas tal como las devuelve extraer_texto_pdf
+        idioma_origen: Código del idioma origen
+        idioma_destino: Código del idioma destino
+        servicio: Servicio de traducción
+        cache: Instancia de CacheTraduccion
+        max_chars: Máximo de caracteres por petición
+    
+    Returns:
+        Lista de páginas traducidas, en el mismo orden y formato que traducir_pagina
+    """
+    # dict.fromkeys conserva el orden de aparición y elimina duplicados
+    unicos = dict.fromkeys(
+        segmento
+        for pagina in paginas if pagina["tiene_texto"]
+        for segmento in segmentar_texto(pagina["texto"])
+        if es_segmento_traducible(segmento)
+    )
+    traducciones = traducir_segmentos(
+        list(unicos), idioma_origen, idioma_destino, servicio, cache, max_chars
+    )
+    
+    resultado = []
+    for pagina in paginas:
+        if not pagina["tiene_texto"]:
+            logger.info(f"Página {pagina['numero']}: Sin texto para traducir (posible imagen escaneada)")
+            resultado.append({
+                **pagina,
+                "texto_traducido": "[Esta página no contiene texto extraíble. Podría ser una imagen escaneada que requiere OCR.]",
+                "traducida": False
+            })
+            continue
+        
+        lineas = [traducciones.get(s, s) for s in segmentar_texto(pagina["texto"])]
+        resultado.append({
+            **pagina,
+            "texto_traducido": "\n".join(lineas),
+            "traducida": True
+        })
+    
+    return resultado
+
+
 # ============================================================================
 # FUNCIONES DE GENERACIÓN DE PDF
 # ============================================================================
@@ -546,7 +991,7 @@ class AplicacionTraductorPDF:
     def __init__(self, root: tk.Tk):
         self.root = root
         self.root.title("Traductor de PDFs")
-        self.root.geometry("800x700")
+        self.root.geometry("800x760")
         self.root.minsize(700, 600)
         
         # Variables
@@ -555,6 +1000,8 @@ class AplicacionTraductorPDF:
         self.idioma_destino = tk.StringVar(value="Español")
         self.servicio = tk.StringVar(value="Google Translate")
         self.paginas_especificas = tk.StringVar()
+        self.usar_ocr = tk.BooleanVar(value=False)
+        self.ocr_dpi = tk.StringVar(value="300")
         self.progreso = tk.DoubleVar(value=0)
         self.traduciendo = False
         self.cache = CacheTraduccion()
@@ -634,6 +1081,24 @@ class AplicacionTraductorPDF:
         ttk.Entry(frame_paginas, textvariable=self.paginas_especificas, width=30).pack(side=tk.LEFT, padx=(10, 0))
         ttk.Label(frame_paginas, text="(Dejar vacío para todas)", foreground="gray").pack(side=tk.LEFT, padx=(10, 0))
         
+        # ====== SECCIÓN: OCR ======
+        frame_ocr = ttk.LabelFrame(main_frame, text="Páginas Escaneadas (Opcional)", padding="10")
+        frame_ocr.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Checkbutton(
+            frame_ocr,
+            text="Aplicar OCR (Tesseract) a páginas sin texto",
+            variable=self.usar_ocr
+        ).pack(side=tk.LEFT)
+        ttk.Label(frame_ocr, text="Resolución (DPI):").pack(side=tk.LEFT, padx=(20, 0))
+        ttk.Combobox(
+            frame_ocr,
+            textvariable=self.ocr_dpi,
+            values=OCR_DPI_OPCIONES,
+            state="readonly",
+            width=6
+        ).pack(side=tk.LEFT, padx=(5, 0))
+        
         # ====== SECCIÓN: Botones de acción ======
         frame_botones = ttk.Frame(main_frame)
         frame_botones.pack(fill=tk.X, pady=(0, 10))
@@ -785,6 +1250,18 @@ class AplicacionTraductorPDF:
             messagebox.showwarning("Aviso", "El idioma origen y destino son iguales")
             return
         
+        # OCR opcional (las variables de tkinter se leen aquí, en el hilo principal)
+        ocr_dpi = None
+        if self.usar_ocr.get():
+            if pytesseract is None:
+                messagebox.showerror(
+                    "Error",
+                    "El OCR requiere pytesseract y Tesseract.\n"
+                    "Instalar con: pip install pytesseract Pillow"
+                )
+                return
+            ocr_dpi = int(self.ocr_dpi.get())
+        
         # Deshabilitar controles
         self.traduciendo = True
         self.btn_traducir.config(state=tk.DISABLED)
@@ -794,7 +1271,7 @@ class AplicacionTraductorPDF:
         # Iniciar en hilo separado
         hilo = threading.Thread(
             target=self._proceso_traduccion,
-            args=(ruta, codigo_origen, codigo_destino, servicio, paginas),
+            args=(ruta, codigo_origen, codigo_destino, servicio, paginas, ocr_dpi),
             daemon=True
         )
         hilo.start()
@@ -805,70 +1282,91 @@ class AplicacionTraductorPDF:
         idioma_origen: str,
         idioma_destino: str,
         servicio: str,
-        paginas: Optional[List[int]]
+        paginas: Optional[List[int]],
+        ocr_dpi: Optional[int] = None
     ):
         """Proceso principal de traducción (ejecutado en hilo separado)."""
         try:
-            # ====== PASO 1: Extraer texto ======
-            self._log("📄 Extrayendo texto del PDF...", "info")
-            self.lbl_progreso.config(text="Extrayendo texto...")
+            # ====== PASO 1: Abrir PDF ======
+            self._log("📄 Abriendo PDF...", "info")
+            self.lbl_progreso.config(text="Abriendo PDF...")
             
             try:
-                paginas_extraidas = extraer_texto_pdf(ruta_pdf, paginas)
+                total_paginas = len(indices_a_extraer(contar_paginas_pdf(ruta_pdf), paginas))
             except Exception as e:
-                self._log(f"❌ Error al extraer texto: {e}", "error")
+                self._log(f"❌ Error al abrir el PDF: {e}", "error")
                 self._finalizar_traduccion(exito=False)
                 return
             
-            total_paginas = len(paginas_extraidas)
-            self._log(f"✓ {total_paginas} página(s) extraída(s)", "exito")
+            self._log(f"✓ {total_paginas} página(s) a procesar", "exito")
             
-            # Verificar si hay texto para traducir
-            paginas_con_texto = sum(1 for p in paginas_extraidas if p["tiene_texto"])
-            if paginas_con_texto == 0:
-                self._log(
-                    "⚠️ El PDF no contiene texto extraíble. "
-                    "Podría ser un documento escaneado que requiere OCR (pytesseract).",
-                    "aviso"
-                )
-            
-            # ====== PASO 2: Traducir páginas ======
-            self._log(f"🌐 Traduciendo con {servicio.upper()}...", "info")
+            # ====== PASO 2: Extraer y traducir páginas ======
+            # La extracción corre en procesos aparte; cada lote se traduce en
+            # cuanto está disponible, sin esperar al resto del documento.
+            self._log(f"🌐 Extrayendo y traduciendo con {servicio.upper()}...", "info")
             self.lbl_progreso.config(text="Traduciendo...")
             
             paginas_traducidas = []
+            paginas_extraidas = iterar_paginas_pdf(ruta_pdf, paginas)
+            if ocr_dpi:
+                # Solo las páginas sin texto pasan por Tesseract
+                self._log(f"🔍 OCR activado para páginas escaneadas ({ocr_dpi} DPI)", "info")
+                paginas_extraidas = aplicar_ocr(
+                    paginas_extraidas,
+                    ruta_pdf,
+                    OCR_LANG_MAP.get(idioma_origen, "eng"),
+                    ocr_dpi
+                )
+            lotes = agrupar_en_lotes(paginas_extraidas, PAGINAS_POR_LOTE)
             
-            def actualizar_progreso(num_pagina):
-                progreso = (len(paginas_traducidas) / total_paginas) * 100
-                self.progreso.set(progreso)
-                self.lbl_progreso.config(text=f"Traduciendo página {num_pagina}...")
-            
-            # Traducir secuencialmente (para evitar rate limiting excesivo)
-            for pagina in paginas_extraidas:
+            # Traducir por lotes de páginas: los segmentos repetidos dentro del
+            # lote se envían una vez y la caché los reutiliza en los siguientes
+            while True:
                 if not self.traduciendo:
+                    paginas_extraidas.close()
                     self._log("⚠️ Traducción cancelada por el usuario", "aviso")
                     self._finalizar_traduccion(exito=False)
                     return
                 
                 try:
-                    pagina_traducida = traducir_pagina(
-                        pagina,
+                    lote = next(lotes, None)
+                except Exception as e:
+                    self._log(f"❌ Error al extraer texto: {e}", "error")
+                    self._finalizar_traduccion(exito=False)
+                    return
+                if lote is None:
+                    break
+                
+                rango = f"{lote[0]['numero']}-{lote[-1]['numero']}"
+                self.lbl_progreso.config(text=f"Traduciendo páginas {rango}...")
+                
+                try:
+                    paginas_traducidas.extend(traducir_documento(
+                        lote,
                         idioma_origen,
                         idioma_destino,
                         servicio,
-                        self.cache,
-                        actualizar_progreso
-                    )
-                    paginas_traducidas.append(pagina_traducida)
-                    self._log(f"  ✓ Página {pagina['numero']} traducida", "exito")
+                        self.cache
+                    ))
+                    self._log(f"  ✓ Páginas {rango} traducidas", "exito")
                 except Exception as e:
-                    self._log(f"  ❌ Error en página {pagina['numero']}: {e}", "error")
-                    # Añadir página sin traducir
-                    paginas_traducidas.append({
+                    self._log(f"  ❌ Error en páginas {rango}: {e}", "error")
+                    # Añadir páginas sin traducir
+                    paginas_traducidas.extend({
                         **pagina,
                         "texto_traducido": f"[Error de traducción: {e}]\n\n{pagina['texto']}",
                         "traducida": False
-                    })
+                    } for pagina in lote)
+                
+                self.progreso.set((len(paginas_traducidas) / total_paginas) * 100)
+            
+            # Verificar si había texto para traducir
+            if not any(p["tiene_texto"] for p in paginas_traducidas):
+                self._log(
+                    "⚠️ El PDF no contiene texto extraíble. "
+                    "Podría ser un documento escaneado que requiere OCR (pytesseract).",
+                    "aviso"
+                )
             
             # ====== PASO 3: Generar PDF ======
             self._log("📝 Generando PDF traducido...", "info")
@@ -10,6 +10,7 @@ Versión CLI del traductor de PDFs, sin dependencia de tkinter.
 Uso:
     python3 translate_pdf_cli.py documento.pdf -d es
     python3 translate_pdf_cli.py documento.pdf -o en -d es -p 1,3,5-10
+    python3 translate_pdf_cli.py informes/ "otros/*.pdf" -d es -O traducidos/
 
 Autor: Generado automáticamente
 Fecha: Diciembre 2025
@@ -24,10 +25,23 @@ if sys.version_info < (3, 6):
     print("Error: Se requiere Python 3.6 o superior.", file=sys.stderr)
     sys.exit(1)
 import argparse
+import functools
+import glob
+import json
 import logging
+import re
+import shutil
+import threading
 import time
 import hashlib
-from typing import Optional, List, Dict
+import html
+import io
+import itertools
+import urllib.parse
+import urllib.request
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, List, Dict, Iterable, Iterator, Callable, Tuple
 
 # ============================================================================
 # CONFIGURACIÓN DE LOGGING
@@ -54,10 +68,24 @@ try:
     from reportlab.lib.units import cm
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
     from reportlab.lib.enums import TA_JUSTIFY
+    from reportlab.lib.utils import simpleSplit
+    from reportlab.pdfgen import canvas
 except ImportError:
     SimpleDocTemplate = None
     logger.debug("reportlab no instalado. Ejecuta: pip install reportlab")
 
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    PdfWriter = None
+    logger.debug("pypdf no instalado. Ejecuta: pip install pypdf")
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+    logger.debug("pytesseract no instalado (OCR opcional). Ejecuta: pip install pytesseract Pillow")
+
 # ============================================================================
 # TRADUCCIÓN
 # ============================================================================
@@ -106,6 +134,55 @@ IDIOMAS = {
     "auto": "Auto-detectar",
 }
 
+# Páginas que se traducen juntas; los segmentos repetidos dentro del lote
+# se envían una sola vez.
+PAGINAS_POR_LOTE = 20
+
+# Páginas que extrae cada proceso trabajador por tarea.
+PAGINAS_POR_TAREA = 25
+
+# Idiomas de Tesseract para el OCR opcional (auto → inglés).
+OCR_LANG_MAP = {
+    "es": "spa",
+    "en": "eng",
+    "fr": "fra",
+    "de": "deu",
+    "it": "ita",
+    "pt": "por",
+    "ru": "rus",
+    "zh-CN": "chi_sim",
+    "zh-TW": "chi_tra",
+    "ja": "jpn",
+    "ko": "kor",
+    "ar": "ara",
+    "hi": "hin",
+    "nl": "nld",
+    "pl": "pol",
+    "tr": "tur",
+    "sv": "swe",
+    "da": "dan",
+    "no": "nor",
+    "fi": "fin",
+    "el": "ell",
+    "he": "heb",
+    "th": "tha",
+    "vi": "vie",
+    "id": "ind",
+    "ms": "msa",
+    "ca": "cat",
+    "uk": "ukr",
+    "cs": "ces",
+    "ro": "ron",
+    "hu": "hun",
+}
+
+# Texto OCR guardado por huella de la imagen de la página.
+DIR_CACHE_OCR = os.path.join(os.path.expanduser("~"), ".cache", "translate_pdf", "ocr")
+
+# Modos de salida: "reflujo" genera un documento A4 nuevo con el texto
+# traducido; "superpuesto" escribe la traducción sobre las páginas originales.
+MODOS_SALIDA = ["reflujo", "superpuesto"]
+
 # MyMemory requiere códigos regionales para varios idiomas.
 MYMEMORY_LANG_MAP = {
     "es": "es-ES",
@@ -138,12 +215,26 @@ def normalizar_codigo_idioma(codigo: str, servicio: str) -> str:
 # CLASE: Caché de Traducciones
 # ============================================================================
 class CacheTraduccion:
-    """Caché en memoria para evitar traducir el mismo texto múltiples veces."""
+    """Caché en memoria para evitar traducir el mismo texto múltiples veces.
+    
+    Es segura entre hilos, de modo que varios PDFs traducidos en paralelo
+    comparten las mismas entradas. Con `ruta` se carga al crearla y se puede
+    volcar a disco con guardar_en_disco() para reutilizarla entre ejecuciones.
+    """
     
-    def __init__(self):
+    def __init__(self, ruta: Optional[str] = None):
         self._cache: Dict[str, str] = {}
         self._hits = 0
         self._misses = 0
+        self._lock = threading.Lock()
+        self._lock_disco = threading.Lock()
+        self.ruta = ruta
+        if ruta and os.path.exists(ruta):
+            try:
+                with open(ruta, encoding="utf-8") as f:
+                    self._cache.update(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"⚠️  No se pudo cargar la caché {ruta}: {e}")
     
     def _generar_clave(self, texto: str, idioma_origen: str, idioma_destino: str) -> str:
         contenido = f"{idioma_origen}:{idioma_destino}:{texto}"
@@ -151,56 +242,346 @@ class CacheTraduccion:
     
     def obtener(self, texto: str, idioma_origen: str, idioma_destino: str) -> Optional[str]:
         clave = self._generar_clave(texto, idioma_origen, idioma_destino)
-        if clave in self._cache:
-            self._hits += 1
-            return self._cache[clave]
-        self._misses += 1
-        return None
+        with self._lock:
+            if clave in self._cache:
+                self._hits += 1
+                return self._cache[clave]
+            self._misses += 1
+            return None
     
     def guardar(self, texto: str, traduccion: str, idioma_origen: str, idioma_destino: str):
         clave = self._generar_clave(texto, idioma_origen, idioma_destino)
-        self._cache[clave] = traduccion
+        with self._lock:
+            self._cache[clave] = traduccion
+    
+    def guardar_en_disco(self):
+        if not self.ruta:
+            return
+        with self._lock:
+            contenido = dict(self._cache)
+        # Los hilos del modo lote guardan a la vez: escritura y reemplazo bajo
+        # un candado propio (las consultas siguen libres) y temporal único por
+        # si otro proceso usa la misma caché
+        ruta_tmp = f"{self.ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock_disco:
+            with open(ruta_tmp, "w", encoding="utf-8") as f:
+                json.dump(contenido, f, ensure_ascii=False)
+            os.replace(ruta_tmp, self.ruta)
     
     def estadisticas(self) -> Dict[str, int]:
         return {"hits": self._hits, "misses": self._misses, "entradas": len(self._cache)}
 
 
+# ============================================================================
+# CLASE: Limitador de peticiones
+# ============================================================================
+class LimitadorTasa:
+    """Espacia las peticiones al servicio de traducción, compartido entre hilos.
+    
+    Sustituye a la pausa fija entre peticiones: con varios PDFs en paralelo el
+    límite se respeta en conjunto, y un error (p. ej. 429) frena a todos.
+    """
+    
+    def __init__(self, peticiones_por_segundo: float):
+        self.intervalo = 1.0 / peticiones_por_segundo if peticiones_por_segundo > 0 else 0.0
+        self._lock = threading.Lock()
+        self._siguiente = 0.0
+        self.peticiones = 0
+        self.espera_total = 0.0
+    
+    def esperar(self):
+        with self._lock:
+            ahora = time.monotonic()
+            turno = max(ahora, self._siguiente)
+            self._siguiente = turno + self.intervalo
+            self.peticiones += 1
+            self.espera_total += turno - ahora
+        if turno > ahora:
+            time.sleep(turno - ahora)
+    
+    def penalizar(self, segundos: float):
+        """Retrasa las próximas peticiones de todos los hilos."""
+        with self._lock:
+            self._siguiente = max(self._siguiente, time.monotonic() + segundos)
+    
+    def estadisticas(self) -> Dict:
+        return {"peticiones": self.peticiones, "espera_s": round(self.espera_total, 1)}
+
+
 # ============================================================================
 # FUNCIONES DE EXTRACCIÓN
 # ============================================================================
-def extraer_texto_pdf(ruta_pdf: str, paginas: Optional[List[int]] = None) -> List[Dict]:
-    """Extrae el texto de un PDF página por página."""
+def contar_paginas_pdf(ruta_pdf: str) -> int:
+    """Devuelve el número de páginas del PDF."""
     if pdfplumber is None:
         raise ImportError("pdfplumber no está instalado")
+    with pdfplumber.open(ruta_pdf) as pdf:
+        return len(pdf.pages)
+
+
+def indices_a_extraer(total_paginas: int, paginas: Optional[List[int]] = None) -> List[int]:
+    """Convierte páginas 1-indexed en índices válidos (todas si paginas es None)."""
+    if paginas:
+        return [p - 1 for p in paginas if 0 < p <= total_paginas]
+    return list(range(total_paginas))
+
+
+def agrupar_palabras_en_bloques(palabras: List[Dict]) -> List[Dict]:
+    """Agrupa las palabras de pdfplumber (con posición) en bloques de texto.
+    
+    Primero forma líneas por proximidad vertical y las corta donde hay un hueco
+    de columna; después une líneas consecutivas que se solapan en horizontal y
+    tienen el mismo tamaño de letra. Cada bloque conserva su caja
+    (x0, top, x1, bottom) en coordenadas de pdfplumber.
+    """
+    lineas = []
+    for palabra in sorted(palabras, key=lambda p: (p["top"], p["x0"])):
+        tamano = palabra.get("size") or (palabra["bottom"] - palabra["top"])
+        if lineas and abs(palabra["top"] - lineas[-1][0]["top"]) <= tamano * 0.5:
+            lineas[-1].append(palabra)
+        else:
+            lineas.append([palabra])
+    
+    tramos = []
+    for linea in lineas:
+        tramo = None
+        for palabra in sorted(linea, key=lambda p: p["x0"]):
+            tamano = palabra.get("size") or (palabra["bottom"] - palabra["top"])
+            if tramo and palabra["x0"] - tramo["x1"] <= tamano * 1.5:
+                tramo["texto"] += " " + palabra["text"]
+                tramo["x1"] = max(tramo["x1"], palabra["x1"])
+                tramo["top"] = min(tramo["top"], palabra["top"])
+                tramo["bottom"] = max(tramo["bottom"], palabra["bottom"])
+            else:
+                tramo = {
+                    "texto": palabra["text"],
+                    "x0": palabra["x0"], "top": palabra["top"],
+                    "x1": palabra["x1"], "bottom": palabra["bottom"],
+                    "tamano": tamano,
+                }
+                tramos.append(tramo)
     
+    bloques = []
+    for tramo in tramos:
+        for bloque in reversed(bloques):
+            mismo_estilo = abs(bloque["tamano"] - tramo["tamano"]) < 1
+            cerca = 0 <= tramo["top"] - bloque["bottom"] <= bloque["tamano"] * 0.8
+            solapa = tramo["x0"] < bloque["x1"] and tramo["x1"] > bloque["x0"]
+            if mismo_estilo and cerca and solapa:
+                bloque["texto"] += " " + tramo["texto"]
+                bloque["x0"] = min(bloque["x0"], tramo["x0"])
+                bloque["x1"] = max(bloque["x1"], tramo["x1"])
+                bloque["bottom"] = max(bloque["bottom"], tramo["bottom"])
+                break
+        else:
+            bloques.append(dict(tramo))
+    
+    return bloques
+
+
+def _extraer_rango(ruta_pdf: str, indices: List[int], con_bloques: bool = False) -> List[Dict]:
+    """Extrae un rango de páginas. Se ejecuta en un proceso trabajador con su propia copia del PDF."""
     resultados = []
     
     with pdfplumber.open(ruta_pdf) as pdf:
-        total_paginas = len(pdf.pages)
-        print(f"📄 PDF abierto: {total_paginas} páginas detectadas")
-        
-        if paginas:
-            indices = [p - 1 for p in paginas if 0 < p <= total_paginas]
-        else:
-            indices = range(total_paginas)
-        
         for idx in indices:
             pagina = pdf.pages[idx]
-            texto = pagina.extract_text() or ""
-            tiene_texto = len(texto.strip()) > 10
-            
+            if con_bloques:
+                # Cada bloque ocupa una línea del texto de la página: así los
+                # segmentos traducidos corresponden uno a uno con las cajas
+                palabras = pagina.extract_words(use_text_flow=True, extra_attrs=["size"])
+                bloques = agrupar_palabras_en_bloques(palabras)
+                texto = "\n".join(b["texto"] for b in bloques)
+            else:
+                bloques = None
+                texto = pagina.extract_text() or ""
             resultados.append({
                 "numero": idx + 1,
                 "texto": texto,
-                "tiene_texto": tiene_texto,
+                "tiene_texto": len(texto.strip()) > 10,
             })
-            
-            if not tiene_texto:
-                print(f"  ⚠️  Página {idx + 1}: Sin texto (posible imagen escaneada)")
+            if bloques is not None:
+                resultados[-1]["bloques"] = bloques
+            # Liberar las cachés de objetos y layout que pdfplumber guarda por página
+            pagina.close()
     
     return resultados
 
 
+def iterar_paginas_pdf(
+    ruta_pdf: str,
+    paginas: Optional[List[int]] = None,
+    procesos: Optional[int] = None,
+    con_bloques: bool = False
+) -> Iterator[Dict]:
+    """Genera las páginas extraídas en orden, repartiendo rangos entre procesos.
+    
+    Con con_bloques=True cada página incluye además sus bloques de texto con
+    posición (necesarios para la salida superpuesta).
+    """
+    total_paginas = contar_paginas_pdf(ruta_pdf)
+    print(f"📄 PDF abierto: {total_paginas} páginas detectadas")
+    
+    indices = indices_a_extraer(total_paginas, paginas)
+    rangos = [indices[i:i + PAGINAS_POR_TAREA] for i in range(0, len(indices), PAGINAS_POR_TAREA)]
+    procesos = procesos or os.cpu_count() or 1
+    
+    def _avisar(resultados: List[Dict]) -> Iterator[Dict]:
+        for pagina in resultados:
+            if not pagina["tiene_texto"]:
+                print(f"  ⚠️  Página {pagina['numero']}: Sin texto (posible imagen escaneada)")
+            yield pagina
+    
+    if procesos <= 1 or len(rangos) <= 1:
+        for rango in rangos:
+            yield from _avisar(_extraer_rango(ruta_pdf, rango, con_bloques))
+        return
+    
+    # Como máximo 2 rangos por proceso en vuelo: la extracción avanza mientras
+    # se traduce, pero no acumula en memoria todo el documento.
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        rangos_restantes = iter(rangos)
+        en_vuelo = deque(
+            pool.submit(_extraer_rango, ruta_pdf, rango, con_bloques)
+            for rango in itertools.islice(rangos_restantes, procesos * 2)
+        )
+        try:
+            while en_vuelo:
+                resultados = en_vuelo.popleft().result()
+                siguiente = next(rangos_restantes, None)
+                if siguiente is not None:
+                    en_vuelo.append(pool.submit(_extraer_rango, ruta_pdf, siguiente, con_bloques))
+                yield from _avisar(resultados)
+        finally:
+            for futuro in en_vuelo:
+                futuro.cancel()
+
+
+def extraer_texto_pdf(ruta_pdf: str, paginas: Optional[List[int]] = None) -> List[Dict]:
+    """Extrae el texto de un PDF página por página."""
+    return list(iterar_paginas_pdf(ruta_pdf, paginas))
+
+
+def agrupar_en_lotes(iterable: Iterable, tamano: int) -> Iterator[List]:
+    """Agrupa los elementos de un iterable en listas de hasta `tamano` elementos."""
+    iterador = iter(iterable)
+    while True:
+        lote = list(itertools.islice(iterador, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+# ============================================================================
+# OCR DE PÁGINAS ESCANEADAS (opcional)
+# ============================================================================
+def _ocr_pagina(ruta_pdf: str, idx: int, dpi: int, idioma_ocr: str, dir_cache: str) -> List[Dict]:
+    """Rasteriza una página y la pasa por Tesseract. Retorna palabras con posición en puntos PDF.
+    
+    Se ejecuta en un proceso trabajador. El resultado se guarda en disco con la
+    huella SHA-256 de la imagen, así que una página ya reconocida (en este u
+    otro documento) no vuelve a pasar por Tesseract.
+    """
+    with pdfplumber.open(ruta_pdf) as pdf:
+        pagina = pdf.pages[idx]
+        imagen = pagina.to_image(resolution=dpi).original
+        pagina.close()
+    
+    huella = hashlib.sha256()
+    huella.update(f"{imagen.mode}:{imagen.size}:{idioma_ocr}:".encode("utf-8"))
+    huella.update(imagen.tobytes())
+    ruta_cache = os.path.join(dir_cache, huella.hexdigest() + ".json")
+    
+    try:
+        with open(ruta_cache, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    
+    datos = pytesseract.image_to_data(imagen, lang=idioma_ocr, output_type=pytesseract.Output.DICT)
+    escala = 72.0 / dpi  # píxeles → puntos PDF
+    palabras = []
+    for i, texto in enumerate(datos["text"]):
+        if not texto.strip() or float(datos["conf"][i]) < 0:
+            continue
+        palabras.append({
+            "text": texto.strip(),
+            "x0": datos["left"][i] * escala,
+            "x1": (datos["left"][i] + datos["width"][i]) * escala,
+            "top": datos["top"][i] * escala,
+            "bottom": (datos["top"][i] + datos["height"][i]) * escala,
+            "size": datos["height"][i] * escala,
+        })
+    
+    os.makedirs(dir_cache, exist_ok=True)
+    ruta_tmp = f"{ruta_cache}.{os.getpid()}.tmp"
+    with open(ruta_tmp, "w", encoding="utf-8") as f:
+        json.dump(palabras, f)
+    os.replace(ruta_tmp, ruta_cache)
+    return palabras
+
+
+def _completar_ocr(pagina: Dict, futuro) -> Dict:
+    """Sustituye el texto de una página escaneada por el resultado del OCR."""
+    if futuro is None:
+        return pagina
+    try:
+        bloques = agrupar_palabras_en_bloques(futuro.result())
+    except Exception as e:
+        print(f"  ⚠️  Página {pagina['numero']}: OCR fallido ({e})")
+        return pagina
+    
+    texto = "\n".join(b["texto"] for b in bloques)
+    pagina = {**pagina, "texto": texto, "tiene_texto": len(texto.strip()) > 10, "ocr": True}
+    if "bloques" in pagina:
+        pagina["bloques"] = bloques
+    print(f"  🔍 Página {pagina['numero']}: {len(texto)} caracteres reconocidos por OCR")
+    return pagina
+
+
+def aplicar_ocr(
+    paginas: Iterable[Dict],
+    ruta_pdf: str,
+    idioma_ocr: str = "eng",
+    dpi: int = 300,
+    procesos: Optional[int] = None
+) -> Iterator[Dict]:
+    """Etapa de OCR: reconoce solo las páginas sin capa de texto, en paralelo y conservando el orden.
+    
+    Las páginas con texto pasan sin cambios; las marcadas como posible imagen
+    escaneada se rasterizan a `dpi` y se envían a un grupo de procesos con
+    Tesseract. El resultado vuelve al mismo flujo de traducción.
+    """
+    if pytesseract is None:
+        raise ImportError("pytesseract no está instalado. Ejecuta: pip install pytesseract Pillow")
+    
+    procesos = procesos or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        cola = deque()
+        try:
+            for pagina in paginas:
+                futuro = None
+                if not pagina["tiene_texto"]:
+                    futuro = pool.submit(
+                        _ocr_pagina, ruta_pdf, pagina["numero"] - 1, dpi, idioma_ocr, DIR_CACHE_OCR
+                    )
+                cola.append((pagina, futuro))
+                
+                # Entregar las páginas listas del principio de la cola; si hay
+                # demasiadas esperando, bloquearse en la primera
+                while cola and (cola[0][1] is None or cola[0][1].done() or len(cola) > procesos * 4):
+                    yield _completar_ocr(*cola.popleft())
+            
+            while cola:
+                yield _completar_ocr(*cola.popleft())
+        finally:
+            for _, futuro in cola:
+                if futuro is not None:
+                    futuro.cancel()
+            if hasattr(paginas, "close"):
+                paginas.close()
+
+
 def dividir_texto_en_chunks(texto: str, max_chars: int = 4500) -> List[str]:
     """Divide texto largo en chunks para la API."""
     if len(texto) <= max_chars:
@@ -237,21 +618,139 @@ def dividir_texto_en_chunks(texto: str, max_chars: int = 4500) -> List[str]:
     return chunks
 
 
+def segmentar_texto(texto: str) -> List[str]:
+    """Divide el texto de una página en segmentos (una línea por segmento)."""
+    return [linea.strip() for linea in texto.split('\n')]
+
+
+def es_segmento_traducible(segmento: str) -> bool:
+    """Descarta segmentos vacíos o sin letras (números de página, separadores)."""
+    return len(segmento) >= 2 and any(c.isalpha() for c in segmento)
+
+
+def empaquetar_segmentos(segmentos: List[str], max_chars: int = 4500) -> List[List[str]]:
+    """Agrupa segmentos en lotes lo más llenos posible sin superar max_chars."""
+    lotes = []
+    lote_actual = []
+    tamano_actual = 0
+
+    for segmento in segmentos:
+        # +1 por el salto de línea que separa los segmentos dentro del lote
+        tamano = len(segmento) + (1 if lote_actual else 0)
+        if lote_actual and tamano_actual + tamano > max_chars:
+            lotes.append(lote_actual)
+            lote_actual = []
+            tamano = len(segmento)
+            tamano_actual = 0
+        lote_actual.append(segmento)
+        tamano_actual += tamano
+
+    if lote_actual:
+        lotes.append(lote_actual)
+
+    return lotes
+
+
 # ============================================================================
 # FUNCIONES DE TRADUCCIÓN
 # ============================================================================
+ENV_ENDPOINT_TRADUCCION = "TRANSLATE_PDF_ENDPOINT"
+
+_traductores_por_hilo = threading.local()
+
+
+class ErrorTraduccion(Exception):
+    """El servicio no devolvió una traducción tras agotar los reintentos."""
+
+
+class TraductorSimulado:
+    """Traductor para servidor_traduccion_simulado.py (TRANSLATE_PDF_ENDPOINT).
+    
+    Hace con la biblioteca estándar la misma petición que el servicio
+    elegido: GET /m?sl=...&tl=...&q=... (HTML) para Google y
+    GET /get?langpair=...&q=... (JSON) para MyMemory. No usa deep-translator.
+    Un código distinto de 200 lanza una excepción, igual que el servicio
+    real, para que actúen los reintentos.
+    """
+    
+    _RESULTADO_HTML = re.compile(r'<div class="(?:t0|result-container)">(.*?)</div>', re.DOTALL)
+    
+    def __init__(self, endpoint: str, servicio: str, source: str, target: str, timeout: float = 30.0):
+        self.servicio = servicio
+        if servicio == "mymemory":
+            self.url = endpoint.rstrip("/") + "/get"
+            self.parametros = {"langpair": f"{source}|{target}"}
+        else:
+            self.url = endpoint.rstrip("/") + "/m"
+            self.parametros = {"sl": source, "tl": target}
+        self.timeout = timeout
+    
+    def translate(self, text: str) -> str:
+        consulta = urllib.parse.urlencode({**self.parametros, "q": text})
+        with urllib.request.urlopen(f"{self.url}?{consulta}", timeout=self.timeout) as respuesta:
+            cuerpo = respuesta.read().decode("utf-8")
+        if self.servicio == "mymemory":
+            return json.loads(cuerpo)["responseData"]["translatedText"]
+        coincidencia = self._RESULTADO_HTML.search(cuerpo)
+        if not coincidencia:
+            raise ValueError("Respuesta sin traducción")
+        return html.unescape(coincidencia.group(1))
+
+
+def crear_traductor(servicio: str, idioma_origen: str, idioma_destino: str):
+    """Crea una instancia de deep-translator para el servicio indicado.
+    
+    Si TRANSLATE_PDF_ENDPOINT está definida (p. ej. http://127.0.0.1:8765),
+    las peticiones van a ese servidor mediante TraductorSimulado en lugar
+    del servicio real; ver servidor_traduccion_simulado.py.
+    """
+    endpoint = os.environ.get(ENV_ENDPOINT_TRADUCCION)
+    if endpoint:
+        return TraductorSimulado(
+            endpoint,
+            servicio,
+            normalizar_codigo_idioma(idioma_origen, servicio),
+            normalizar_codigo_idioma(idioma_destino, servicio),
+        )
+    
+    if GoogleTranslator is None:
+        raise ImportError("deep-translator no está instalado")
+    if servicio == "mymemory":
+        source = normalizar_codigo_idioma(idioma_origen, servicio)
+        target = normalizar_codigo_idioma(idioma_destino, servicio)
+        return MyMemoryTranslator(source=source, target=target)
+    return GoogleTranslator(source=idioma_origen, target=idioma_destino)
+
+
+def obtener_traductor(servicio: str, idioma_origen: str, idioma_destino: str):
+    """Devuelve un traductor reutilizable del grupo del hilo actual.
+    
+    Las instancias de deep-translator guardan estado de la petición, así que
+    no se comparten entre hilos, pero sí entre páginas y archivos del mismo hilo.
+    """
+    traductores = getattr(_traductores_por_hilo, "instancias", None)
+    if traductores is None:
+        traductores = _traductores_por_hilo.instancias = {}
+    clave = (servicio, idioma_origen, idioma_destino)
+    if clave not in traductores:
+        traductores[clave] = crear_traductor(servicio, idioma_origen, idioma_destino)
+    return traductores[clave]
+
+
 def traducir_texto(
     texto: str,
     idioma_origen: str,
     idioma_destino: str,
     servicio: str = "google",
     cache: Optional[CacheTraduccion] = None,
-    max_reintentos: int = 3
+    max_reintentos: int = 3,
+    limitador: Optional[LimitadorTasa] = None
 ) -> str:
-    """Traduce texto con reintentos exponenciales."""
-    if GoogleTranslator is None:
-        raise ImportError("deep-translator no está instalado")
+    """Traduce texto con reintentos exponenciales.
     
+    Lanza ErrorTraduccion si fallan todos los intentos, para que quien llama
+    no confunda el texto original con una traducción terminada.
+    """
     if not texto or len(texto.strip()) < 2:
         return texto
     
@@ -261,19 +760,13 @@ def traducir_texto(
         if traduccion_cacheada:
             return traduccion_cacheada
     
-    # Seleccionar traductor
-    if servicio == "google":
-        traductor = GoogleTranslator(source=idioma_origen, target=idioma_destino)
-    elif servicio == "mymemory":
-        source = normalizar_codigo_idioma(idioma_origen, servicio)
-        target = normalizar_codigo_idioma(idioma_destino, servicio)
-        traductor = MyMemoryTranslator(source=source, target=target)
-    else:
-        traductor = GoogleTranslator(source=idioma_origen, target=idioma_destino)
+    traductor = obtener_traductor(servicio, idioma_origen, idioma_destino)
     
     # Reintentos exponenciales
     for intento in range(max_reintentos):
         try:
+            if limitador:
+                limitador.esperar()
             traduccion = traductor.translate(texto)
             if cache and traduccion:
                 cache.guardar(texto, traduccion, idioma_origen, idioma_destino)
@@ -282,10 +775,11 @@ def traducir_texto(
             tiempo_espera = (2 ** intento) + (0.1 * intento)
             print(f"    ⚠️  Error (intento {intento + 1}/{max_reintentos}): {e}")
             print(f"       Reintentando en {tiempo_espera:.1f}s...")
+            if limitador:
+                limitador.penalizar(tiempo_espera)
             time.sleep(tiempo_espera)
     
-    print(f"    ❌ No se pudo traducir después de {max_reintentos} intentos")
-    return texto
+    raise ErrorTraduccion(f"No se pudo traducir después de {max_reintentos} intentos")
 
 
 def traducir_pagina(
@@ -308,9 +802,15 @@ def traducir_pagina(
     
     chunks = dividir_texto_en_chunks(texto_original)
     chunks_traducidos = []
+    fallidos = 0
     
     for i, chunk in enumerate(chunks):
-        traduccion = traducir_texto(chunk, idioma_origen, idioma_destino, servicio, cache)
+        try:
+            traduccion = traducir_texto(chunk, idioma_origen, idioma_destino, servicio, cache)
+        except ErrorTraduccion as e:
+            print(f"    ❌ Página {numero}: {e}")
+            traduccion = chunk
+            fallidos += 1
         chunks_traducidos.append(traduccion)
         if i < len(chunks) - 1:
             time.sleep(0.3)
@@ -318,10 +818,134 @@ def traducir_pagina(
     return {
         **pagina_info,
         "texto_traducido": "\n\n".join(chunks_traducidos),
-        "traducida": True
+        "traducida": fallidos == 0
     }
 
 
+def traducir_segmentos(
+    segmentos: List[str],
+    idioma_origen: str,
+    idioma_destino: str,
+    servicio: str,
+    cache: CacheTraduccion,
+    max_chars: int = 4500,
+    limitador: Optional[LimitadorTasa] = None
+) -> Tuple[Dict[str, str], set]:
+    """Traduce segmentos únicos empaquetándolos en lotes.
+    
+    Retorna ({segmento: traducción}, segmentos_fallidos). Los segmentos que no
+    se pudieron traducir conservan el texto original y no se guardan en caché.
+    """
+    traducciones = {}
+    fallidos = set()
+    pendientes = []
+
+    for segmento in segmentos:
+        traduccion_cacheada = cache.obtener(segmento, idioma_origen, idioma_destino) if cache else None
+        if traduccion_cacheada:
+            traducciones[segmento] = traduccion_cacheada
+        else:
+            pendientes.append(segmento)
+
+    # Segmentos más largos que un lote completo: se trocean como antes
+    for segmento in [s for s in pendientes if len(s) > max_chars]:
+        try:
+            partes = [
+                traducir_texto(chunk, idioma_origen, idioma_destino, servicio, cache, limitador=limitador)
+                for chunk in dividir_texto_en_chunks(segmento, max_chars)
+            ]
+        except ErrorTraduccion:
+            traducciones[segmento] = segmento
+            fallidos.add(segmento)
+            continue
+        traducciones[segmento] = " ".join(partes)
+
+    lotes = empaquetar_segmentos([s for s in pendientes if len(s) <= max_chars], max_chars)
+
+    for i, lote in enumerate(lotes):
+        texto_lote = "\n".join(lote)
+        try:
+            traduccion_lote = traducir_texto(
+                texto_lote, idioma_origen, idioma_destino, servicio, limitador=limitador
+            )
+        except ErrorTraduccion:
+            # Ya se agotaron los reintentos; no insistir segmento a segmento
+            for segmento in lote:
+                traducciones[segmento] = segmento
+            fallidos.update(lote)
+            continue
+        lineas = traduccion_lote.split("\n")
+
+        if len(lineas) == len(lote):
+            for segmento, linea in zip(lote, lineas):
+                traducciones[segmento] = linea.strip() or segmento
+                if cache:
+                    cache.guardar(segmento, traducciones[segmento], idioma_origen, idioma_destino)
+        else:
+            # El servicio unió o partió líneas: traducir el lote segmento a segmento
+            for segmento in lote:
+                try:
+                    traducciones[segmento] = traducir_texto(
+                        segmento, idioma_origen, idioma_destino, servicio, cache, limitador=limitador
+                    )
+                except ErrorTraduccion:
+                    traducciones[segmento] = segmento
+                    fallidos.add(segmento)
+
+        # Sin limitador compartido, pausa fija entre peticiones
+        if limitador is None and i < len(lotes) - 1:
+            time.sleep(0.3)
+
+    return traducciones, fallidos
+
+
+def traducir_documento(
+    paginas: List[Dict],
+    idioma_origen: str,
+    idioma_destino: str,
+    servicio: str,
+    cache: CacheTraduccion,
+    max_chars: int = 4500,
+    limitador: Optional[LimitadorTasa] = None
+) -> List[Dict]:
+    """Traduce varias páginas deduplicando segmentos repetidos entre ellas.
+    
+    Las páginas con algún segmento sin traducir quedan con "traducida": False
+    y "error_traduccion": True.
+    """
+    # dict.fromkeys conserva el orden de aparición y elimina duplicados
+    unicos = dict.fromkeys(
+        segmento
+        for pagina in paginas if pagina["tiene_texto"]
+        for segmento in segmentar_texto(pagina["texto"])
+        if es_segmento_traducible(segmento)
+    )
+    traducciones, fallidos = traducir_segmentos(
+        list(unicos), idioma_origen, idioma_destino, servicio, cache, max_chars, limitador
+    )
+
+    resultado = []
+    for pagina in paginas:
+        if not pagina["tiene_texto"]:
+            resultado.append({
+                **pagina,
+                "texto_traducido": "[Página sin texto extraíble - posible imagen escaneada]",
+                "traducida": False
+            })
+            continue
+
+        segmentos = segmentar_texto(pagina["texto"])
+        con_error = any(s in fallidos for s in segmentos)
+        resultado.append({
+            **pagina,
+            "texto_traducido": "\n".join(traducciones.get(s, s) for s in segmentos),
+            "traducida": not con_error,
+            "error_traduccion": con_error
+        })
+
+    return resultado
+
+
 # ============================================================================
 # GENERACIÓN DE PDF
 # ============================================================================
@@ -393,6 +1017,191 @@ def generar_pdf_traducido(paginas_traducidas: List[Dict], ruta_salida: str) -> b
         return False
 
 
+def _ajustar_texto(texto: str, ancho: float, alto: float, tamano: float):
+    """Reduce el tamaño de letra hasta que el texto quepa en la caja. Retorna (tamaño, líneas)."""
+    tamano = max(tamano, 4)
+    while True:
+        lineas = simpleSplit(texto, "Helvetica", tamano, ancho)
+        if len(lineas) * tamano * 1.15 <= alto or tamano <= 4:
+            return tamano, lineas
+        tamano -= 0.5
+
+
+def _crear_capa_traduccion(pagina: Dict, ancho: float, alto: float, origen_x: float, origen_y: float):
+    """Dibuja en una página nueva los bloques traducidos, tapando el texto original."""
+    buffer = io.BytesIO()
+    lienzo = canvas.Canvas(buffer, pagesize=(ancho, alto))
+    lienzo.translate(origen_x, origen_y)
+    
+    traducciones = pagina["texto_traducido"].split("\n")
+    for bloque, texto in zip(pagina["bloques"], traducciones):
+        caja_ancho = bloque["x1"] - bloque["x0"]
+        caja_alto = bloque["bottom"] - bloque["top"]
+        # pdfplumber mide desde arriba; reportlab desde abajo
+        y_inferior = alto - bloque["bottom"]
+        
+        lienzo.setFillColorRGB(1, 1, 1)
+        lienzo.rect(bloque["x0"] - 1, y_inferior - 1, caja_ancho + 2, caja_alto + 2, stroke=0, fill=1)
+        
+        tamano, lineas = _ajustar_texto(texto, caja_ancho, caja_alto, bloque["tamano"])
+        lienzo.setFillColorRGB(0, 0, 0)
+        lienzo.setFont("Helvetica", tamano)
+        y = alto - bloque["top"] - tamano
+        for linea in lineas:
+            lienzo.drawString(bloque["x0"], y, linea)
+            y -= tamano * 1.15
+    
+    lienzo.showPage()
+    lienzo.save()
+    buffer.seek(0)
+    return PdfReader(buffer).pages[0]
+
+
+def generar_pdf_superpuesto(ruta_original: str, paginas_traducidas: List[Dict], ruta_salida: str) -> bool:
+    """Genera el PDF traducido escribiendo la traducción sobre las páginas originales.
+    
+    Conserva imágenes, fuentes y maquetación del original. Las páginas se
+    procesan de una en una; pypdf solo carga las que se van copiando.
+    """
+    if SimpleDocTemplate is None or PdfWriter is None:
+        raise ImportError("reportlab y pypdf son necesarios para la salida superpuesta")
+    
+    try:
+        lector = PdfReader(ruta_original)
+        escritor = PdfWriter()
+        
+        for pagina in paginas_traducidas:
+            original = lector.pages[pagina["numero"] - 1]
+            if pagina.get("traducida") and pagina.get("bloques"):
+                caja = original.mediabox
+                capa = _crear_capa_traduccion(
+                    pagina, float(caja.width), float(caja.height), float(caja.left), float(caja.bottom)
+                )
+                original.merge_page(capa)
+            escritor.add_page(original)
+        
+        with open(ruta_salida, "wb") as f:
+            escritor.write(f)
+        escritor.close()
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error al generar PDF: {e}")
+        return False
+
+
+# ============================================================================
+# CLASE: Salida incremental con checkpoints
+# ============================================================================
+class SalidaIncremental:
+    """Escribe el PDF traducido por partes (rangos de páginas) con checkpoint.
+    
+    Cada lote traducido se guarda como un PDF independiente en
+    `<salida>.partes/` y se anota en un manifiesto JSON. Si la ejecución se
+    interrumpe, la siguiente retoma las páginas que faltan. Al terminar, las
+    partes se unen en el PDF final.
+    """
+    
+    def __init__(self, ruta_salida: str, firma: Dict, reiniciar: bool = False,
+                 generar: Callable[[List[Dict], str], bool] = None):
+        self.ruta_salida = ruta_salida
+        self.generar = generar or generar_pdf_traducido
+        self.dir_partes = ruta_salida + ".partes"
+        self.ruta_manifiesto = os.path.join(self.dir_partes, "manifiesto.json")
+        self.firma = firma
+        self.partes: List[Dict] = []
+        
+        if not reiniciar:
+            self._cargar()
+        
+        # Eliminar restos de partes incompletas o de otra ejecución
+        archivos_validos = {p["archivo"] for p in self.partes}
+        if os.path.isdir(self.dir_partes):
+            for nombre in os.listdir(self.dir_partes):
+                if nombre not in archivos_validos and nombre != "manifiesto.json":
+                    os.remove(os.path.join(self.dir_partes, nombre))
+        os.makedirs(self.dir_partes, exist_ok=True)
+    
+    def _cargar(self):
+        try:
+            with open(self.ruta_manifiesto, encoding="utf-8") as f:
+                manifiesto = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        if manifiesto.get("firma") != self.firma:
+            print("   ⚠️  Checkpoints de otra ejecución (archivo o idiomas distintos); se descartan")
+            return
+        
+        # Las partes con errores de traducción se vuelven a generar
+        for parte in manifiesto.get("partes", []):
+            if parte.get("completa") and os.path.exists(os.path.join(self.dir_partes, parte["archivo"])):
+                self.partes.append(parte)
+    
+    def _guardar_manifiesto(self):
+        ruta_tmp = self.ruta_manifiesto + ".tmp"
+        with open(ruta_tmp, "w", encoding="utf-8") as f:
+            json.dump({"firma": self.firma, "partes": self.partes}, f, ensure_ascii=False, indent=2)
+        os.replace(ruta_tmp, self.ruta_manifiesto)
+    
+    def paginas_completadas(self) -> set:
+        return {numero for parte in self.partes for numero in parte["paginas"]}
+    
+    def guardar_parte(self, paginas_traducidas: List[Dict], completa: bool = True) -> str:
+        """Genera el PDF de un lote de páginas y lo registra en el manifiesto."""
+        numeros = [p["numero"] for p in paginas_traducidas]
+        archivo = f"parte_{numeros[0]:05d}-{numeros[-1]:05d}.pdf"
+        ruta = os.path.join(self.dir_partes, archivo)
+        
+        # Escribir a un temporal para que una interrupción no deje una parte a medias
+        ruta_tmp = ruta + ".tmp"
+        if not self.generar(paginas_traducidas, ruta_tmp):
+            raise RuntimeError(f"No se pudo generar la parte {archivo}")
+        os.replace(ruta_tmp, ruta)
+        
+        self.partes.append({"archivo": archivo, "paginas": numeros, "completa": completa})
+        self._guardar_manifiesto()
+        return ruta
+    
+    def fusionar(self) -> bool:
+        """Une las partes en el PDF final. Conserva los checkpoints si alguna parte tuvo errores."""
+        if PdfWriter is None:
+            raise ImportError("pypdf no está instalado (necesario para unir las partes)")
+        if not self.partes:
+            return False
+        
+        writer = PdfWriter()
+        for parte in sorted(self.partes, key=lambda p: p["paginas"][0]):
+            writer.append(os.path.join(self.dir_partes, parte["archivo"]))
+        
+        ruta_tmp = self.ruta_salida + ".tmp"
+        with open(ruta_tmp, "wb") as f:
+            writer.write(f)
+        writer.close()
+        os.replace(ruta_tmp, self.ruta_salida)
+        
+        if all(parte["completa"] for parte in self.partes):
+            shutil.rmtree(self.dir_partes, ignore_errors=True)
+        return True
+
+
+def firma_ejecucion(ruta_pdf: str, origen: str, destino: str, servicio: str,
+                    paginas: Optional[List[int]], modo: str = "reflujo", ocr: bool = False) -> Dict:
+    """Identifica una ejecución; los checkpoints solo se reutilizan si coincide."""
+    estado = os.stat(ruta_pdf)
+    return {
+        "pdf": os.path.abspath(ruta_pdf),
+        "tamano": estado.st_size,
+        "modificado": estado.st_mtime_ns,
+        "origen": origen,
+        "destino": destino,
+        "servicio": servicio,
+        "paginas": paginas,
+        "modo": modo,
+        "ocr": ocr,
+    }
+
+
 # ============================================================================
 # FUNCIÓN PRINCIPAL
 # ============================================================================
@@ -420,6 +1229,274 @@ def parsear_paginas(texto: str) -> Optional[List[int]]:
     return sorted(set(paginas)) if paginas else None
 
 
+def expandir_entradas(entradas: List[str], recursivo: bool = False) -> Tuple[List[str], List[str]]:
+    """Convierte archivos, carpetas y patrones glob en una lista de PDFs sin duplicados.
+    
+    Devuelve (pdfs, no_encontrados). Se omiten las salidas de ejecuciones
+    anteriores (*_traducido.pdf) para no traducirlas de nuevo.
+    """
+    pdfs: List[str] = []
+    no_encontrados: List[str] = []
+    vistos = set()
+    
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            if recursivo:
+                candidatos = [
+                    os.path.join(raiz, nombre)
+                    for raiz, _, nombres in os.walk(entrada)
+                    for nombre in nombres
+                ]
+            else:
+                candidatos = [os.path.join(entrada, nombre) for nombre in os.listdir(entrada)]
+            candidatos = sorted(c for c in candidatos if c.lower().endswith(".pdf") and os.path.isfile(c))
+        elif os.path.isfile(entrada):
+            candidatos = [entrada]
+        else:
+            candidatos = sorted(c for c in glob.glob(entrada, recursive=recursivo) if os.path.isfile(c))
+            if not candidatos:
+                no_encontrados.append(entrada)
+                continue
+        
+        for candidato in candidatos:
+            clave = os.path.abspath(candidato)
+            if clave in vistos or os.path.splitext(candidato)[0].endswith("_traducido"):
+                continue
+            vistos.add(clave)
+            pdfs.append(candidato)
+    
+    return pdfs, no_encontrados
+
+
+def ruta_salida_por_defecto(ruta_pdf: str, directorio: str = "") -> str:
+    directorio = directorio or os.path.dirname(ruta_pdf) or "."
+    nombre_base = os.path.splitext(os.path.basename(ruta_pdf))[0]
+    return os.path.join(directorio, f"{nombre_base}_traducido.pdf")
+
+
+def rutas_salida_lote(pdfs: List[str], directorio: str = "") -> Dict[str, str]:
+    """Asigna a cada PDF del lote su PDF traducido.
+    
+    Sin `directorio` la salida queda junto a cada original. Con él se
+    conserva la estructura de carpetas a partir de la carpeta común de las
+    entradas, de modo que a/informe.pdf y b/informe.pdf no se pisan (ni
+    comparten el directorio de checkpoints). Lanza ValueError si aun así dos
+    entradas coinciden en la misma salida.
+    """
+    if not directorio:
+        rutas = {pdf: ruta_salida_por_defecto(pdf) for pdf in pdfs}
+    else:
+        carpetas = [os.path.dirname(os.path.abspath(pdf)) for pdf in pdfs]
+        try:
+            base = os.path.commonpath(carpetas)
+        except ValueError:
+            base = None  # p. ej. unidades distintas en Windows
+        rutas = {}
+        for pdf, carpeta in zip(pdfs, carpetas):
+            relativa = os.path.relpath(carpeta, base) if base else ""
+            rutas[pdf] = ruta_salida_por_defecto(pdf, os.path.normpath(os.path.join(directorio, relativa)))
+    
+    por_salida: Dict[str, List[str]] = {}
+    for pdf, salida in rutas.items():
+        por_salida.setdefault(os.path.normcase(os.path.abspath(salida)), []).append(pdf)
+    repetidas = [entradas for entradas in por_salida.values() if len(entradas) > 1]
+    if repetidas:
+        detalle = "; ".join(" y ".join(entradas) for entradas in repetidas)
+        raise ValueError(f"Varias entradas generarían el mismo PDF de salida: {detalle}")
+    return rutas
+
+
+def procesar_pdf(
+    ruta_pdf: str,
+    ruta_salida: str,
+    args: argparse.Namespace,
+    paginas: Optional[List[int]],
+    cache: CacheTraduccion,
+    limitador: Optional[LimitadorTasa] = None,
+    procesos: Optional[int] = None,
+    prefijo: str = ""
+) -> Dict:
+    """Traduce un PDF con checkpoints y devuelve un resumen del resultado.
+    
+    Lanza RuntimeError si el archivo no se puede abrir, extraer o guardar;
+    las partes ya traducidas se conservan para reanudar.
+    """
+    inicio = time.time()
+    
+    # PASO 1: Abrir PDF y revisar checkpoints
+    print(f"{prefijo}📄 PASO 1: Abriendo PDF...")
+    try:
+        indices = indices_a_extraer(contar_paginas_pdf(ruta_pdf), paginas)
+    except Exception as e:
+        raise RuntimeError(f"Error al abrir el PDF: {e}") from e
+    
+    total_paginas = len(indices)
+    print(f"{prefijo}   ✓ {total_paginas} página(s) a procesar")
+    
+    firma = firma_ejecucion(
+        ruta_pdf, args.origen, args.destino, args.servicio, paginas, args.modo, args.ocr
+    )
+    if args.modo == "superpuesto":
+        generar = functools.partial(generar_pdf_superpuesto, ruta_pdf)
+    else:
+        generar = generar_pdf_traducido
+    salida = SalidaIncremental(ruta_salida, firma, reiniciar=args.reiniciar, generar=generar)
+    completadas = salida.paginas_completadas()
+    pendientes = [idx + 1 for idx in indices if idx + 1 not in completadas]
+    if len(pendientes) < total_paginas:
+        print(f"{prefijo}   ↻ Reanudando: {total_paginas - len(pendientes)} página(s) ya traducida(s)")
+    
+    # PASO 2: Extraer y traducir. La extracción corre en procesos aparte y
+    # cada lote se traduce en cuanto está disponible y se guarda como una
+    # parte del PDF final (checkpoint).
+    print(f"{prefijo}🌐 PASO 2: Extrayendo y traduciendo páginas...")
+    procesadas = total_paginas - len(pendientes)
+    if pendientes:
+        paginas_extraidas = iterar_paginas_pdf(
+            ruta_pdf, pendientes, procesos, con_bloques=(args.modo == "superpuesto")
+        )
+        if args.ocr:
+            idioma_ocr = args.ocr_idioma or OCR_LANG_MAP.get(args.origen, "eng")
+            paginas_extraidas = aplicar_ocr(
+                paginas_extraidas, ruta_pdf, idioma_ocr, args.ocr_dpi, procesos
+            )
+    else:
+        paginas_extraidas = iter(())
+    
+    lotes_con_error = 0
+    try:
+        # Los segmentos repetidos (encabezados, pies) se traducen una sola vez
+        # por lote de páginas; la caché los reutiliza en los lotes siguientes.
+        for lote in agrupar_en_lotes(paginas_extraidas, PAGINAS_POR_LOTE):
+            procesadas += len(lote)
+            rango = f"[{procesadas}/{total_paginas}] Páginas {lote[0]['numero']}-{lote[-1]['numero']}"
+            try:
+                lote_traducido = traducir_documento(
+                    lote, args.origen, args.destino, args.servicio, cache, limitador=limitador
+                )
+                sin_texto = sum(1 for p in lote_traducido if not p["tiene_texto"])
+                con_error = sum(1 for p in lote_traducido if p.get("error_traduccion"))
+                detalle = f" ({sin_texto} sin texto)" if sin_texto else ""
+                # Una parte con páginas sin traducir no es un checkpoint válido:
+                # se conserva para reintentarla en la siguiente ejecución
+                completa = con_error == 0
+                if completa:
+                    print(f"{prefijo}   {rango} ✓{detalle}")
+                else:
+                    print(f"{prefijo}   {rango} ❌ {con_error} página(s) sin traducir{detalle}")
+                    lotes_con_error += 1
+            except Exception as e:
+                print(f"{prefijo}   {rango} ❌ Error: {e}")
+                lote_traducido = [{
+                    **pagina,
+                    "texto_traducido": f"[Error: {e}]\n\n{pagina['texto']}",
+                    "traducida": False
+                } for pagina in lote]
+                completa = False
+                lotes_con_error += 1
+            
+            try:
+                salida.guardar_parte(lote_traducido, completa)
+            except Exception as e:
+                raise RuntimeError(f"Error al guardar la parte: {e}") from e
+    except RuntimeError:
+        raise
+    except Exception as e:
+        raise RuntimeError(
+            f"Error al extraer texto: {e} (las partes ya traducidas quedan en "
+            f"{salida.dir_partes}; vuelve a ejecutar para reanudar)"
+        ) from e
+    
+    # PASO 3: Unir las partes en el PDF final
+    print(f"{prefijo}📝 PASO 3: Uniendo partes del PDF traducido...")
+    try:
+        exito = salida.fusionar()
+    except Exception as e:
+        raise RuntimeError(f"Error: {e} (las partes traducidas quedan en {salida.dir_partes})") from e
+    if not exito:
+        raise RuntimeError("Error al generar PDF")
+    
+    print(f"{prefijo}   ✓ PDF guardado: {ruta_salida}")
+    incompleto = os.path.isdir(salida.dir_partes)
+    if incompleto:
+        print(f"{prefijo}   ⚠️  Hubo lotes con errores; vuelve a ejecutar para reintentarlos")
+    
+    return {
+        "pdf": ruta_pdf,
+        "salida": ruta_salida,
+        "estado": "incompleto" if incompleto else "ok",
+        "paginas": total_paginas,
+        "paginas_traducidas": len(pendientes),
+        "lotes_con_error": lotes_con_error,
+        "segundos": round(time.time() - inicio, 1),
+    }
+
+
+def traducir_lote_archivos(
+    pdfs: List[str],
+    args: argparse.Namespace,
+    paginas: Optional[List[int]],
+    cache: CacheTraduccion,
+    limitador: LimitadorTasa
+) -> List[Dict]:
+    """Traduce varios PDFs en paralelo compartiendo caché, traductores y límite de peticiones.
+    
+    Cada archivo se procesa en un hilo (el trabajo pesado ocurre en los
+    procesos de extracción y en la red); los núcleos se reparten entre ellos.
+    """
+    trabajos = max(1, min(args.trabajos, len(pdfs)))
+    procesos = args.procesos or max(1, (os.cpu_count() or 1) // trabajos)
+    # Todas las salidas se deciden antes de empezar: dos trabajos nunca
+    # comparten PDF ni checkpoints
+    rutas_salida = rutas_salida_lote(pdfs, args.output)
+    for ruta_salida in rutas_salida.values():
+        os.makedirs(os.path.dirname(ruta_salida) or ".", exist_ok=True)
+    
+    def procesar(indice: int, ruta_pdf: str) -> Dict:
+        prefijo = f"[{indice}/{len(pdfs)} {os.path.basename(ruta_pdf)}] "
+        ruta_salida = rutas_salida[ruta_pdf]
+        try:
+            resultado = procesar_pdf(
+                ruta_pdf, ruta_salida, args, paginas, cache, limitador, procesos, prefijo
+            )
+        except Exception as e:
+            print(f"{prefijo}❌ {e}")
+            return {"pdf": ruta_pdf, "salida": ruta_salida, "estado": "error", "error": str(e)}
+        # Guardar la caché tras cada archivo para no perderla si se interrumpe el lote
+        try:
+            cache.guardar_en_disco()
+        except OSError as e:
+            print(f"{prefijo}⚠️  No se pudo guardar la caché: {e}")
+        return resultado
+    
+    with ThreadPoolExecutor(max_workers=trabajos) as pool:
+        futuros = [pool.submit(procesar, i, ruta) for i, ruta in enumerate(pdfs, 1)]
+        return [futuro.result() for futuro in futuros]
+
+
+def escribir_resumen(ruta: str, resultados: List[Dict], cache: CacheTraduccion,
+                     limitador: LimitadorTasa, segundos: float):
+    """Guarda el resumen del lote en JSON."""
+    resumen = {
+        "archivos": resultados,
+        "totales": {
+            "archivos": len(resultados),
+            "ok": sum(1 for r in resultados if r["estado"] == "ok"),
+            "incompletos": sum(1 for r in resultados if r["estado"] == "incompleto"),
+            "errores": sum(1 for r in resultados if r["estado"] == "error"),
+            "paginas": sum(r.get("paginas", 0) for r in resultados),
+            "segundos": round(segundos, 1),
+        },
+        "cache": cache.estadisticas(),
+        "peticiones": limitador.estadisticas(),
+    }
+    ruta_tmp = ruta + ".tmp"
+    with open(ruta_tmp, "w", encoding="utf-8") as f:
+        json.dump(resumen, f, ensure_ascii=False, indent=2)
+    os.replace(ruta_tmp, ruta)
+    return resumen
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Traductor de PDFs - Versión CLI",
@@ -429,6 +1506,8 @@ Ejemplos:
   python3 translate_pdf_cli.py documento.pdf -d es
   python3 translate_pdf_cli.py libro.pdf -o en -d es -s google
   python3 translate_pdf_cli.py manual.pdf -d fr -p 1,3,5-10
+  python3 translate_pdf_cli.py informes/ -d es -O traducidos/ --trabajos 4
+  python3 translate_pdf_cli.py "facturas/**/*.pdf" -r -d en --cache cache.json
 
 Idiomas soportados:
   es (Español), en (Inglés), fr (Francés), de (Alemán), it (Italiano),
@@ -438,20 +1517,50 @@ Idiomas soportados:
         """
     )
     
-    parser.add_argument("pdf", help="Ruta al archivo PDF a traducir")
+    parser.add_argument("pdf", nargs="+",
+                        help="PDF(s) a traducir; también carpetas o patrones glob (modo lote)")
     parser.add_argument("-o", "--origen", default="auto", help="Idioma origen (default: auto)")
     parser.add_argument("-d", "--destino", required=True, help="Idioma destino (requerido)")
     parser.add_argument("-s", "--servicio", default="google", choices=["google", "mymemory"],
                         help="Servicio de traducción (default: google)")
     parser.add_argument("-p", "--paginas", default="", help="Páginas específicas: 1,3,5-10")
-    parser.add_argument("-O", "--output", default="", help="Ruta del PDF de salida (opcional)")
+    parser.add_argument("-O", "--output", default="",
+                        help="Ruta del PDF de salida; en modo lote, carpeta de salida (opcional)")
+    parser.add_argument("-m", "--modo", default="reflujo", choices=MODOS_SALIDA,
+                        help="reflujo: documento nuevo con el texto traducido; "
+                             "superpuesto: traducción sobre las páginas originales (default: reflujo)")
+    parser.add_argument("--ocr", action="store_true",
+                        help="Aplicar OCR (Tesseract) a las páginas sin texto extraíble")
+    parser.add_argument("--ocr-dpi", type=int, default=300,
+                        help="Resolución para rasterizar las páginas escaneadas (default: 300)")
+    parser.add_argument("--ocr-idioma", default="",
+                        help="Idioma(s) de Tesseract, ej. spa+eng (default: según el idioma origen)")
+    parser.add_argument("--reiniciar", action="store_true",
+                        help="Descartar checkpoints de una ejecución anterior y empezar de cero")
+    parser.add_argument("-j", "--procesos", type=int, default=None,
+                        help="Procesos para extraer texto en paralelo (default: núcleos de CPU)")
+    parser.add_argument("-r", "--recursivo", action="store_true",
+                        help="Buscar PDFs también en subcarpetas (y '**' en patrones glob)")
+    parser.add_argument("--trabajos", type=int, default=1,
+                        help="PDFs traducidos a la vez en modo lote (default: 1)")
+    parser.add_argument("--max-peticiones", type=float, default=3.0,
+                        help="Máximo de peticiones por segundo al servicio, compartido (default: 3)")
+    parser.add_argument("--cache", default="",
+                        help="Archivo JSON para conservar la caché de traducciones entre ejecuciones")
+    parser.add_argument("--resumen", default="",
+                        help="Ruta del resumen JSON del lote (default: resumen_traduccion.json)")
     
     args = parser.parse_args()
     
-    # Validar archivo
-    if not os.path.exists(args.pdf):
-        print(f"❌ Archivo no encontrado: {args.pdf}")
+    # Validar archivos
+    pdfs, no_encontrados = expandir_entradas(args.pdf, args.recursivo)
+    for entrada in no_encontrados:
+        print(f"❌ Archivo no encontrado: {entrada}")
+    if not pdfs:
+        if not no_encontrados:
+            print("❌ No se encontraron PDFs en las rutas indicadas")
         sys.exit(1)
+    modo_lote = len(args.pdf) > 1 or not os.path.isfile(args.pdf[0])
     
     # Validar idiomas
     if args.origen not in IDIOMAS:
@@ -464,97 +1573,104 @@ Idiomas soportados:
         print(f"   Opciones: {', '.join(k for k in IDIOMAS.keys() if k != 'auto')}")
         sys.exit(1)
     
-    # Verificar dependencias
-    if pdfplumber is None or SimpleDocTemplate is None or GoogleTranslator is None:
+    # Verificar dependencias (contra el servidor simulado no hace falta deep-translator)
+    sin_traductor = GoogleTranslator is None and not os.environ.get(ENV_ENDPOINT_TRADUCCION)
+    if pdfplumber is None or SimpleDocTemplate is None or sin_traductor:
         print("❌ Faltan dependencias. Ejecuta:")
         print("   pip install pdfplumber reportlab deep-translator")
         sys.exit(1)
     
+    if args.ocr:
+        try:
+            if pytesseract is None:
+                raise ImportError("pytesseract no está instalado")
+            pytesseract.get_tesseract_version()
+        except Exception as e:
+            print(f"❌ OCR no disponible: {e}")
+            print("   pip install pytesseract Pillow  (y Tesseract: brew install tesseract tesseract-lang)")
+            sys.exit(1)
+    
     # Parsear páginas
     paginas = parsear_paginas(args.paginas)
     
-    # Determinar ruta de salida
-    if args.output:
-        ruta_salida = args.output
-    else:
-        directorio = os.path.dirname(args.pdf) or "."
-        nombre_base = os.path.splitext(os.path.basename(args.pdf))[0]
-        ruta_salida = os.path.join(directorio, f"{nombre_base}_traducido.pdf")
-    
-    cache = CacheTraduccion()
+    cache = CacheTraduccion(args.cache or None)
+    limitador = LimitadorTasa(args.max_peticiones)
     
     print("=" * 60)
     print("📚 TRADUCTOR DE PDFs - CLI")
     print("=" * 60)
-    print(f"📄 Archivo:  {args.pdf}")
+    if modo_lote:
+        print(f"📂 Archivos: {len(pdfs)} PDF(s), {max(1, min(args.trabajos, len(pdfs)))} a la vez")
+    else:
+        print(f"📄 Archivo:  {pdfs[0]}")
     print(f"🌐 Idiomas:  {IDIOMAS[args.origen]} → {IDIOMAS[args.destino]}")
-    print(f"🔧 Servicio: {args.servicio.upper()}")
+    print(f"🔧 Servicio: {args.servicio.upper()} (máx. {args.max_peticiones:g} peticiones/s)")
+    print(f"🖨️  Modo:     {args.modo}")
+    if args.ocr:
+        print(f"🔍 OCR:      páginas escaneadas a {args.ocr_dpi} DPI")
     if paginas:
         print(f"📑 Páginas:  {args.paginas}")
-    print(f"💾 Salida:   {ruta_salida}")
+    if modo_lote:
+        print(f"💾 Salida:   {args.output or 'junto a cada PDF'}")
+    else:
+        ruta_salida = args.output or ruta_salida_por_defecto(pdfs[0])
+        print(f"💾 Salida:   {ruta_salida}")
     print("=" * 60)
     print()
     
-    # PASO 1: Extraer texto
-    print("📄 PASO 1: Extrayendo texto del PDF...")
-    try:
-        paginas_extraidas = extraer_texto_pdf(args.pdf, paginas)
-    except Exception as e:
-        print(f"❌ Error al extraer texto: {e}")
-        sys.exit(1)
-    
-    total_paginas = len(paginas_extraidas)
-    print(f"   ✓ {total_paginas} página(s) extraída(s)")
-    print()
-    
-    # PASO 2: Traducir
-    print("🌐 PASO 2: Traduciendo páginas...")
-    paginas_traducidas = []
-    
-    for i, pagina in enumerate(paginas_extraidas, 1):
-        print(f"   [{i}/{total_paginas}] Página {pagina['numero']}...", end=" ", flush=True)
+    if not modo_lote:
         try:
-            pagina_traducida = traducir_pagina(
-                pagina, args.origen, args.destino, args.servicio, cache
-            )
-            paginas_traducidas.append(pagina_traducida)
-            if pagina_traducida["traducida"]:
-                print("✓")
-            else:
-                print("⚠️  (sin texto)")
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            paginas_traducidas.append({
-                **pagina,
-                "texto_traducido": f"[Error: {e}]\n\n{pagina['texto']}",
-                "traducida": False
-            })
-    
-    print()
+            resultado = procesar_pdf(pdfs[0], ruta_salida, args, paginas, cache, limitador, args.procesos)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        finally:
+            cache.guardar_en_disco()
+        
+        # Estadísticas
+        stats = cache.estadisticas()
+        print()
+        print("=" * 60)
+        if resultado["estado"] == "ok":
+            print("🎉 ¡TRADUCCIÓN COMPLETADA!")
+        else:
+            print("⚠️  TRADUCCIÓN INCOMPLETA (hay páginas sin traducir)")
+        print("=" * 60)
+        if stats["hits"] > 0:
+            print(f"📊 Caché: {stats['hits']} hits, {stats['misses']} misses")
+        print(f"💾 Archivo: {ruta_salida}")
+        print()
+        return
     
-    # PASO 3: Generar PDF
-    print("📝 PASO 3: Generando PDF traducido...")
+    # Modo lote
+    inicio = time.time()
     try:
-        exito = generar_pdf_traducido(paginas_traducidas, ruta_salida)
-        if exito:
-            print(f"   ✓ PDF guardado: {ruta_salida}")
-        else:
-            print("   ❌ Error al generar PDF")
-            sys.exit(1)
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
+        resultados = traducir_lote_archivos(pdfs, args, paginas, cache, limitador)
+    except ValueError as e:
+        print(f"❌ {e}")
         sys.exit(1)
+    cache.guardar_en_disco()
+    ruta_resumen = args.resumen or os.path.join(args.output or ".", "resumen_traduccion.json")
+    resumen = escribir_resumen(ruta_resumen, resultados, cache, limitador, time.time() - inicio)
     
-    # Estadísticas
-    stats = cache.estadisticas()
+    totales = resumen["totales"]
     print()
     print("=" * 60)
-    print("🎉 ¡TRADUCCIÓN COMPLETADA!")
+    print("🎉 ¡LOTE COMPLETADO!" if not totales["errores"] else "⚠️  LOTE COMPLETADO CON ERRORES")
     print("=" * 60)
-    if stats["hits"] > 0:
-        print(f"📊 Caché: {stats['hits']} hits, {stats['misses']} misses")
-    print(f"💾 Archivo: {ruta_salida}")
+    for r in resultados:
+        icono = {"ok": "✓", "incompleto": "⚠️ ", "error": "❌"}[r["estado"]]
+        detalle = r.get("error") or f"{r['paginas']} pág., {r['segundos']}s"
+        print(f"   {icono} {os.path.basename(r['pdf'])}: {detalle}")
+    print(f"📊 {totales['ok']} ok, {totales['incompletos']} incompletos, {totales['errores']} con error "
+          f"— {totales['paginas']} páginas en {totales['segundos']}s")
+    stats = resumen["cache"]
+    print(f"📊 Caché: {stats['hits']} hits, {stats['misses']} misses; "
+          f"{resumen['peticiones']['peticiones']} peticiones al servicio")
+    print(f"📋 Resumen: {ruta_resumen}")
     print()
+    if totales["errores"]:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Verificación y benchmark de la detección de características de md_to_pdf.py
+
+Compara scan_markdown_features (una pasada por líneas) con el detector
+anterior basado en expresiones regulares sobre el texto completo:
+
+1. Corpus de casos: documentos reales del repositorio, casos límite escritos
+   a mano y documentos aleatorios. Ambos detectores deben coincidir.
+2. Rendimiento: tiempo y pico de memoria en archivos de varios MB, incluido
+   uno con líneas largas que hacen retroceder a las expresiones regulares.
+
+Uso:
+    python benchmark_features.py
+    python benchmark_features.py --size-mb 32 --random 5000
+"""
+
+import sys
+import io
+import re
+import random
+import tempfile
+import time
+import tracemalloc
+import argparse
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from md_to_pdf import scan_markdown_features
+
+
+def detect_features_regex(content: str) -> Dict[str, bool]:
+    """Detector anterior (referencia): una búsqueda con regex por característica"""
+    features = {}
+    features["has_code"] = bool(re.search(r'```[\s\S]*?```', content) or
+                                re.search(r'`[^`]+`', content))
+    features["has_latex"] = bool(re.search(r'\$[^$]+\$', content) or
+                                 re.search(r'\\\(.*?\\\)', content) or
+                                 re.search(r'\\\[.*?\\\]', content))
+    features["has_tables"] = bool(re.search(r'\|.*\|', content))
+    features["has_images"] = bool(re.search(r'!\[.*?\]\(.*?\)', content))
+    features["has_math"] = features["has_latex"] or bool(
+        re.search(r'\\begin\{.*?\}', content) or
+        re.search(r'\\frac\{', content) or
+        re.search(r'\\sum|\\int|\\prod', content)
+    )
+    features["is_long"] = len(content.split()) > 5000
+    return features
+
+
+def detect_features_streaming(content: str) -> Dict[str, bool]:
+    # Como al leer el archivo: solo \n separa líneas (no \u2028, \x0c, ...)
+    return scan_markdown_features(io.StringIO(content))
+
+
+# Casos límite: cada uno ejercita una frontera de las expresiones originales
+EDGE_CASES = [
+    "",
+    "texto simple sin nada especial",
+    "``````",                      # dos ``` sin contenido: código
+    "````",                        # un solo ``` (más una comilla pegada)
+    "`",
+    "``",
+    "`a",
+    "a`\nb`",                      # comillas en líneas distintas
+    "```\ncode\n```",
+    "```python\nprint(1)\n",       # bloque sin cerrar
+    "$",
+    "$$",
+    "$$$$",
+    "$a",
+    "precio $5 y $10",
+    "$\n$",                        # el salto de línea cuenta como contenido
+    "\\(x\\)",
+    "\\( x",
+    "x \\)",
+    "\\)\\(",                      # cierre antes de la apertura
+    "\\(\n\\)",                    # el punto no cruza líneas
+    "\\[a\\]",
+    "\\[\n\\]",
+    "|",
+    "| a |",
+    "|\n|",
+    "a || b",
+    "![alt](img.png)",
+    "![alt](img.png",
+    "![alt]img.png)",
+    "![](",
+    "![]()",
+    "![a] (b)",
+    "![x\n](y)",
+    "](x) ![y",
+    "![a](b ![c](d)",
+    "\\begin{equation}",
+    "\\begin{",
+    "\\begin\n{x}",
+    "\\frac{1}{2}",
+    "\\frac 12",
+    "\\summary",                   # \sum como prefijo también cuenta
+    "\\integral",
+    "\\product",
+    "palabra " * 5000,
+    "palabra " * 5001,
+    "a\tb\x0bc\x0cd\u00a0e\u2028f",
+    "\\(x\u2028\\) |\x0c|",          # separadores que no son \n siguen en la misma línea
+    "\r\n".join(["| a | b |", "`x`", "$y$"]),
+]
+
+ALPHABET = ['`', '```', '$', '$$', '|', '![', '](', ')', '(', '[', ']', '\\', '\\(', '\\)',
+            '\\[', '\\]', '\\begin{', '}', '{', '\\frac{', '\\sum', '\\int', '\\prod',
+            'a', 'b', ' ', ' ', '\n', '\n', '\t', 'palabra ']
+
+
+def random_document(rng: random.Random, length: int) -> str:
+    return "".join(rng.choice(ALPHABET) for _ in range(length))
+
+
+def repository_documents(root: Path) -> List[Tuple[str, str]]:
+    """Markdown reales del repositorio (hasta 200) como parte del corpus"""
+    documents = []
+    for path in sorted(root.rglob('*.md'))[:200]:
+        try:
+            documents.append((str(path.relative_to(root)), path.read_text(encoding='utf-8')))
+        except (OSError, UnicodeDecodeError):
+            continue
+    return documents
+
+
+def check_equivalence(random_count: int, seed: int = 1234) -> int:
+    """Compara ambos detectores sobre el corpus; devuelve el número de diferencias"""
+    rng = random.Random(seed)
+    corpus = [(f"caso límite {i}", text) for i, text in enumerate(EDGE_CASES)]
+    corpus += repository_documents(Path(__file__).resolve().parents[3])
+    corpus += [(f"aleatorio {i}", random_document(rng, rng.randint(1, 400))) for i in range(random_count)]
+
+    mismatches = 0
+    for name, text in corpus:
+        expected = detect_features_regex(text)
+        actual = detect_features_streaming(text)
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 10:
+                diff = {k: (expected[k], actual[k]) for k in expected if expected[k] != actual[k]}
+                print(f"  ❌ {name}: {diff} (regex, streaming) en {text[:60]!r}")
+
+    status = "✅" if not mismatches else "❌"
+    print(f"{status} Corpus: {len(corpus)} documentos, {mismatches} diferencia(s)")
+    return mismatches
+
+
+def write_large_file(path: Path, size_mb: float, kind: str):
+    """Genera un Markdown grande: 'docs' (documentación típica) o 'pathological'"""
+    target = int(size_mb * 1024 * 1024)
+    if kind == "docs":
+        block = (
+            "## Sección\n\n"
+            "Texto de documentación con varias palabras por línea para simular un manual.\n"
+            "Otra línea más de prosa sin marcas especiales, solo palabras y puntuación.\n\n"
+        )
+    else:
+        # Muchas aperturas sin cierre en líneas largas: \( y ![ hacen retroceder a .*?
+        block = ("\\( ![ " * 2000) + "\n"
+    with open(path, 'w', encoding='utf-8') as f:
+        written = 0
+        while written < target:
+            f.write(block)
+            written += len(block)
+
+
+def measure(function, *args) -> Tuple[float, float, Dict[str, bool]]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, result
+
+
+def regex_from_file(path: Path) -> Dict[str, bool]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return detect_features_regex(f.read())
+
+
+def streaming_from_file(path: Path) -> Dict[str, bool]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return scan_markdown_features(f)
+
+
+def benchmark(size_mb: float):
+    print()
+    print(f"{'Archivo':<28} {'Detector':<10} {'Tiempo':>9} {'Memoria pico':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = [("docs", size_mb), ("docs", size_mb * 4), ("pathological", max(size_mb / 32, 0.1))]
+        for kind, mb in cases:
+            path = Path(tmp) / f"{kind}_{mb:g}MB.md"
+            write_large_file(path, mb, kind)
+            label = f"{kind} ({path.stat().st_size / 1024 / 1024:.1f} MB)"
+            results = []
+            for name, function in (("regex", regex_from_file), ("una pasada", streaming_from_file)):
+                elapsed, peak, result = measure(function, path)
+                results.append(result)
+                print(f"{label:<28} {name:<10} {elapsed:>8.3f}s {peak:>11.1f}MB")
+            if results[0] != results[1]:
+                print(f"  ❌ Resultados distintos: {results[0]} != {results[1]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verificación y benchmark de detect_document_features')
+    parser.add_argument('--random', type=int, default=2000, help='Documentos aleatorios del corpus (por defecto: 2000)')
+    parser.add_argument('--size-mb', type=float, default=8, help='Tamaño base de los archivos grandes (por defecto: 8)')
+    parser.add_argument('--skip-benchmark', action='store_true', help='Solo verificar equivalencia')
+    args = parser.parse_args()
+
+    mismatches = check_equivalence(args.random)
+    if not args.skip_benchmark:
+        benchmark(args.size_mb)
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
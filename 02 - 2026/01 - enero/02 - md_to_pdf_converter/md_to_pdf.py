@@ -13,6 +13,11 @@ from pathlib import Path
 from typing import Optional, Tuple, List, Dict
 import subprocess
 import re
+import glob
+import hashlib
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Colores para output (opcional)
 try:
@@ -28,13 +33,549 @@ except ImportError:
         BRIGHT = RESET_ALL = ""
 
 
+# Estilos del método WeasyPrint (se compilan una vez por proceso)
+WEASYPRINT_CSS = """
+@page {
+    size: A4;
+    margin: 2.5cm 2cm;
+    @bottom-center { content: counter(page); }
+}
+body {
+    font-family: Georgia, serif;
+    font-size: 11pt;
+    line-height: 1.6;
+    color: #222;
+    text-align: justify;
+}
+h1 {
+    font-size: 24pt;
+    margin-top: 30pt;
+    border-bottom: 2pt solid #333;
+    padding-bottom: 10pt;
+    page-break-before: always;
+}
+h2 { 
+    font-size: 18pt; 
+    margin-top: 20pt; 
+    color: #2a2a2a; 
+}
+h3 { 
+    font-size: 14pt; 
+    margin-top: 15pt; 
+    color: #3a3a3a; 
+}
+code {
+    font-family: 'Courier New', monospace;
+    font-size: 9pt;
+    background: #f4f4f4;
+    padding: 2pt 4pt;
+    border-radius: 3pt;
+}
+pre {
+    background: #f8f8f8;
+    border-left: 3pt solid #4a90e2;
+    padding: 10pt;
+    font-size: 9pt;
+    overflow-x: auto;
+    page-break-inside: avoid;
+}
+pre code {
+    background: transparent;
+    padding: 0;
+}
+blockquote {
+    font-style: italic;
+    border-left: 3pt solid #ccc;
+    padding-left: 15pt;
+    color: #555;
+    margin: 15pt 0;
+}
+table {
+    border-collapse: collapse;
+    margin: 15pt 0;
+    width: 100%;
+}
+th {
+    background: #4a90e2;
+    color: white;
+    padding: 8pt;
+    border: 1pt solid #ddd;
+    text-align: left;
+}
+td {
+    padding: 6pt;
+    border: 1pt solid #ddd;
+}
+img {
+    max-width: 100%;
+    height: auto;
+    margin: 15pt 0;
+}
+"""
+
+
+# Modo por capítulos: cada parte se renderiza sin número de página y los
+# números se estampan al unir las partes, para que la numeración sea continua
+WEASYPRINT_CHUNK_CSS = """
+@page {
+    @bottom-center { content: none; }
+}
+"""
+
+WEASYPRINT_STYLESHEETS = {
+    "weasyprint": WEASYPRINT_CSS,
+    "chunk": WEASYPRINT_CHUNK_CSS,
+}
+
+# Centro del margen inferior (2.5cm) donde WeasyPrint coloca counter(page), en puntos
+PAGE_NUMBER_Y = 1.25 / 2.54 * 72
+
+# <h1> de primer nivel: se ignoran los que están dentro de citas, listas, tablas, etc.
+_H1_SPLIT_PATTERN = re.compile(
+    r'<(/?)(blockquote|div|li|table|details|section)\b[^>]*>|^<h1\b',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def split_html_at_h1(html: str) -> List[str]:
+    """Divide el HTML generado por Markdown en capítulos, uno por cada <h1> de primer nivel"""
+    cuts = [0]
+    depth = 0
+    for match in _H1_SPLIT_PATTERN.finditer(html):
+        if match.group(2):
+            depth = max(0, depth + (-1 if match.group(1) else 1))
+        elif depth == 0 and match.start() > 0:
+            cuts.append(match.start())
+    cuts.append(len(html))
+    chunks = [html[start:end] for start, end in zip(cuts, cuts[1:])]
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def wrap_html(body: str) -> str:
+    return f'<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>{body}</body></html>'
+
+
+def _render_weasyprint_chunk(index: int, html_fragment: str, base_url: str, output_pdf: str) -> Tuple[int, int]:
+    """Renderiza un capítulo a PDF (en un proceso del pool); devuelve (índice, páginas)"""
+    from weasyprint import HTML
+    
+    session = get_default_session()
+    document = HTML(string=wrap_html(html_fragment), base_url=base_url).render(
+        stylesheets=[session.get_css(), session.get_css("chunk")]
+    )
+    document.write_pdf(output_pdf)
+    return index, len(document.pages)
+
+
+def merge_chunk_pdfs(chunk_files: List[str], output_pdf: Path):
+    """Une los capítulos en un PDF, conservando sus índices y numerando las páginas"""
+    import io
+    from pypdf import PdfReader, PdfWriter
+    from reportlab.pdfgen import canvas
+    
+    writer = PdfWriter()
+    for chunk_file in chunk_files:
+        # append() importa también el índice (outline) de cada capítulo
+        writer.append(chunk_file)
+    
+    # Números de página continuos en una capa que se superpone a cada página
+    numbers = io.BytesIO()
+    layer = canvas.Canvas(numbers)
+    for number, page in enumerate(writer.pages, 1):
+        width, height = float(page.mediabox.width), float(page.mediabox.height)
+        layer.setPageSize((width, height))
+        layer.setFont("Times-Roman", 11)
+        layer.drawCentredString(width / 2, PAGE_NUMBER_Y, str(number))
+        layer.showPage()
+    layer.save()
+    numbers.seek(0)
+    for page, number_page in zip(writer.pages, PdfReader(numbers).pages):
+        page.merge_page(number_page)
+    
+    tmp_file = Path(output_pdf).with_suffix('.pdf.tmp')
+    with open(tmp_file, 'wb') as f:
+        writer.write(f)
+    writer.close()
+    os.replace(tmp_file, output_pdf)
+
+
+# Características que detecta el análisis del documento
+FEATURE_NAMES = ["has_code", "has_latex", "has_tables", "has_images", "has_math", "is_long"]
+LONG_DOCUMENT_WORDS = 5000
+
+_BACKTICK_RUN = re.compile(r'`+')
+_DOLLAR_RUN = re.compile(r'\$+')
+
+
+def _find_pair(line: str, opener: str, closer: str) -> int:
+    """Posición del `closer` que sigue al primer `opener` de la línea (-1 si no hay)"""
+    start = line.find(opener)
+    if start < 0:
+        return -1
+    return line.find(closer, start + len(opener))
+
+
+def scan_markdown_features(lines) -> Dict[str, bool]:
+    """Detecta las características del documento en una sola pasada por líneas
+    
+    Equivale a las búsquedas con expresiones regulares sobre el texto
+    completo, sin cargarlo en memoria ni retroceder en líneas largas:
+    
+    - código: dos bloques ``` o dos tramos de comillas invertidas separados
+    - LaTeX: dos tramos de $ separados, o \\( ... \\) / \\[ ... \\] en una línea
+    - tablas: dos | en una línea
+    - imágenes: ![ ... ]( ... ) en una línea
+    - matemáticas: LaTeX, \\begin{...}, \\frac{, \\sum, \\int o \\prod
+    - documento largo: más de 5000 palabras
+    
+    Termina antes de llegar al final si ya se encontró todo.
+    """
+    fences = backtick_runs = dollar_runs = words = 0
+    has_code = has_latex = has_tables = has_images = has_math = False
+    
+    for line in lines:
+        if not has_code and '`' in line:
+            fences += line.count('```')
+            backtick_runs += len(_BACKTICK_RUN.findall(line))
+            has_code = fences >= 2 or backtick_runs >= 2
+        
+        if not has_latex:
+            if '$' in line:
+                dollar_runs += len(_DOLLAR_RUN.findall(line))
+                has_latex = dollar_runs >= 2
+            if not has_latex and '\\' in line:
+                has_latex = _find_pair(line, '\\(', '\\)') >= 0 or _find_pair(line, '\\[', '\\]') >= 0
+        
+        if not has_tables and line.count('|') >= 2:
+            has_tables = True
+        
+        if not has_images and '![' in line:
+            link = _find_pair(line, '![', '](')
+            has_images = link >= 0 and line.find(')', link + 2) >= 0
+        
+        if not has_math and not has_latex and '\\' in line:
+            has_math = (
+                _find_pair(line, '\\begin{', '}') >= 0
+                or '\\frac{' in line
+                or '\\sum' in line or '\\int' in line or '\\prod' in line
+            )
+        
+        if words <= LONG_DOCUMENT_WORDS:
+            words += len(line.split())
+        elif has_code and has_latex and has_tables and has_images:
+            break
+    
+    return {
+        "has_code": has_code,
+        "has_latex": has_latex,
+        "has_tables": has_tables,
+        "has_images": has_images,
+        "has_math": has_latex or has_math,
+        "is_long": words > LONG_DOCUMENT_WORDS,
+    }
+
+
+# Caché en disco de la detección de métodos (se comparte entre ejecuciones)
+PROBE_CACHE_FILE = Path.home() / ".cache" / "md_to_pdf" / "backends.json"
+PROBE_CACHE_TTL = 24 * 3600  # segundos
+
+# Extensiones de Markdown por método
+MARKDOWN_EXTENSIONS = {
+    "weasyprint": ['extra', 'codehilite', 'toc', 'fenced_code'],
+    "reportlab": ['extra', 'fenced_code'],
+}
+
+
+def _probe_weasyprint() -> bool:
+    import markdown  # noqa: F401
+    from weasyprint import HTML, CSS  # noqa: F401
+    return True
+
+
+def _probe_pandoc() -> bool:
+    import pypandoc  # noqa: F401
+    # Verificar que pandoc esté instalado en el sistema
+    result = subprocess.run(
+        ['pandoc', '--version'],
+        capture_output=True,
+        text=True,
+        timeout=5
+    )
+    return result.returncode == 0
+
+
+def _probe_md2pdf() -> bool:
+    from md2pdf.core import md2pdf  # noqa: F401
+    return True
+
+
+def _probe_reportlab() -> bool:
+    from reportlab.lib.pagesizes import A4  # noqa: F401
+    import markdown  # noqa: F401
+    from bs4 import BeautifulSoup  # noqa: F401
+    return True
+
+
+class ConverterSession:
+    """Estado reutilizable entre conversiones: métodos detectados, CSS compilado y parsers Markdown
+    
+    La detección de cada método se hace una vez por proceso y se guarda en
+    disco durante `ttl` segundos, de modo que las siguientes ejecuciones no
+    vuelven a importar WeasyPrint ni a lanzar `pandoc --version`.
+    """
+    
+    METHODS = ["weasyprint", "pandoc", "md2pdf", "reportlab"]
+    PROBES = {
+        "weasyprint": _probe_weasyprint,
+        "pandoc": _probe_pandoc,
+        "md2pdf": _probe_md2pdf,
+        "reportlab": _probe_reportlab,
+    }
+    
+    def __init__(self, cache_file: Optional[Path] = PROBE_CACHE_FILE, ttl: float = PROBE_CACHE_TTL):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.ttl = ttl
+        self.probes_from_disk = False
+        self._probes: Optional[Dict[str, bool]] = None
+        self._css = {}
+        self._parsers = {}
+    
+    def _cache_key(self) -> str:
+        # Otro intérprete o entorno virtual tiene otros paquetes instalados
+        return sys.executable
+    
+    def _load_probes(self) -> Optional[Dict[str, bool]]:
+        if not self.cache_file or self.ttl <= 0:
+            return None
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        entry = data.get(self._cache_key())
+        if not entry or time.time() - entry.get("checked_at", 0) > self.ttl:
+            return None
+        methods = entry.get("methods", {})
+        if set(methods) != set(self.METHODS):
+            return None
+        return methods
+    
+    def _save_probes(self, probes: Dict[str, bool]):
+        if not self.cache_file:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            data[self._cache_key()] = {"checked_at": time.time(), "methods": probes}
+            self._write_cache(data)
+        except OSError:
+            pass  # la caché en disco es opcional
+    
+    def _write_cache(self, data: Dict):
+        """Reemplaza el archivo de caché de forma atómica (temporal por proceso)"""
+        tmp_file = self.cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_file, self.cache_file)
+    
+    def probe_all(self) -> Dict[str, bool]:
+        """Disponibilidad de cada método (memoria → disco → detección real)"""
+        if self._probes is None:
+            probes = self._load_probes()
+            self.probes_from_disk = probes is not None
+            if probes is None:
+                probes = {}
+                for method in self.METHODS:
+                    try:
+                        probes[method] = bool(self.PROBES[method]())
+                    except Exception:
+                        # ImportError, pandoc ausente, o librerías nativas faltantes (OSError)
+                        probes[method] = False
+                self._save_probes(probes)
+            self._probes = probes
+        return self._probes
+    
+    def is_available(self, method: str) -> bool:
+        return self.probe_all().get(method, False)
+    
+    def refresh(self):
+        """Olvida la detección en memoria y en disco"""
+        self._probes = None
+        if self.cache_file and self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                data.pop(self._cache_key(), None)
+                self._write_cache(data)
+            except (OSError, ValueError):
+                pass
+    
+    def get_css(self, name: str = "weasyprint"):
+        """Hoja de estilos compilada de WeasyPrint, creada la primera vez"""
+        if name not in self._css:
+            from weasyprint import CSS
+            self._css[name] = CSS(string=WEASYPRINT_STYLESHEETS[name])
+        return self._css[name]
+    
+    def render_markdown(self, text: str, method: str) -> str:
+        """Convierte Markdown a HTML reutilizando el parser (y sus extensiones) del método"""
+        parser = self._parsers.get(method)
+        if parser is None:
+            import markdown
+            parser = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS[method])
+            self._parsers[method] = parser
+        parser.reset()
+        return parser.convert(text)
+    
+    def warm_up(self, method: Optional[str] = None):
+        """Prepara por adelantado el CSS y los parsers de los métodos disponibles"""
+        for name in ([method] if method else self.METHODS):
+            if name not in MARKDOWN_EXTENSIONS or not self.is_available(name):
+                continue
+            try:
+                self.render_markdown("", name)
+                if name == "weasyprint":
+                    self.get_css()
+            except Exception:
+                pass
+
+
+_default_session: Optional[ConverterSession] = None
+
+
+def get_default_session() -> ConverterSession:
+    """Sesión compartida por todos los conversores del proceso"""
+    global _default_session
+    if _default_session is None:
+        _default_session = ConverterSession()
+    return _default_session
+
+
+# Caché de PDFs generados: una entrada por archivo de salida
+OUTPUT_CACHE_DIR = Path.home() / ".cache" / "md_to_pdf" / "outputs"
+
+# Imágenes referenciadas: ![alt](ruta "título"), <img src="ruta"> y [id]: ruta.png
+IMAGE_REFERENCE_PATTERN = re.compile(
+    r'!\[[^\]]*\]\(\s*<?([^)\s>]+)>?[^)]*\)'
+    r'|<img\b[^>]*\bsrc\s*=\s*["\']([^"\']+)["\']'
+    r'|^\s{0,3}\[[^\]]+\]:\s*<?(\S+?\.(?:png|jpe?g|gif|svg|webp|bmp|tiff?))>?(?:\s|$)',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def find_local_images(md_file: Path, content: Optional[str] = None) -> List[Path]:
+    """Rutas de las imágenes locales referenciadas por el documento (existan o no)"""
+    if content is None:
+        with open(md_file, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+    
+    images = []
+    seen = set()
+    for match in IMAGE_REFERENCE_PATTERN.finditer(content):
+        reference = next(group for group in match.groups() if group)
+        if re.match(r'^[a-z][a-z0-9+.-]*:', reference, re.IGNORECASE) and not reference.lower().startswith('file:'):
+            continue  # http:, https:, data:, ...
+        reference = reference[len('file://'):] if reference.lower().startswith('file://') else reference
+        path = (md_file.parent / reference.split('#')[0].split('?')[0]).resolve()
+        if path not in seen:
+            seen.add(path)
+            images.append(path)
+    return images
+
+
+def _hash_file(path: Path, digest) -> None:
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+
+
+class OutputCache:
+    """Omite conversiones cuyo resultado ya está en disco
+    
+    La clave combina el contenido del Markdown, el de cada imagen local
+    referenciada, el método de conversión y su CSS/extensiones; si cualquiera
+    cambia, el documento se vuelve a generar.
+    """
+    
+    def __init__(self, cache_dir: Path = OUTPUT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+    
+    def _entry_file(self, output_pdf: Path) -> Path:
+        name = hashlib.sha256(str(Path(output_pdf).resolve()).encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{name}.json"
+    
+    def compute_key(self, md_file: Path, method: str, variant: str = "") -> Tuple[str, List[str]]:
+        """Devuelve (clave, dependencias) del documento para el método indicado"""
+        digest = hashlib.sha256()
+        digest.update(f"method={method}\nvariant={variant}\n".encode('utf-8'))
+        digest.update(repr(MARKDOWN_EXTENSIONS.get(method)).encode('utf-8'))
+        if method == "weasyprint":
+            digest.update(WEASYPRINT_CSS.encode('utf-8'))
+            if variant == "chunked":
+                digest.update(WEASYPRINT_CHUNK_CSS.encode('utf-8'))
+        
+        source = md_file.read_bytes()
+        digest.update(source)
+        
+        dependencies = []
+        for image in find_local_images(md_file, source.decode('utf-8', errors='replace')):
+            dependencies.append(str(image))
+            digest.update(f"\0{image}\0".encode('utf-8'))
+            if image.is_file():
+                _hash_file(image, digest)
+            else:
+                digest.update(b"<missing>")
+        
+        return digest.hexdigest(), dependencies
+    
+    def is_fresh(self, output_pdf: Path, key: str) -> bool:
+        if not Path(output_pdf).is_file():
+            return False
+        try:
+            with open(self._entry_file(output_pdf), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return entry.get("key") == key and entry.get("size") == Path(output_pdf).stat().st_size
+    
+    def record(self, output_pdf: Path, key: str, dependencies: List[str], method: str):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            entry_file = self._entry_file(output_pdf)
+            tmp_file = entry_file.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "output": str(Path(output_pdf).resolve()),
+                    "key": key,
+                    "method": method,
+                    "size": Path(output_pdf).stat().st_size,
+                    "dependencies": dependencies,
+                }, f, indent=2)
+            os.replace(tmp_file, entry_file)
+        except OSError:
+            pass  # sin caché solo se pierde el atajo
+
+
 class MarkdownToPDFConverter:
     """Conversor inteligente de Markdown a PDF"""
     
-    def __init__(self, verbose: bool = True):
+    def __init__(self, verbose: bool = True, session: Optional[ConverterSession] = None,
+                 output_cache: Optional[OutputCache] = None, chunked: bool = False,
+                 chunk_jobs: Optional[int] = None):
         self.verbose = verbose
+        self.chunked = chunked
+        self.chunk_jobs = chunk_jobs
+        self.session = session or get_default_session()
+        self.output_cache = output_cache or OutputCache()
         self.available_methods = []
         self.detected_features = {}
+        self.last_method = None
+        self.last_message = ""
+        self.last_skipped = False
         
     def log(self, message: str, level: str = "info"):
         """Log con colores opcionales"""
@@ -53,104 +594,16 @@ class MarkdownToPDFConverter:
     
     def check_method_available(self, method_name: str) -> bool:
         """Verifica si un método está disponible"""
-        checks = {
-            "weasyprint": self._check_weasyprint,
-            "pandoc": self._check_pandoc,
-            "md2pdf": self._check_md2pdf,
-            "reportlab": self._check_reportlab
-        }
-        
-        if method_name in checks:
-            return checks[method_name]()
-        return False
-    
-    def _check_weasyprint(self) -> bool:
-        """Verifica si WeasyPrint está disponible"""
-        try:
-            import markdown
-            from weasyprint import HTML, CSS
-            return True
-        except ImportError:
-            return False
-    
-    def _check_pandoc(self) -> bool:
-        """Verifica si Pandoc está disponible"""
-        try:
-            import pypandoc
-            # Verificar que pandoc esté instalado en el sistema
-            result = subprocess.run(
-                ['pandoc', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except (ImportError, FileNotFoundError, subprocess.TimeoutExpired):
-            return False
-    
-    def _check_md2pdf(self) -> bool:
-        """Verifica si md2pdf está disponible"""
-        try:
-            from md2pdf.core import md2pdf
-            return True
-        except ImportError:
-            return False
-    
-    def _check_reportlab(self) -> bool:
-        """Verifica si ReportLab está disponible"""
-        try:
-            from reportlab.lib.pagesizes import A4
-            import markdown
-            from bs4 import BeautifulSoup
-            return True
-        except ImportError:
-            return False
+        return self.session.is_available(method_name)
     
     def detect_document_features(self, md_file: Path) -> Dict[str, bool]:
         """Analiza el documento para detectar características especiales"""
-        features = {
-            "has_code": False,
-            "has_latex": False,
-            "has_tables": False,
-            "has_images": False,
-            "has_math": False,
-            "is_long": False
-        }
-        
         try:
             with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Detectar código
-            features["has_code"] = bool(re.search(r'```[\s\S]*?```', content) or 
-                                       re.search(r'`[^`]+`', content))
-            
-            # Detectar LaTeX/ecuaciones
-            features["has_latex"] = bool(re.search(r'\$[^$]+\$', content) or
-                                         re.search(r'\\\(.*?\\\)', content) or
-                                         re.search(r'\\\[.*?\\\]', content))
-            
-            # Detectar tablas
-            features["has_tables"] = bool(re.search(r'\|.*\|', content))
-            
-            # Detectar imágenes
-            features["has_images"] = bool(re.search(r'!\[.*?\]\(.*?\)', content))
-            
-            # Detectar matemáticas avanzadas
-            features["has_math"] = features["has_latex"] or bool(
-                re.search(r'\\begin\{.*?\}', content) or
-                re.search(r'\\frac\{', content) or
-                re.search(r'\\sum|\\int|\\prod', content)
-            )
-            
-            # Detectar documentos largos (>5000 palabras)
-            word_count = len(content.split())
-            features["is_long"] = word_count > 5000
-            
+                return scan_markdown_features(f)
         except Exception as e:
             self.log(f"⚠️  Error al analizar documento: {e}", "warning")
-        
-        return features
+            return dict.fromkeys(FEATURE_NAMES, False)
     
     def score_method_for_document(self, method: str, features: Dict[str, bool]) -> int:
         """Evalúa qué tan adecuado es un método para el documento"""
@@ -207,10 +660,12 @@ class MarkdownToPDFConverter:
     
     def detect_available_methods(self) -> List[str]:
         """Detecta qué métodos están disponibles"""
-        methods = ["weasyprint", "pandoc", "md2pdf", "reportlab"]
+        methods = ConverterSession.METHODS
         available = []
         
-        self.log("🔍 Detectando métodos disponibles...", "info")
+        self.session.probe_all()
+        origin = " (caché)" if self.session.probes_from_disk else ""
+        self.log(f"🔍 Detectando métodos disponibles...{origin}", "info")
         
         for method in methods:
             if self.check_method_available(method):
@@ -224,100 +679,25 @@ class MarkdownToPDFConverter:
     def convert_with_weasyprint(self, md_file: Path, output_pdf: Path) -> Tuple[bool, str]:
         """Convierte usando WeasyPrint"""
         try:
-            import markdown
-            from weasyprint import HTML, CSS
+            from weasyprint import HTML
             
             self.log("🔄 Convirtiendo con WeasyPrint...", "info")
             
             with open(md_file, 'r', encoding='utf-8') as f:
                 md_content = f.read()
             
-            html = markdown.markdown(
-                md_content,
-                extensions=['extra', 'codehilite', 'toc', 'fenced_code']
-            )
+            html = self.session.render_markdown(md_content, "weasyprint")
+            base_url = str(Path(md_file).parent.resolve())
             
-            css = """
-            @page {
-                size: A4;
-                margin: 2.5cm 2cm;
-                @bottom-center { content: counter(page); }
-            }
-            body {
-                font-family: Georgia, serif;
-                font-size: 11pt;
-                line-height: 1.6;
-                color: #222;
-                text-align: justify;
-            }
-            h1 {
-                font-size: 24pt;
-                margin-top: 30pt;
-                border-bottom: 2pt solid #333;
-                padding-bottom: 10pt;
-                page-break-before: always;
-            }
-            h2 { 
-                font-size: 18pt; 
-                margin-top: 20pt; 
-                color: #2a2a2a; 
-            }
-            h3 { 
-                font-size: 14pt; 
-                margin-top: 15pt; 
-                color: #3a3a3a; 
-            }
-            code {
-                font-family: 'Courier New', monospace;
-                font-size: 9pt;
-                background: #f4f4f4;
-                padding: 2pt 4pt;
-                border-radius: 3pt;
-            }
-            pre {
-                background: #f8f8f8;
-                border-left: 3pt solid #4a90e2;
-                padding: 10pt;
-                font-size: 9pt;
-                overflow-x: auto;
-                page-break-inside: avoid;
-            }
-            pre code {
-                background: transparent;
-                padding: 0;
-            }
-            blockquote {
-                font-style: italic;
-                border-left: 3pt solid #ccc;
-                padding-left: 15pt;
-                color: #555;
-                margin: 15pt 0;
-            }
-            table {
-                border-collapse: collapse;
-                margin: 15pt 0;
-                width: 100%;
-            }
-            th {
-                background: #4a90e2;
-                color: white;
-                padding: 8pt;
-                border: 1pt solid #ddd;
-                text-align: left;
-            }
-            td {
-                padding: 6pt;
-                border: 1pt solid #ddd;
-            }
-            img {
-                max-width: 100%;
-                height: auto;
-                margin: 15pt 0;
-            }
-            """
+            if self.chunked:
+                chunks = split_html_at_h1(html)
+                if len(chunks) > 1:
+                    return self._convert_weasyprint_chunks(chunks, base_url, output_pdf)
+                self.log("  Un solo capítulo: se renderiza de una vez", "debug")
             
-            full_html = f'<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>{html}</body></html>'
-            HTML(string=full_html).write_pdf(str(output_pdf), stylesheets=[CSS(string=css)])
+            HTML(string=wrap_html(html), base_url=base_url).write_pdf(
+                str(output_pdf), stylesheets=[self.session.get_css()]
+            )
             
             return True, "WeasyPrint"
             
@@ -326,6 +706,51 @@ class MarkdownToPDFConverter:
         except Exception as e:
             return False, f"Error con WeasyPrint: {e}"
     
+    def _convert_weasyprint_chunks(self, chunks: List[str], base_url: str,
+                                   output_pdf: Path) -> Tuple[bool, str]:
+        """Renderiza cada capítulo por separado (en paralelo) y une los PDFs
+        
+        La memoria queda acotada por el capítulo más largo en lugar de por el
+        libro completo. Los enlaces internos entre capítulos distintos no se
+        conservan.
+        """
+        import tempfile
+        try:
+            import pypdf  # noqa: F401
+            from reportlab.pdfgen import canvas  # noqa: F401
+        except ImportError as e:
+            return False, f"El modo por capítulos requiere pypdf y reportlab: {e}"
+        
+        jobs = max(1, min(self.chunk_jobs or os.cpu_count() or 1, len(chunks)))
+        self.log(f"  📚 {len(chunks)} capítulos con {jobs} proceso(s)", "info")
+        
+        with tempfile.TemporaryDirectory(prefix="md_to_pdf_") as tmp_dir:
+            chunk_files = [os.path.join(tmp_dir, f"capitulo_{i:04d}.pdf") for i in range(len(chunks))]
+            tasks = [(i, chunk, base_url, chunk_files[i]) for i, chunk in enumerate(chunks)]
+            total_pages = 0
+            
+            if jobs == 1:
+                # Sin pool (p. ej. dentro de un proceso del modo batch)
+                results = (_render_weasyprint_chunk(*task) for task in tasks)
+                pool = None
+            else:
+                pool = ProcessPoolExecutor(max_workers=jobs)
+                results = (f.result() for f in as_completed(
+                    [pool.submit(_render_weasyprint_chunk, *task) for task in tasks]
+                ))
+            try:
+                for done, (index, pages) in enumerate(results, 1):
+                    total_pages += pages
+                    self.log(f"  📄 [{done}/{len(chunks)}] Capítulo {index + 1}: {pages} página(s)", "info")
+            finally:
+                if pool:
+                    pool.shutdown(cancel_futures=True)
+            
+            self.log(f"  🔗 Uniendo {total_pages} páginas...", "info")
+            merge_chunk_pdfs(chunk_files, output_pdf)
+        
+        return True, f"WeasyPrint ({len(chunks)} capítulos)"
+    
     def convert_with_pandoc(self, md_file: Path, output_pdf: Path) -> Tuple[bool, str]:
         """Convierte usando Pandoc"""
         try:
@@ -393,7 +818,6 @@ class MarkdownToPDFConverter:
             from reportlab.lib.units import cm
             from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Preformatted
             from reportlab.lib.enums import TA_JUSTIFY
-            import markdown
             from bs4 import BeautifulSoup
             
             self.log("🔄 Convirtiendo con ReportLab...", "info")
@@ -401,7 +825,7 @@ class MarkdownToPDFConverter:
             with open(md_file, 'r', encoding='utf-8') as f:
                 md_content = f.read()
             
-            html = markdown.markdown(md_content, extensions=['extra', 'fenced_code'])
+            html = self.session.render_markdown(md_content, "reportlab")
             soup = BeautifulSoup(html, 'html.parser')
             
             doc = SimpleDocTemplate(
@@ -452,14 +876,18 @@ class MarkdownToPDFConverter:
             return False, f"Error con ReportLab: {e}"
     
     def convert(self, md_file: str, output_pdf: Optional[str] = None, 
-                preferred_method: Optional[str] = None) -> bool:
+                preferred_method: Optional[str] = None, force: bool = False) -> bool:
         """Convierte Markdown a PDF usando el mejor método disponible"""
         
         md_path = Path(md_file)
+        self.last_method = None
+        self.last_message = ""
+        self.last_skipped = False
         
         # Validar archivo de entrada
         if not md_path.exists():
             self.log(f"❌ Error: Archivo no encontrado: {md_file}", "error")
+            self.last_message = "Archivo no encontrado"
             return False
         
         if not md_path.suffix.lower() in ['.md', '.markdown']:
@@ -504,6 +932,7 @@ class MarkdownToPDFConverter:
             self.log("", "error")
             self.log("3. Instalar md2pdf (simple):", "error")
             self.log("   pip install md2pdf", "error")
+            self.last_message = "Ningún método de conversión disponible"
             return False
         
         # Seleccionar mejor método
@@ -524,6 +953,21 @@ class MarkdownToPDFConverter:
             
             self.log(f"🎯 Método seleccionado: {selected_method.capitalize()} (score: {sorted_methods[0][1]})", "success")
         
+        # Omitir si el PDF ya está generado con el mismo contenido, imágenes y método
+        try:
+            variant = "chunked" if self.chunked and selected_method == "weasyprint" else ""
+            cache_key, dependencies = self.output_cache.compute_key(md_path, selected_method, variant)
+        except OSError as e:
+            self.log(f"⚠️  No se pudo calcular la clave de caché: {e}", "warning")
+            cache_key, dependencies = None, []
+        
+        if cache_key and not force and self.output_cache.is_fresh(output_pdf, cache_key):
+            self.last_method = selected_method
+            self.last_message = "Sin cambios"
+            self.last_skipped = True
+            self.log(f"⏭️  Sin cambios desde la última conversión: {output_pdf}", "success")
+            return True
+        
         # Convertir usando el método seleccionado
         converters = {
             "weasyprint": self.convert_with_weasyprint,
@@ -533,8 +977,12 @@ class MarkdownToPDFConverter:
         }
         
         success, message = converters[selected_method](md_path, output_pdf)
+        self.last_message = message
         
         if success:
+            self.last_method = selected_method
+            if cache_key:
+                self.output_cache.record(output_pdf, cache_key, dependencies, selected_method)
             self.log("=" * 70, "success")
             self.log(f"✅ ÉXITO: PDF generado con {message}", "success")
             self.log(f"📁 Ubicación: {output_pdf.absolute()}", "success")
@@ -566,6 +1014,10 @@ class MarkdownToPDFConverter:
                     self.log(f"  Intentando {alt_method}...", "info")
                     success, message = converters[alt_method](md_path, output_pdf)
                     if success:
+                        self.last_method = alt_method
+                        self.last_message = message
+                        if cache_key:
+                            self.output_cache.record(output_pdf, cache_key, dependencies, alt_method)
                         self.log("=" * 70, "success")
                         self.log(f"✅ ÉXITO: PDF generado con {message}", "success")
                         self.log(f"📁 Ubicación: {output_pdf.absolute()}", "success")
@@ -578,6 +1030,215 @@ class MarkdownToPDFConverter:
             return False
 
 
+# Conversor de cada proceso del pool de modo batch (uno por proceso)
+_worker_converter: Optional[MarkdownToPDFConverter] = None
+
+
+def collect_batch_files(pattern: str) -> Tuple[List[Path], Path]:
+    """Devuelve los Markdown de un directorio (recursivo) o patrón glob y su directorio base"""
+    path = Path(os.path.expandvars(os.path.expanduser(pattern)))
+    
+    if path.is_dir():
+        files = [p for p in path.rglob('*') if p.is_file() and p.suffix.lower() in ('.md', '.markdown')]
+        base = path
+    else:
+        files = [Path(p) for p in glob.glob(str(path), recursive=True)]
+        files = [p for p in files if p.is_file()]
+        parents = [str(p.parent.resolve()) for p in files]
+        base = Path(os.path.commonpath(parents)) if parents else Path('.')
+    
+    return sorted(files), base
+
+
+def batch_output_path(md_file: Path, base: Path, output_dir: Optional[str] = None) -> Path:
+    """PDF de salida de un archivo del lote (junto al original o bajo output_dir)"""
+    if not output_dir:
+        return md_file.with_suffix('.pdf')
+    # Conservar la estructura de carpetas bajo el directorio de salida
+    try:
+        relative = md_file.resolve().relative_to(base.resolve())
+    except ValueError:
+        relative = Path(md_file.name)
+    return Path(output_dir) / relative.with_suffix('.pdf')
+
+
+def _batch_worker_init(method: Optional[str], chunked: bool = False):
+    """Prepara el conversor del proceso: importa los backends y compila el CSS una sola vez"""
+    global _worker_converter
+    # Los capítulos se renderizan en serie: el paralelismo ya está en el pool del lote
+    _worker_converter = MarkdownToPDFConverter(verbose=False, chunked=chunked, chunk_jobs=1)
+    _worker_converter.session.warm_up(method)
+
+
+def _batch_worker_convert(md_file: str, output_pdf: str, method: Optional[str],
+                          force: bool = False) -> Dict:
+    """Convierte un archivo en un proceso del pool y devuelve su resultado"""
+    start = time.perf_counter()
+    try:
+        success = _worker_converter.convert(md_file, output_pdf, method, force)
+        message = _worker_converter.last_message
+    except Exception as e:
+        success, message = False, f"Error inesperado: {e}"
+    
+    return {
+        "file": md_file,
+        "output": output_pdf,
+        "success": success,
+        "method": _worker_converter.last_method,
+        "skipped": _worker_converter.last_skipped,
+        "message": message,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def convert_batch(pattern: str, output_dir: Optional[str] = None,
+                  method: Optional[str] = None, jobs: Optional[int] = None,
+                  verbose: bool = True, force: bool = False, chunked: bool = False) -> List[Dict]:
+    """Convierte todos los Markdown de un directorio o patrón glob en un pool de procesos"""
+    files, base = collect_batch_files(pattern)
+    if not files:
+        print(f"{Fore.RED}❌ No se encontraron archivos Markdown en: {pattern}{Style.RESET_ALL}")
+        return []
+    
+    tasks = []
+    for md_file in files:
+        output_pdf = batch_output_path(md_file, base, output_dir)
+        output_pdf.parent.mkdir(parents=True, exist_ok=True)
+        tasks.append((str(md_file), str(output_pdf)))
+    
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(tasks)))
+    # Detectar los métodos aquí deja el resultado en la caché de disco,
+    # así los procesos del pool no repiten la detección
+    get_default_session().probe_all()
+    print("=" * 70)
+    print(f"📚 MODO BATCH: {len(tasks)} archivo(s) con {jobs} proceso(s)")
+    print("=" * 70)
+    
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_batch_worker_init,
+                             initargs=(method, chunked)) as pool:
+        futures = {pool.submit(_batch_worker_convert, md, pdf, method, force): (md, pdf) for md, pdf in tasks}
+        for future in as_completed(futures):
+            md, pdf = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # El proceso del pool murió (p. ej. memoria agotada): se registra y se sigue
+                result = {"file": md, "output": pdf, "success": False, "method": None,
+                          "skipped": False, "message": f"Proceso interrumpido: {e}", "seconds": 0.0}
+            results.append(result)
+            
+            if verbose:
+                name = os.path.relpath(result["file"], base)
+                if result["skipped"]:
+                    print(f"  [{len(results)}/{len(tasks)}] ⏭️  {name} (sin cambios)")
+                elif result["success"]:
+                    print(f"{Fore.GREEN}  [{len(results)}/{len(tasks)}] ✅ {name} "
+                          f"({result['method']}, {result['seconds']:.1f}s){Style.RESET_ALL}")
+                else:
+                    print(f"{Fore.RED}  [{len(results)}/{len(tasks)}] ❌ {name}: "
+                          f"{result['message']}{Style.RESET_ALL}")
+    
+    elapsed = time.perf_counter() - start
+    results.sort(key=lambda r: r["file"])
+    print_batch_summary(results, elapsed)
+    return results
+
+
+def print_batch_summary(results: List[Dict], elapsed: float):
+    """Muestra el resumen agregado de una conversión batch"""
+    ok = [r for r in results if r["success"]]
+    failed = [r for r in results if not r["success"]]
+    skipped = [r for r in ok if r.get("skipped")]
+    by_method: Dict[str, int] = {}
+    for r in ok:
+        if not r.get("skipped"):
+            by_method[r["method"]] = by_method.get(r["method"], 0) + 1
+    
+    color = Fore.GREEN if not failed else Fore.YELLOW
+    print(f"{color}{'=' * 70}{Style.RESET_ALL}")
+    print(f"{color}📊 RESUMEN: {len(ok)}/{len(results)} correctos en {elapsed:.1f}s{Style.RESET_ALL}")
+    for method, count in sorted(by_method.items()):
+        print(f"   {method}: {count}")
+    if skipped:
+        print(f"   sin cambios (caché): {len(skipped)}")
+    if failed:
+        print(f"{Fore.RED}❌ Fallaron {len(failed)} archivo(s):{Style.RESET_ALL}")
+        for r in failed:
+            print(f"   {r['file']}: {r['message']}")
+
+
+def _stat_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return None
+
+
+def watch(target: str, output: Optional[str] = None, method: Optional[str] = None,
+          batch: bool = False, interval: float = 1.0, force: bool = False,
+          chunked: bool = False):
+    """Vuelve a generar los PDFs cuyos Markdown o imágenes cambian (Ctrl+C para salir)
+    
+    Se consulta la fecha de modificación cada `interval` segundos; el
+    Markdown solo se vuelve a leer (para conocer sus imágenes) cuando cambia,
+    y la caché de salida evita renderizar si el contenido resulta idéntico.
+    """
+    converter = MarkdownToPDFConverter(verbose=False, chunked=chunked)
+    # md -> (firma del md, imágenes, firma de las imágenes)
+    state: Dict[Path, Tuple] = {}
+    
+    print("=" * 70)
+    print(f"👀 MODO WATCH: {target} (cada {interval:g}s, Ctrl+C para salir)")
+    print("=" * 70)
+    
+    try:
+        while True:
+            if batch:
+                files, base = collect_batch_files(target)
+            else:
+                files, base = [Path(target)], Path(target).parent
+            
+            for md_file in files:
+                md_signature = _stat_signature(md_file)
+                if md_signature is None:
+                    continue
+                previous = state.get(md_file)
+                if previous and previous[0] == md_signature:
+                    images = previous[1]
+                else:
+                    images = find_local_images(md_file)
+                image_signatures = [_stat_signature(image) for image in images]
+                if previous and previous[0] == md_signature and previous[2] == image_signatures:
+                    continue
+                state[md_file] = (md_signature, images, image_signatures)
+                
+                if batch:
+                    output_pdf = batch_output_path(md_file, base, output)
+                    output_pdf.parent.mkdir(parents=True, exist_ok=True)
+                else:
+                    output_pdf = output
+                
+                start = time.perf_counter()
+                # force solo aplica a la primera pasada; después manda la caché
+                success = converter.convert(str(md_file), output_pdf, method, force and previous is None)
+                stamp = time.strftime('%H:%M:%S')
+                if converter.last_skipped:
+                    if previous is not None:
+                        print(f"  {stamp} ⏭️  {md_file.name}: sin cambios en el contenido")
+                elif success:
+                    print(f"{Fore.GREEN}  {stamp} ✅ {md_file.name} ({converter.last_method}, "
+                          f"{time.perf_counter() - start:.1f}s){Style.RESET_ALL}")
+                else:
+                    print(f"{Fore.RED}  {stamp} ❌ {md_file.name}: {converter.last_message}{Style.RESET_ALL}")
+            
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\n👋 Modo watch detenido")
+
+
 def get_input_file_interactive() -> Optional[str]:
     """Modo interactivo para obtener el archivo de entrada"""
     import platform
@@ -741,12 +1402,16 @@ Ejemplos:
   %(prog)s documento.md -o salida.pdf
   %(prog)s documento.md --method weasyprint
   %(prog)s documento.md --quiet
+  %(prog)s --batch docs/ -o pdfs/ -j 8
+  %(prog)s --batch "docs/**/*.md"
+  %(prog)s --batch docs/ -o pdfs/ --watch
+  %(prog)s libro.md --method weasyprint --chunked -j 4
   %(prog)s                    (modo interactivo)
         """
     )
     
     parser.add_argument('input_file', nargs='?', help='Archivo Markdown a convertir (opcional, modo interactivo si no se especifica)')
-    parser.add_argument('-o', '--output', help='Archivo PDF de salida (opcional)')
+    parser.add_argument('-o', '--output', help='Archivo PDF de salida (opcional); con --batch, directorio de salida')
     parser.add_argument('-m', '--method', 
                        choices=['weasyprint', 'pandoc', 'md2pdf', 'reportlab'],
                        help='Método preferido de conversión')
@@ -756,9 +1421,46 @@ Ejemplos:
                        help='Modo verbose (más detalles)')
     parser.add_argument('-i', '--interactive', action='store_true',
                        help='Forzar modo interactivo')
+    parser.add_argument('-b', '--batch', metavar='DIR/GLOB',
+                       help='Convertir todos los Markdown de un directorio o patrón glob en paralelo')
+    parser.add_argument('-j', '--jobs', type=int,
+                       help='Procesos para el modo batch o --chunked (por defecto: núcleos de CPU)')
+    parser.add_argument('--chunked', action='store_true',
+                       help='WeasyPrint: renderizar por capítulos (h1) en paralelo y unirlos (libros muy largos)')
+    parser.add_argument('--refresh-backends', action='store_true',
+                       help='Ignorar la caché de métodos detectados y volver a comprobarlos')
+    parser.add_argument('-f', '--force', action='store_true',
+                       help='Regenerar aunque el documento no haya cambiado')
+    parser.add_argument('-w', '--watch', action='store_true',
+                       help='Vigilar los archivos y regenerar solo los que cambien')
+    parser.add_argument('--watch-interval', type=float, default=1.0,
+                       help='Segundos entre comprobaciones en modo watch (por defecto: 1)')
     
     args = parser.parse_args()
     
+    if args.refresh_backends:
+        get_default_session().refresh()
+    
+    # Modo watch
+    if args.watch:
+        target = args.batch or args.input_file
+        if not target:
+            parser.error("--watch requiere un archivo o --batch DIR/GLOB")
+        if args.batch:
+            # Primera pasada en paralelo; después, solo los archivos que cambien
+            convert_batch(args.batch, args.output, args.method, args.jobs,
+                          verbose=not args.quiet, force=args.force, chunked=args.chunked)
+        watch(target, args.output, args.method, batch=bool(args.batch),
+              interval=args.watch_interval, force=args.force and not args.batch,
+              chunked=args.chunked)
+        sys.exit(0)
+    
+    # Modo batch
+    if args.batch:
+        results = convert_batch(args.batch, args.output, args.method, args.jobs,
+                                verbose=not args.quiet, force=args.force, chunked=args.chunked)
+        sys.exit(0 if results and all(r["success"] for r in results) else 1)
+    
     # Determinar si usar modo interactivo
     use_interactive = args.interactive or (args.input_file is None)
     
@@ -775,12 +1477,14 @@ Ejemplos:
         if output_file is None:
             output_file = get_output_directory_interactive(input_file)
     
-    converter = MarkdownToPDFConverter(verbose=not args.quiet)
+    converter = MarkdownToPDFConverter(verbose=not args.quiet, chunked=args.chunked,
+                                       chunk_jobs=args.jobs)
     
     success = converter.convert(
         input_file,
         output_file,
-        args.method
+        args.method,
+        force=args.force
     )
     
     sys.exit(0 if success else 1)
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+fixture_server.py — Local HTTP server with MediaWiki-like pages.
+
+Serves fake wiki articles so wiki_to_pdf.py can be tested and timed
+without touching real sites:
+
+    GET /wiki/<Title>         → article (.mw-parser-output, images, navbox)
+    GET /w/index.php?title=X  → 301 to /wiki/X (MediaWiki's long form)
+    GET /go/<Title>           → 302 to /wiki/<Title> (a redirect page)
+    GET /images/<name>.png    → small PNG image
+    GET /skins/<name>         → skin CSS/JS with ETag, Last-Modified and
+                                Cache-Control: max-age (answers 304)
+    GET /ads/tracker.js       → "ad" script that keeps polling /ads/beacon
+    GET /media/<name>.mp4     → 512 KB of fake video
+    GET /fonts/<name>.woff2   → 64 KB of fake web font
+    GET /stats                → request counters (JSON)
+    GET /reset                → reset the counters
+
+Latency can be added to articles and images to imitate a slow wiki, and
+the article body can be inserted by JavaScript after a delay (like wikis
+that render content client-side). Images use loading="lazy".
+
+Like an ad-heavy wiki, each article also loads a tracker script from a
+"third-party" host (localhost instead of 127.0.0.1), an autoplaying video
+and a web font; block them with `wiki_to_pdf.py --block-domain localhost`.
+
+Usage:
+    python fixture_server.py --port 8766 --write-urls urls.txt --pages 200
+    python fixture_server.py --write-urls urls.txt --duplicates  # + variants
+    python wiki_to_pdf.py urls.txt -o out/ --workers 8
+
+Requirements: standard library only.
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import struct
+import sys
+import threading
+import time
+import zlib
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+
+def make_png(width: int = 64, height: int = 48, rgb: tuple = (70, 130, 180)) -> bytes:
+    """Build a solid-colour PNG without external libraries."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    row = b"\x00" + bytes(rgb) * width
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(row * height))
+            + chunk(b"IEND", b""))
+
+
+PNG = make_png()
+VIDEO = bytes(512 * 1024)
+FONT = bytes(64 * 1024)
+# Skin assets: every article of the wiki loads the same ones
+SKINS = {
+    "site.css": ("text/css", ("/* fixture skin */ .mw-body { margin: 1em; }\n" * 3000).encode()),
+    "startup.js": ("application/javascript", ("/* fixture startup module */ void 0;\n" * 4000).encode()),
+}
+SKIN_ETAGS = {name: '"' + hashlib.sha1(body).hexdigest()[:16] + '"' for name, (_, body) in SKINS.items()}
+SKIN_LAST_MODIFIED = formatdate(time.time() - 86_400, usegmt=True)
+
+TRACKER_JS = (
+    "// fake ad tracker: polls its own (third-party) host forever\n"
+    "const origin = document.currentScript.src;\n"
+    "setInterval(() => fetch(new URL('/ads/beacon?t=' + Date.now(), origin), {mode: 'no-cors'}), 500);\n"
+    + "/* padding */" * 2000
+).encode()
+
+
+# ── Server state ─────────────────────────────────────────────────────────────
+
+class FixtureState:
+    """Simulated behaviour and counters shared by all requests."""
+
+    def __init__(self, page_latency_ms: float = 0.0, image_latency_ms: float = 0.0,
+                 images_per_page: int = 3, content_delay_ms: float = 0.0, ads: bool = True,
+                 asset_max_age: int = 60):
+        self.page_latency_ms = page_latency_ms
+        self.image_latency_ms = image_latency_ms
+        self.images_per_page = images_per_page
+        self.content_delay_ms = content_delay_ms
+        self.ads = ads
+        self.asset_max_age = asset_max_age
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests: dict[str, int] = {}
+            self.bytes_sent = 0
+            self.active_pages = 0
+            self.max_active_pages = 0
+
+    def count(self, kind: str, size: int):
+        with self._lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+            self.bytes_sent += size
+
+    def page_started(self):
+        with self._lock:
+            self.active_pages += 1
+            self.max_active_pages = max(self.max_active_pages, self.active_pages)
+
+    def page_finished(self):
+        with self._lock:
+            self.active_pages -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "bytes_sent": self.bytes_sent,
+                "max_concurrent_pages": self.max_active_pages,
+            }
+
+
+def article_html(title: str, images: int, content_delay_ms: float = 0.0,
+                 ad_host: Optional[str] = None) -> str:
+    """A MediaWiki-like article with the clutter CLEANUP_CSS removes."""
+    name = html.escape(title.replace("_", " "))
+    figures = "\n".join(
+        f'<figure><img src="/images/{html.escape(title)}_{i}.png" loading="lazy" width="64" height="48" '
+        f'alt="Figure {i}"><figcaption>Figure {i}</figcaption></figure>'
+        for i in range(1, images + 1)
+    )
+    paragraphs = "\n".join(
+        f"<p>{name} — paragraph {i}. Lorem ipsum dolor sit amet, consectetur "
+        f"adipiscing elit, sed do eiusmod tempor incididunt ut labore.</p>"
+        for i in range(1, 9)
+    )
+    content = f"""<div id="content" class="mw-body">
+  <h1 id="firstHeading">{name}</h1>
+  <div id="mw-content-text"><div class="mw-parser-output">
+    {paragraphs}
+    {figures}
+    <table class="wikitable"><tr><th>Key</th><th>Value</th></tr>
+      <tr><td>Title</td><td>{name}</td></tr></table>
+    <div class="navbox">Navigation box</div>
+  </div></div>
+</div>"""
+    if content_delay_ms:
+        # Rendered client-side: no content root exists until the delay passes
+        content = f"""<template id="article">{content}</template>
+<script>setTimeout(() => document.getElementById('article')
+    .replaceWith(document.getElementById('article').content), {content_delay_ms:g});</script>"""
+    extras = ""
+    if ad_host:
+        extras = f"""<style>@font-face {{ font-family: WikiFont; src: url(/fonts/wiki.woff2); }}
+body {{ font-family: WikiFont, sans-serif; }}</style>
+<script async src="//{ad_host}/ads/tracker.js"></script>"""
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>{name} - Fixture Wiki</title>
+<meta property="og:title" content="{name}">
+<link rel="stylesheet" href="/skins/site.css">
+<script src="/skins/startup.js"></script>{extras}</head>
+<body>
+<div id="mw-navigation"><nav>Main page · Random article</nav></div>
+{content}
+<div class="ad-slot">Advertisement</div>
+<div class="featured-video"><video src="/media/intro.mp4" autoplay muted></video></div>
+<div id="footer">Fixture Wiki footer</div>
+</body>
+</html>"""
+
+
+# ── HTTP handler ─────────────────────────────────────────────────────────────
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    state: FixtureState  # assigned in start_server()
+
+    def log_message(self, fmt, *args):
+        pass  # silent: used for tests and benchmarks
+
+    def _send(self, status: int, body: bytes, content_type: str, kind: str,
+              headers: Optional[dict] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.state.count(kind, len(body))
+
+    def _redirect(self, status: int, location: str):
+        self.send_response(status)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        self.state.count("redirect", 0)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path = unquote(parts.path)
+
+        if path == "/stats":
+            body = json.dumps(self.state.stats()).encode()
+            self._send(200, body, "application/json", "stats")
+        elif path == "/reset":
+            self.state.reset()
+            self._send(200, b"{}", "application/json", "stats")
+        elif path.startswith("/wiki/"):
+            self.state.page_started()
+            try:
+                time.sleep(self.state.page_latency_ms / 1000)
+                ad_host = f"localhost:{self.server.server_address[1]}" if self.state.ads else None
+                body = article_html(path[len("/wiki/"):], self.state.images_per_page,
+                                    self.state.content_delay_ms, ad_host).encode()
+                self._send(200, body, "text/html; charset=utf-8", "page")
+            finally:
+                self.state.page_finished()
+        elif path == "/w/index.php" and "title" in parse_qs(parts.query):
+            self._redirect(301, "/wiki/" + quote(parse_qs(parts.query)["title"][0].replace(" ", "_")))
+        elif path.startswith("/go/"):
+            self._redirect(302, "/wiki/" + quote(path[len("/go/"):]))
+        elif path.startswith("/images/") and path.endswith(".png"):
+            time.sleep(self.state.image_latency_ms / 1000)
+            self._send(200, PNG, "image/png", "image")
+        elif path.startswith("/skins/") and path[len("/skins/"):] in SKINS:
+            name = path[len("/skins/"):]
+            content_type, body = SKINS[name]
+            validators = {
+                "ETag": SKIN_ETAGS[name],
+                "Last-Modified": SKIN_LAST_MODIFIED,
+                "Cache-Control": f"public, max-age={self.state.asset_max_age}",
+            }
+            if self.headers.get("If-None-Match") == SKIN_ETAGS[name]:
+                self._send(304, b"", content_type, "skin-304", validators)
+            else:
+                self._send(200, body, content_type, "skin", validators)
+        elif path == "/ads/tracker.js":
+            self._send(200, TRACKER_JS, "application/javascript", "ads")
+        elif path == "/ads/beacon":
+            self._send(200, b"", "text/plain", "ads")
+        elif path.startswith("/media/"):
+            self._send(200, VIDEO, "video/mp4", "media")
+        elif path.startswith("/fonts/"):
+            self._send(200, FONT, "font/woff2", "font")
+        else:
+            self._send(404, b"not found", "text/plain", "missing")
+
+
+def start_server(port: int = 0, **options) -> tuple[ThreadingHTTPServer, FixtureState]:
+    """
+    Start the server on a background thread; port 0 picks a free port.
+    The base URL is f"http://127.0.0.1:{server.server_address[1]}".
+    Stop it with server.shutdown().
+    """
+    state = FixtureState(**options)
+    handler = type("Handler", (FixtureHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def write_url_list(path: str, base_url: str, pages: int, duplicates: bool = False):
+    """
+    Write a wiki_to_pdf input file with `pages` fixture articles. With
+    `duplicates`, every fifth article is listed again as a variant: with
+    a #fragment, in the index.php form, and through a redirect.
+    """
+    lines = ["# Fixture articles for wiki_to_pdf.py"]
+    lines += [f"{base_url}/wiki/Article_{i:04d}" for i in range(1, pages + 1)]
+    if duplicates:
+        for i in range(1, pages + 1, 5):
+            lines += [
+                f"{base_url}/wiki/Article_{i:04d}#History",
+                f"{base_url}/w/index.php?title=Article%20{i:04d}&utm_source=list",
+                f"{base_url}/go/Article_{i:04d}",
+            ]
+    Path(path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+# ── Main ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="MediaWiki-like fixture server for wiki_to_pdf.py")
+    parser.add_argument("--port", type=int, default=8766, help="Port to listen on (default: 8766)")
+    parser.add_argument("--page-latency", type=float, default=200.0,
+                        help="Latency per article in ms (default: 200)")
+    parser.add_argument("--image-latency", type=float, default=100.0,
+                        help="Latency per image in ms (default: 100)")
+    parser.add_argument("--images", type=int, default=3, help="Images per article (default: 3)")
+    parser.add_argument("--content-delay", type=float, default=0.0,
+                        help="Insert the article body via JavaScript after this many ms")
+    parser.add_argument("--asset-max-age", type=int, default=60,
+                        help="Cache-Control max-age of skin assets in seconds (default: 60)")
+    parser.add_argument("--no-ads", action="store_true",
+                        help="Serve articles without tracker, video and web font")
+    parser.add_argument("--write-urls", metavar="FILE", help="Write a URL list for wiki_to_pdf.py")
+    parser.add_argument("--pages", type=int, default=200, help="Articles in the URL list (default: 200)")
+    parser.add_argument("--duplicates", action="store_true",
+                        help="Also list variants and redirects of some articles")
+    args = parser.parse_args()
+
+    server, state = start_server(
+        args.port, page_latency_ms=args.page_latency,
+        image_latency_ms=args.image_latency, images_per_page=args.images,
+        content_delay_ms=args.content_delay, ads=not args.no_ads,
+        asset_max_age=args.asset_max_age,
+    )
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"  Fixture wiki at {base_url}/wiki/Example")
+    if args.write_urls:
+        write_url_list(args.write_urls, base_url, args.pages, args.duplicates)
+        print(f"  Wrote {args.pages} URL(s) to {args.write_urls}")
+    print("  Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    finally:
+        server.shutdown()
+        print(f"\n  {json.dumps(state.stats())}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(0)
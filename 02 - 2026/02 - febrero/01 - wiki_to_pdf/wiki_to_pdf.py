@@ -7,29 +7,58 @@ Uses a real headless browser (Playwright/Chromium) to fully load each page
 ads, navigation, sidebars, popups, and cookie banners before printing
 to PDF natively via the browser engine.
 
+Several pages of the same browser context work in parallel (asyncio),
+fed from a bounded queue; results are reported in input order.
+
 Usage:
-    python wiki_to_pdf.py
+    python wiki_to_pdf.py                              # interactive
+    python wiki_to_pdf.py urls.txt -o out/ --workers 6
 
 Requirements:
     pip install playwright
     playwright install chromium
 """
 
+import argparse
+import asyncio
+import hashlib
+import json
 import os
 import re
 import sys
 import time
+from collections import Counter
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit, urlunsplit
 
 try:
-    from playwright.sync_api import sync_playwright, Page, Browser
+    from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Route, Response
     PLAYWRIGHT_IMPORT_ERROR = None
 except ImportError as exc:
-    sync_playwright = None
+    async_playwright = None
     Page = object
     Browser = object
+    BrowserContext = object
+    Route = object
+    Response = object
     PLAYWRIGHT_IMPORT_ERROR = exc
 
+DEFAULT_WORKERS = 4
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "wiki_to_pdf" / "assets"
+DEFAULT_CACHE_MB = 200
+CACHE_MARKER_HEADER = "x-wiki-to-pdf-cache"  # set on responses served from disk
+JOB_STATE_NAME = ".wiki_to_pdf_jobs.json"      # kept in the output directory
+CONTENT_TIMEOUT_MS = 15_000   # ceiling for the article root to appear
+IMAGE_TIMEOUT_MS = 8_000      # ceiling for the article images to decode
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
 
 # ── Colours ──────────────────────────────────────────────────────────────────
 
@@ -209,6 +238,369 @@ CLEANUP_JS = """
 """
 
 
+# ── Readiness: wait for events, not fixed sleeps ─────────────────────────────
+
+# Main article root, in order of preference
+CONTENT_SELECTORS = [
+    ".mw-parser-output",        # MediaWiki / Wikipedia / Fandom
+    ".page-content",            # Fandom alternative
+    "article",                  # Generic semantic HTML
+    "#content",                 # Common id
+    "#mw-content-text",         # MediaWiki
+    "main",                     # Semantic HTML
+]
+
+CONSENT_SELECTORS = [
+    'button[id*="accept" i]',
+    'button[class*="accept" i]',
+    'button[class*="agree" i]',
+    'button[class*="consent" i]',
+    'button[aria-label*="accept" i]',
+    'button[aria-label*="agree" i]',
+    '[data-tracking-opt-in-accept]',
+    '.cookie-accept',
+    '#onetrust-accept-btn-handler',
+]
+
+# Resolves when every image inside the content root is decoded (or broken),
+# or after `timeoutMs`. Lazy images are switched to eager first, so images
+# below the fold load without scrolling.
+WAIT_FOR_IMAGES_JS = """
+async ([selectors, timeoutMs]) => {
+    const root = selectors.map(sel => document.querySelector(sel)).find(Boolean)
+                 || document.body;
+    const images = Array.from(root.querySelectorAll('img'));
+    for (const img of images) {
+        if (img.loading === 'lazy') img.loading = 'eager';
+        const lazySrc = img.dataset.src || img.dataset.lazySrc;
+        if (lazySrc && (!img.src || img.src.startsWith('data:'))) img.src = lazySrc;
+    }
+    const decoded = images.map(img =>
+        (img.complete && img.naturalWidth) ? Promise.resolve()
+                                           : img.decode().catch(() => {}));
+    let timedOut = false;
+    await Promise.race([
+        Promise.all(decoded),
+        new Promise(resolve => setTimeout(() => { timedOut = true; resolve(); }, timeoutMs)),
+    ]);
+    return {total: images.length,
+            pending: images.filter(img => !img.complete).length,
+            timedOut};
+}
+"""
+
+# Two animation frames: the layout after DOM changes has been computed
+NEXT_FRAME_JS = "() => new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)))"
+
+
+async def wait_until_ready(page: Page, image_timeout_ms: int = IMAGE_TIMEOUT_MS) -> dict:
+    """
+    Wait for any content selector (all at once), then for the images of
+    the content root to decode, each step with a ceiling. Fast pages are
+    ready in milliseconds; only slow ones use the timeouts.
+    """
+    try:
+        await page.wait_for_selector(", ".join(CONTENT_SELECTORS), timeout=CONTENT_TIMEOUT_MS)
+    except Exception:
+        # No known content root: settle for the load event
+        try:
+            await page.wait_for_load_state("load", timeout=5000)
+        except Exception:
+            pass
+
+    return await page.evaluate(WAIT_FOR_IMAGES_JS, [CONTENT_SELECTORS, image_timeout_ms])
+
+
+# ── Request blocking: never download what CLEANUP_CSS would hide ───────────
+
+# Ad, tracking and analytics hosts (subdomains included)
+DEFAULT_BLOCKED_DOMAINS = [
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com",
+    "google-analytics.com", "googletagmanager.com", "googletagservices.com",
+    "adservice.google.com", "amazon-adsystem.com", "adnxs.com", "criteo.com",
+    "criteo.net", "pubmatic.com", "rubiconproject.com", "casalemedia.com",
+    "openx.net", "taboola.com", "outbrain.com", "scorecardresearch.com",
+    "quantserve.com", "quantcount.com", "chartbeat.com", "chartbeat.net",
+    "hotjar.com", "moatads.com", "adsafeprotected.com", "doubleverify.com",
+    "imasdk.googleapis.com", "jwpcdn.com", "jwplayer.com", "jwpltx.com",
+    "connatix.com", "permutive.com", "krxd.net", "bluekai.com",
+]
+
+# Playwright resource types that never end up in the PDF
+DEFAULT_BLOCKED_TYPES = ["media", "font", "websocket", "eventsource", "texttrack"]
+
+
+class RequestBlocker:
+    """
+    context.route handler that aborts requests to blocklisted hosts and
+    resource types, and counts what it blocked.
+
+    Downloaded bytes (from Content-Length) are counted too: running once
+    with --no-block and once without shows the bandwidth saved.
+    """
+
+    def __init__(self, domains: list[str], resource_types: list[str]):
+        self.domains = tuple(d.strip().lower().lstrip(".") for d in domains if d.strip())
+        self.resource_types = frozenset(t.strip().lower() for t in resource_types if t.strip())
+        self.blocked: Counter = Counter()
+        self.allowed = 0
+        self.downloaded_bytes = 0
+
+    def block_reason(self, url: str, resource_type: str) -> Optional[str]:
+        """Name of the rule that blocks this request, or None."""
+        if resource_type in self.resource_types:
+            return resource_type
+        host = (urlsplit(url).hostname or "").lower()
+        for domain in self.domains:
+            if host == domain or host.endswith("." + domain):
+                return domain
+        return None
+
+    async def handle(self, route: Route):
+        request = route.request
+        reason = None
+        # The article itself is never blocked, whatever its host
+        if not (request.is_navigation_request() and request.frame.parent_frame is None):
+            reason = self.block_reason(request.url, request.resource_type)
+        if reason is None:
+            self.allowed += 1
+            await route.fallback()  # let other routes (or the network) handle it
+        else:
+            self.blocked[reason] += 1
+            await route.abort("blockedbyclient")
+
+    def record_response(self, response: Response):
+        if CACHE_MARKER_HEADER in response.headers:
+            return  # served by AssetCache from disk, not downloaded
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.downloaded_bytes += int(length)
+
+    async def attach(self, context: BrowserContext):
+        if self.domains or self.resource_types:
+            # Note: any route disables Chromium's HTTP cache for the context
+            await context.route("**/*", self.handle)
+        context.on("response", self.record_response)
+
+    def summary(self) -> str:
+        total = sum(self.blocked.values())
+        top = ", ".join(f"{name}: {count}" for name, count in self.blocked.most_common(5))
+        return f"{total} request(s) blocked" + (f" ({top})" if top else "")
+
+
+# ── Asset cache: skins, CSS and JS from disk across pages and runs ─────────
+
+# Responses that must not be replayed from another context
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "transfer-encoding", "content-encoding",
+    "content-length", "set-cookie", "date", "age",
+}
+
+
+def http_date(value: Optional[str]) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp() if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: dict, now: float) -> Optional[float]:
+    """
+    Seconds a response may be reused without revalidation, or None if it
+    must not be stored at all: no-store or private responses, and responses
+    that set cookies (they belong to this session, not to the URL).
+    """
+    if "set-cookie" in headers:
+        return None
+    cache_control = headers.get("cache-control", "").lower()
+    directives = {}
+    for part in cache_control.split(","):
+        name, _, value = part.strip().partition("=")
+        directives[name] = value.strip('"')
+    if "no-store" in directives or "private" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name, "").isdigit():
+            return float(directives[name])
+    expires = http_date(headers.get("expires"))
+    if expires is not None:
+        return max(0.0, expires - now)
+    # Heuristic (RFC 9111 §4.2.2): 10% of the time since the last change, max 1 day
+    last_modified = http_date(headers.get("last-modified"))
+    if last_modified is not None:
+        return min(0.1 * max(0.0, now - last_modified), 86_400.0)
+    return 0.0
+
+
+class AssetCache:
+    """
+    On-disk HTTP cache for static assets, used as a context.route handler.
+
+    Entries are keyed by URL and keep the response validators (ETag,
+    Last-Modified). A fresh entry is served straight from disk; a stale
+    one is revalidated with a conditional request and, on 304, still
+    served from disk. The total size is capped with LRU eviction.
+    Article HTML and images are left to the network.
+    """
+
+    RESOURCE_TYPES = frozenset({"stylesheet", "script", "font"})
+
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.index_path = self.directory / "index.json"
+        self.entries: dict[str, dict] = {}
+        self.stats: Counter = Counter()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as fh:
+                self.entries = json.load(fh)
+        except (OSError, ValueError):
+            self.entries = {}
+        # Keep only entries whose body is still on disk
+        self.entries = {
+            url: entry for url, entry in self.entries.items()
+            if (self.directory / entry["file"]).is_file()
+        }
+        # Bodies stored by a run that was killed before save() are in no
+        # index; drop them or they would sit outside the size limit forever
+        indexed = {entry["file"] for entry in self.entries.values()}
+        for path in self.directory.glob("*.bin"):
+            if path.name not in indexed:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+        self._evict()  # the size limit may be lower than in the last run
+
+    def save(self):
+        """Write the index (once, at the end of a run; _load sweeps unindexed bodies)."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(self.entries, fh)
+            os.replace(tmp, self.index_path)
+        except OSError:
+            pass  # without an index the next run starts cold
+
+    @property
+    def size(self) -> int:
+        return sum(entry["size"] for entry in self.entries.values())
+
+    def _read(self, entry: dict) -> Optional[bytes]:
+        try:
+            body = (self.directory / entry["file"]).read_bytes()
+        except OSError:
+            return None
+        entry["last_used"] = time.time()
+        return body
+
+    def _store(self, url: str, status: int, headers: dict, body: bytes, lifetime: float):
+        if len(body) > self.max_bytes // 10:
+            return  # one huge file would evict everything else
+        name = hashlib.sha256(url.encode("utf-8")).hexdigest() + ".bin"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / name).write_bytes(body)
+        except OSError:
+            return
+        now = time.time()
+        self.entries[url] = {
+            "file": name,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() not in HOP_BY_HOP_HEADERS},
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "expires_at": now + lifetime,
+            "last_used": now,
+            "size": len(body),
+        }
+        self.stats["stored_bytes"] += len(body)
+        self._evict()
+
+    def _evict(self):
+        total = self.size
+        for url, entry in sorted(self.entries.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            try:
+                (self.directory / entry["file"]).unlink()
+            except OSError:
+                pass
+            del self.entries[url]
+            total -= entry["size"]
+            self.stats["evicted"] += 1
+
+    async def _fulfill_from_disk(self, route: Route, entry: dict, body: bytes):
+        self.stats["bytes_from_disk"] += len(body)
+        headers = {**entry["headers"], CACHE_MARKER_HEADER: "hit"}
+        await route.fulfill(status=entry["status"], headers=headers, body=body)
+
+    async def handle(self, route: Route):
+        request = route.request
+        if request.method != "GET" or request.resource_type not in self.RESOURCE_TYPES:
+            await route.fallback()
+            return
+
+        url = request.url
+        entry = self.entries.get(url)
+        body = self._read(entry) if entry else None
+        if entry and body is None:
+            del self.entries[url]
+            entry = None
+
+        if entry and time.time() < entry["expires_at"]:
+            self.stats["hits"] += 1
+            await self._fulfill_from_disk(route, entry, body)
+            return
+
+        headers = dict(request.headers)
+        if entry and entry.get("etag"):
+            headers["if-none-match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["if-modified-since"] = entry["last_modified"]
+
+        try:
+            response = await route.fetch(headers=headers)
+        except Exception:
+            if entry:
+                # Offline or failing server: a stale copy beats a broken page
+                self.stats["stale"] += 1
+                await self._fulfill_from_disk(route, entry, body)
+            else:
+                await route.abort("failed")
+            return
+
+        now = time.time()
+        if response.status == 304 and entry:
+            self.stats["revalidated"] += 1
+            lifetime = freshness_lifetime(response.headers, now)
+            entry["expires_at"] = now + (lifetime or 0.0)
+            await self._fulfill_from_disk(route, entry, body)
+            return
+
+        self.stats["misses"] += 1
+        if response.status == 200:
+            lifetime = freshness_lifetime(response.headers, now)
+            if lifetime is not None:
+                self._store(url, response.status, response.headers, await response.body(), lifetime)
+        await route.fulfill(response=response)
+
+    async def attach(self, context: BrowserContext):
+        await context.route("**/*", self.handle)
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"{s['hits']} from disk, {s['revalidated']} revalidated (304), "
+                f"{s['misses']} downloaded; {s['bytes_from_disk'] / 1024 / 1024:.1f} MB served "
+                f"locally, {len(self.entries)} file(s) / {self.size / 1024 / 1024:.1f} MB cached")
+
+
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
 def banner():
@@ -250,27 +642,177 @@ def read_urls(filepath: str) -> list[str]:
     return urls
 
 
-def unique_pdf_path(directory: str, name: str) -> Path:
-    """Return a non-colliding PDF path in `directory`."""
+def unique_pdf_path(directory: str, name: str, reserved: Optional[set] = None) -> Path:
+    """
+    Return a non-colliding PDF path in `directory`.
+
+    `reserved` holds paths already handed out to other pages that have not
+    written their file yet; the chosen path is added to it. There is no
+    `await` in between, so concurrent workers never get the same name.
+    """
     pdf = Path(directory) / f"{name}.pdf"
     counter = 1
     original = pdf
-    while pdf.exists():
+    while pdf.exists() or (reserved is not None and pdf in reserved):
         pdf = original.with_stem(f"{original.stem} ({counter})")
         counter += 1
+    if reserved is not None:
+        reserved.add(pdf)
     return pdf
 
 
+# ── Job state: resume a list, merge duplicate URLs ─────────────────────────
+
+MOBILE_HOST_LABELS = frozenset({"m", "mobile"})
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "mobileaction", "useskin", "useformat", "so"})
+
+
+def normalize_url(url: str) -> str:
+    """
+    Key under which a URL is tracked. Variants of the same article map to
+    one key: scheme, case of the host, "www." and mobile hosts
+    (en.m.wikipedia.org), default ports, the #fragment, tracking
+    parameters, and MediaWiki's /w/index.php?title=X form of /wiki/X.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    labels = host.split(".")
+    if labels[0] == "www":
+        labels = labels[1:]
+    if len(labels) > 2 and labels[0] in MOBILE_HOST_LABELS:
+        labels = labels[1:]            # m.example.org
+    elif len(labels) > 3 and labels[1] in MOBILE_HOST_LABELS:
+        labels = labels[:1] + labels[2:]  # en.m.wikipedia.org
+    host = ".".join(labels)
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = unquote(parts.path) or "/"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in TRACKING_PARAMS and not key.startswith("utm_")
+    )
+    if path.endswith("/index.php") and [key for key, _ in query] == ["title"]:
+        path, query = "/wiki/" + query[0][1], []
+    if path.startswith("/wiki/"):
+        path = path.replace(" ", "_")  # MediaWiki titles: spaces are underscores
+
+    return urlunsplit(("https", host, quote(path, safe="/:@!$&'()*+,;=~"), urlencode(query), ""))
+
+
+class DuplicateURL(Exception):
+    """The page landed on an article that another URL already covers."""
+
+    def __init__(self, key: str):
+        super().__init__(f"Duplicate of {key}")
+        self.key = key
+
+
+class JobState:
+    """
+    Persistent status of a URL list, in a JSON file next to the PDFs.
+
+    Jobs are keyed by normalized URL and record done/failed, the PDF path
+    and the title. When a URL redirects, its key becomes an alias of the
+    final page's key, so the next run recognises it without loading it.
+    The file is rewritten after every result: an interrupted run loses
+    nothing.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.jobs: dict[str, dict] = {}
+        self.aliases: dict[str, str] = {}
+        self.claimed: set[str] = set()  # keys being converted in this run
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            self.jobs = data.get("jobs", {})
+            self.aliases = data.get("aliases", {})
+        except (OSError, ValueError, AttributeError):
+            self.jobs, self.aliases = {}, {}
+
+    def save(self):
+        try:
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump({"jobs": self.jobs, "aliases": self.aliases}, fh, indent=1)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # the run still works, it just will not resume
+
+    def key(self, url: str) -> str:
+        key = normalize_url(url)
+        return self.aliases.get(key, key)
+
+    def is_done(self, key: str) -> bool:
+        job = self.jobs.get(key)
+        return bool(job and job["status"] == "done" and Path(job["pdf"]).is_file())
+
+    def plan(self, urls: list[str], retry_failed: bool = True) -> tuple[list[str], Counter]:
+        """
+        Return the URLs still to convert, in input order and without
+        duplicates, plus a Counter of what was skipped and why.
+        """
+        pending: list[str] = []
+        skipped: Counter = Counter()
+        for url in urls:
+            key = self.key(url)
+            if key in self.claimed:
+                skipped["duplicate"] += 1
+            elif self.is_done(key):
+                skipped["done"] += 1
+            elif not retry_failed and self.jobs.get(key, {}).get("status") == "failed":
+                skipped["failed"] += 1
+            else:
+                pending.append(url)
+            self.claimed.add(key)
+        # Only the pending keys are in flight
+        self.claimed = {self.key(url) for url in pending}
+        return pending, skipped
+
+    def landed(self, url: str, final_url: str):
+        """
+        Called once the page has navigated. Records a redirect as an alias
+        and raises DuplicateURL if the final page is covered elsewhere.
+        """
+        key, final = self.key(url), self.key(final_url)
+        if final == key:
+            return
+        self.aliases[key] = final
+        self.claimed.discard(key)
+        if final in self.claimed or self.is_done(final):
+            self.save()
+            raise DuplicateURL(final)
+        self.claimed.add(final)
+
+    def record(self, result: "JobResult"):
+        """Store the outcome of one URL and write the file."""
+        if result.duplicate_of:
+            return  # the alias was saved by landed()
+        key = self.key(result.url)
+        job = self.jobs.setdefault(key, {"attempts": 0})
+        job.update(url=result.url, attempts=job["attempts"] + 1, updated=time.time())
+        if result.ok:
+            job.update(status="done", pdf=str(result.pdf_path), title=result.title, error="")
+        else:
+            job.update(status="failed", error=result.error)
+        self.save()
+
+
 # ── Core: load page in browser, clean it, print to PDF ──────────────────────
 
-def inject_css_via_js(page: Page, css: str):
+async def inject_css_via_js(page: Page, css: str):
     """
     Inject CSS by creating a <style> element via JavaScript.
     This bypasses Content Security Policy restrictions that block
     page.add_style_tag().
     """
     escaped = css.replace("\\", "\\\\").replace("`", "\\`").replace("${", "\\${")
-    page.evaluate(f"""
+    await page.evaluate(f"""
         () => {{
             const style = document.createElement('style');
             style.textContent = `{escaped}`;
@@ -279,79 +821,52 @@ def inject_css_via_js(page: Page, css: str):
     """)
 
 
-def convert_url_to_pdf(page: Page, url: str, output_dir: str) -> tuple[str, Path]:
+async def convert_url_to_pdf(page: Page, url: str, output_dir: str,
+                             reserved: Optional[set] = None,
+                             image_timeout_ms: int = IMAGE_TIMEOUT_MS,
+                             state: Optional[JobState] = None) -> tuple[str, Path]:
     """
     Navigate to `url`, wait for content + images, inject cleanup,
     and save to PDF.  Returns (title, pdf_path).
+    Raises DuplicateURL if `url` redirects to an article already covered.
     """
     # 1. Navigate — use 'domcontentloaded' instead of 'networkidle'
     #    because ad-heavy sites (Fandom) load trackers forever and
     #    'networkidle' times out waiting for them.
-    page.goto(url, wait_until="domcontentloaded", timeout=60_000)
-
-    # 2. Wait for the main article content to appear
-    #    Try several common content selectors; fall back to a timed wait.
-    content_selectors = [
-        ".mw-parser-output",        # MediaWiki / Wikipedia / Fandom
-        ".page-content",            # Fandom alternative
-        "article",                  # Generic semantic HTML
-        "#content",                 # Common id
-        "#mw-content-text",         # MediaWiki
-        "main",                     # Semantic HTML
-    ]
-    content_found = False
-    for sel in content_selectors:
-        try:
-            page.wait_for_selector(sel, timeout=15_000)
-            content_found = True
-            break
-        except Exception:
-            continue
-
-    if not content_found:
-        # Last resort: just wait a few seconds for whatever loads
-        page.wait_for_timeout(5000)
-
-    # 3. Extra wait for images to lazy-load
-    page.wait_for_timeout(3000)
-
-    # 4. Dismiss common cookie / consent banners by clicking accept buttons
-    consent_selectors = [
-        'button[id*="accept" i]',
-        'button[class*="accept" i]',
-        'button[class*="agree" i]',
-        'button[class*="consent" i]',
-        'button[aria-label*="accept" i]',
-        'button[aria-label*="agree" i]',
-        '[data-tracking-opt-in-accept]',
-        '.cookie-accept',
-        '#onetrust-accept-btn-handler',
-    ]
-    for sel in consent_selectors:
+    await page.goto(url, wait_until="domcontentloaded", timeout=60_000)
+    if state:
+        state.landed(url, page.url)  # page.url is the address after redirects
+
+    # 2. Wait for the article root, then for its images to decode
+    await wait_until_ready(page, image_timeout_ms)
+
+    # 3. Dismiss common cookie / consent banners by clicking accept buttons
+    for sel in CONSENT_SELECTORS:
         try:
-            btn = page.query_selector(sel)
-            if btn and btn.is_visible():
-                btn.click()
-                page.wait_for_timeout(500)
+            btn = await page.query_selector(sel)
+            if btn and await btn.is_visible():
+                await btn.click()
+                # Until the banner's button goes away, not a fixed pause
+                await btn.wait_for_element_state("hidden", timeout=1000)
                 break
         except Exception:
             pass
 
-    # 5. Inject cleanup CSS via JavaScript (bypasses CSP restrictions)
-    inject_css_via_js(page, CLEANUP_CSS)
+    # 4. Inject cleanup CSS via JavaScript (bypasses CSP restrictions)
+    await inject_css_via_js(page, CLEANUP_CSS)
 
-    # 6. Inject cleanup JS — also returns the page title
-    title = page.evaluate(CLEANUP_JS) or "Untitled"
+    # 5. Inject cleanup JS — also returns the page title
+    title = await page.evaluate(CLEANUP_JS) or "Untitled"
 
-    # 7. Small pause for reflow after cleanup
-    page.wait_for_timeout(500)
+    # 6. Let the browser lay out the page again after cleanup
+    await page.evaluate(NEXT_FRAME_JS)
 
-    # 8. Determine output path
+    # 7. Determine output path
     safe_name = sanitise_filename(title)
-    pdf_path = unique_pdf_path(output_dir, safe_name)
+    pdf_path = unique_pdf_path(output_dir, safe_name, reserved)
 
-    # 9. Print to PDF using the browser engine (Chromium CDP)
-    page.pdf(
+    # 8. Print to PDF using the browser engine (Chromium CDP)
+    await page.pdf(
         path=str(pdf_path),
         format="A4",
         margin={"top": "2cm", "right": "2cm", "bottom": "2cm", "left": "2cm"},
@@ -361,6 +876,179 @@ def convert_url_to_pdf(page: Page, url: str, output_dir: str) -> tuple[str, Path
     return title, pdf_path
 
 
+# ── Worker pool: N pages of one browser context fed by a bounded queue ─────
+
+@dataclass
+class JobResult:
+    index: int
+    url: str
+    title: str = ""
+    pdf_path: Optional[Path] = None
+    error: str = ""
+    duplicate_of: str = ""
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.pdf_path is not None
+
+
+def short_error(exc: Exception) -> str:
+    """Truncate very long Playwright error messages."""
+    msg = str(exc)
+    if len(msg) > 200:
+        msg = msg[:200] + " …"
+    return msg
+
+
+def print_result(result: JobResult, total: int):
+    label = f"[{result.index}/{total}]"
+    print(f"  {col(label, C.BOLD)} {col(result.url, C.DIM)}")
+    if result.ok:
+        print(col(f"         ✓ Saved: {result.pdf_path.name} ({result.seconds:.1f}s)", C.GREEN))
+    elif result.duplicate_of:
+        print(col(f"         ↷ Same article as {result.duplicate_of}, skipped", C.YELLOW))
+    else:
+        print(col(f"         ✗ {result.error}", C.RED))
+
+
+class OrderedReporter:
+    """Print results in input order, as soon as every earlier URL is done."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.next_index = 1
+        self.waiting: dict[int, JobResult] = {}
+
+    def add(self, result: JobResult):
+        self.waiting[result.index] = result
+        while self.next_index in self.waiting:
+            print_result(self.waiting.pop(self.next_index), self.total)
+            self.next_index += 1
+
+
+async def feed_queue(queue: asyncio.Queue, urls: list[str], workers: int):
+    """Put (index, url) jobs in the queue, then one stop marker per worker."""
+    for index, url in enumerate(urls, start=1):
+        await queue.put((index, url))  # blocks while the queue is full
+    for _ in range(workers):
+        await queue.put(None)
+
+
+async def recycle_page(context: BrowserContext, page: Optional[Page],
+                       result: JobResult) -> Optional[Page]:
+    """
+    Replace a tab after a failure. A crashed tab (or browser) can make both
+    close() and new_page() raise; that is noted on `result` and None is
+    returned so the worker tries again with its next URL.
+    """
+    if page is not None:
+        try:
+            await page.close()
+        except Exception:
+            pass  # already gone with the crash
+    try:
+        return await context.new_page()
+    except Exception as exc:
+        note = f"could not open a new tab: {short_error(exc)}"
+        result.error = f"{result.error}; {note}" if result.error else note
+        return None
+
+
+async def page_worker(context: BrowserContext, queue: asyncio.Queue, output_dir: str,
+                      reserved: set, reporter: OrderedReporter,
+                      results: list, delay: float, image_timeout_ms: int,
+                      state: Optional[JobState] = None):
+    """Convert URLs from the queue with one reusable page (tab)."""
+    page: Optional[Page] = None
+    try:
+        while True:
+            job = await queue.get()
+            if job is None:
+                return
+            index, url = job
+            result = JobResult(index, url)
+            start = time.perf_counter()
+            try:
+                if page is None:
+                    page = await context.new_page()
+                result.title, result.pdf_path = await convert_url_to_pdf(
+                    page, url, output_dir, reserved, image_timeout_ms, state
+                )
+            except DuplicateURL as exc:
+                result.duplicate_of = exc.key
+            except Exception as exc:
+                result.error = short_error(exc)
+                # The tab may be crashed or stuck mid-navigation: start fresh
+                page = await recycle_page(context, page, result)
+            result.seconds = time.perf_counter() - start
+            if state:
+                state.record(result)
+            results[index - 1] = result
+            reporter.add(result)
+            if delay:
+                await asyncio.sleep(delay)  # be polite to the server
+    finally:
+        if page is not None and not page.is_closed():
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+
+async def convert_all(urls: list[str], output_dir: str,
+                      workers: int = DEFAULT_WORKERS, delay: float = 0.3,
+                      image_timeout_ms: int = IMAGE_TIMEOUT_MS,
+                      blocker: Optional[RequestBlocker] = None,
+                      cache: Optional[AssetCache] = None,
+                      state: Optional[JobState] = None) -> list[JobResult]:
+    """
+    Convert every URL with a pool of `workers` pages sharing one browser
+    context. Returns one JobResult per URL, in input order. With `state`,
+    each outcome is recorded as soon as it is known.
+    """
+    workers = max(1, min(workers, len(urls)))
+    # Bounded: URLs are handed out as pages free up, never all at once
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+    results: list[Optional[JobResult]] = [None] * len(urls)
+    reporter = OrderedReporter(len(urls))
+    reserved: set[Path] = set()
+
+    async with async_playwright() as pw:
+        browser: Browser = await pw.chromium.launch(headless=True)
+        try:
+            context = await browser.new_context(
+                user_agent=USER_AGENT,
+                viewport={"width": 1280, "height": 900},
+                locale="en-US",
+                bypass_csp=True,  # Bypass Content Security Policy so we can inject CSS/JS
+            )
+            # Routes run newest first: the blocker decides, then the cache serves
+            if cache:
+                await cache.attach(context)
+            if blocker:
+                await blocker.attach(context)
+            tasks = [
+                asyncio.create_task(
+                    page_worker(context, queue, output_dir, reserved, reporter, results,
+                                delay, image_timeout_ms, state)
+                )
+                for _ in range(workers)
+            ]
+            producer = asyncio.create_task(feed_queue(queue, urls, workers))
+            try:
+                await asyncio.gather(producer, *tasks)
+            finally:
+                for task in (producer, *tasks):
+                    task.cancel()
+        finally:
+            await browser.close()
+            if cache:
+                cache.save()
+
+    return results
+
+
 # ── Interactive prompts ──────────────────────────────────────────────────────
 
 def ask_input_file() -> str:
@@ -408,8 +1096,44 @@ def ask_output_dir() -> str:
 
 # ── Main ─────────────────────────────────────────────────────────────────────
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Convert wiki/web URLs to clean PDFs. Without arguments, asks interactively."
+    )
+    parser.add_argument("urls_file", nargs="?", help="Text file with one URL per line")
+    parser.add_argument("-o", "--output-dir", help="Where to save the PDFs (default: current directory)")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Pages converted in parallel (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--delay", type=float, default=0.3,
+                        help="Pause in seconds after each URL, per page (default: 0.3)")
+    parser.add_argument("--image-timeout", type=float, default=IMAGE_TIMEOUT_MS / 1000,
+                        help=f"Max seconds to wait for article images (default: {IMAGE_TIMEOUT_MS // 1000})")
+    parser.add_argument("--block-domain", action="append", default=[], metavar="DOMAIN",
+                        help="Also block this host and its subdomains (repeatable)")
+    parser.add_argument("--block-types", default=",".join(DEFAULT_BLOCKED_TYPES),
+                        help="Comma-separated resource types to block "
+                             f"(default: {','.join(DEFAULT_BLOCKED_TYPES)})")
+    parser.add_argument("--no-block", action="store_true",
+                        help="Download everything (no domain or type blocking)")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR),
+                        help=f"Asset cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_MB,
+                        help=f"Asset cache limit in MB (default: {DEFAULT_CACHE_MB})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Do not use the on-disk asset cache")
+    parser.add_argument("--state", metavar="FILE",
+                        help=f"Job state file (default: {JOB_STATE_NAME} in the output directory)")
+    parser.add_argument("--restart", action="store_true",
+                        help="Forget the job state and convert every URL again")
+    parser.add_argument("--skip-failed", action="store_true",
+                        help="Do not retry URLs that failed in an earlier run")
+    return parser.parse_args()
+
+
 def main():
-    if sync_playwright is None:
+    args = parse_args()
+
+    if async_playwright is None:
         print(col("  ✗ Playwright no está instalado.", C.RED))
         print("  Instala dependencias con:")
         print("    pip install -r requirements.txt")
@@ -420,69 +1144,74 @@ def main():
 
     banner()
 
-    # 1. Interactive setup
-    input_file = ask_input_file()
-    output_dir = ask_output_dir()
+    # 1. Setup: command-line arguments, or interactive prompts
+    if args.urls_file:
+        input_file = args.urls_file
+        output_dir = str(Path(args.output_dir or os.getcwd()).expanduser().resolve())
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    else:
+        input_file = ask_input_file()
+        output_dir = ask_output_dir()
 
-    # 2. Read URLs
+    # 2. Read URLs, keep only those not converted in an earlier run
     urls = read_urls(input_file)
-    total = len(urls)
-    print(col(f"  Found {total} URL(s) to process.", C.BLUE))
-    print(col("  Launching headless browser …\n", C.DIM))
-
-    # 3. Launch browser ONCE, reuse across all URLs
-    successes = 0
-    failures: list[tuple[str, str]] = []
-
-    with sync_playwright() as pw:
-        browser: Browser = pw.chromium.launch(headless=True)
-        context = browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
-            viewport={"width": 1280, "height": 900},
-            locale="en-US",
-            bypass_csp=True,  # Bypass Content Security Policy so we can inject CSS/JS
-        )
-
-        for idx, url in enumerate(urls, start=1):
-            label = f"[{idx}/{total}]"
-            print(f"  {col(label, C.BOLD)} {col(url, C.DIM)}")
-
-            page = context.new_page()
-            try:
-                print("         Loading page …")
-                title, pdf_path = convert_url_to_pdf(page, url, output_dir)
-                print(col(f"         ✓ Saved: {pdf_path.name}", C.GREEN))
-                successes += 1
-
-            except Exception as exc:
-                msg = str(exc)
-                # Truncate very long Playwright error messages
-                if len(msg) > 200:
-                    msg = msg[:200] + " …"
-                print(col(f"         ✗ {msg}", C.RED))
-                failures.append((url, msg))
-            finally:
-                page.close()
-
-            print()
-            if idx < total:
-                time.sleep(0.3)
-
-        browser.close()
+    state_path = Path(args.state).expanduser() if args.state else Path(output_dir) / JOB_STATE_NAME
+    if args.restart:
+        state_path.unlink(missing_ok=True)
+    state = JobState(state_path)
+    pending, skipped = state.plan(urls, retry_failed=not args.skip_failed)
+    print(col(f"  Found {len(urls)} URL(s).", C.BLUE))
+    if skipped:
+        reasons = ", ".join(f"{count} {reason}" for reason, count in skipped.items())
+        print(col(f"  Skipping {sum(skipped.values())}: {reasons} (state: {state_path})", C.DIM))
+    if not pending:
+        print(col("  Nothing left to convert. Use --restart to convert everything again.", C.GREEN))
+        print()
+        return
+    total = len(pending)
+    workers = max(1, min(args.workers, total))
+    print(col(f"  {total} URL(s) to process.", C.BLUE))
+    print(col(f"  Launching headless browser ({workers} page(s) in parallel) …\n", C.DIM))
+
+    if args.no_block:
+        blocker = RequestBlocker([], [])  # only counts downloaded bytes
+    else:
+        blocker = RequestBlocker(DEFAULT_BLOCKED_DOMAINS + args.block_domain,
+                                 args.block_types.split(","))
+
+    cache = None
+    if not args.no_cache:
+        cache = AssetCache(Path(args.cache_dir).expanduser(), args.cache_size * 1024 * 1024)
+
+    # 3. One browser and context, a pool of pages working through the list
+    start = time.perf_counter()
+    results = asyncio.run(convert_all(pending, output_dir, workers, args.delay,
+                                      int(args.image_timeout * 1000), blocker, cache, state))
+    elapsed = time.perf_counter() - start
+
+    successes = sum(1 for r in results if r.ok)
+    duplicates = sum(1 for r in results if r.duplicate_of)
+    failures = [(r.url, r.error) for r in results if not r.ok and not r.duplicate_of]
 
     # 4. Summary
+    print()
     print(col("  ── Summary ──────────────────────────────────", C.CYAN))
     print(f"    Total:     {total}")
     print(col(f"    Succeeded: {successes}", C.GREEN))
+    if duplicates:
+        print(col(f"    Duplicate: {duplicates} (redirected to an article already covered)", C.YELLOW))
+    if skipped:
+        print(f"    Skipped:   {sum(skipped.values())} (done or listed twice, see {state_path.name})")
     if failures:
         print(col(f"    Failed:    {len(failures)}", C.RED))
         for furl, reason in failures:
             print(col(f"      • {furl}", C.RED))
             print(col(f"        {reason}", C.DIM))
+    print(f"    Time:      {elapsed:.1f}s ({elapsed / total:.1f}s per URL)")
+    print(f"    Blocked:   {blocker.summary()}")
+    print(f"    Network:   {blocker.downloaded_bytes / 1024 / 1024:.1f} MB downloaded (per Content-Length)")
+    if cache:
+        print(f"    Cache:     {cache.summary()}")
     print()
     print(col("  Done ✓", C.GREEN))
     print()
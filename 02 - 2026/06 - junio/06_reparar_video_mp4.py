@@ -6,17 +6,23 @@ Usa untrunc y ffmpeg. Compatible con Windows, macOS y Linux.
 
 from __future__ import annotations
 
+import hashlib
 import json
+import mmap
 import os
 import platform
+import queue
 import shutil
 import struct
 import subprocess
 import sys
+import threading
 import time
 import urllib.error
 import urllib.request
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
 
 # -----------------------------------------------------------------------------
@@ -51,8 +57,38 @@ UNTRUNC_RETRY_PATTERNS = (
     "unable to find",
 )
 
+# Cajas ISO-BMFF (MP4/MOV) que contienen otras cajas y se recorren por dentro
+MP4_CONTAINER_BOXES = {"moov", "trak", "mdia", "minf", "stbl", "edts", "dinf", "mvex", "moof", "traf"}
+MP4_MAX_DEPTH = 8
+MATROSKA_MAGIC = b"\x1a\x45\xdf\xa3"
+ZERO_PROBE_SIZE = 4096
+
+# Vigilancia del remux con ffmpeg (-progress): se aborta una estrategia que
+# no avanza o que produce demasiados errores por segundo de video recuperado
+FFMPEG_STALL_SECONDS = 30
+FFMPEG_MIN_ERRORS = 200
+FFMPEG_MAX_ERRORS_PER_SECOND = 50
+# ffmpeg corre con -loglevel level+warning: cada linea lleva su nivel
+# ("[h264 @ 0x...] [error] ...") y solo cuentan los niveles de error. Las
+# correcciones de DTS que hace -c copy se avisan una vez por paquete y no son
+# danos del video, asi que no entran en la cuenta
+FFMPEG_LOG_LEVEL = "level+warning"
+FFMPEG_ERROR_LEVELS = ("[error]", "[fatal]", "[panic]")
+FFMPEG_DTS_FIXUP_PATTERNS = (
+    "non-monotonous dts",
+    "non monotonically increasing dts",
+)
+
+REPAIRED_SUFFIXES = ("_fixed", "_remux")
+BATCH_DEFAULT_JOBS = max(1, min(4, (os.cpu_count() or 2) // 2))
+BATCH_REPORT_PREFIX = "reparacion_lote_"
+
+HASH_BUFFER_SIZE = 1024 * 1024
+VERIFY_SUFFIX = ".verificacion.json"
+
 CONFIG_DIR = Path.home() / ".video_repair"
 CONFIG_FILE = CONFIG_DIR / "config.json"
+REFERENCES_FILE = CONFIG_DIR / "referencias.json"
 TOOLS_DIR = CONFIG_DIR / "tools"
 
 # -----------------------------------------------------------------------------
@@ -161,6 +197,16 @@ def find_ffmpeg() -> str | None:
     return None
 
 
+def find_ffprobe(ffmpeg: str | None = None) -> str | None:
+    """ffprobe suele instalarse junto a ffmpeg; se busca primero en esa carpeta."""
+    if ffmpeg:
+        name = "ffprobe.exe" if platform.system() == "Windows" else "ffprobe"
+        sibling = Path(ffmpeg).with_name(name)
+        if sibling.is_file():
+            return str(sibling)
+    return shutil.which("ffprobe")
+
+
 def find_brew() -> str | None:
     return shutil.which("brew")
 
@@ -226,10 +272,22 @@ def run_command(
     return subprocess.run(cmd, check=check, **kwargs)
 
 
-def run_command_live(cmd: list[str], *, cwd: str | None = None) -> tuple[int, str]:
-    """Ejecuta un comando mostrando salida en vivo. Retorna (codigo, salida_completa)."""
-    print_info(f"Ejecutando: {' '.join(cmd)}")
-    print("-" * 72)
+def run_command_live(
+    cmd: list[str],
+    *,
+    cwd: str | None = None,
+    echo: bool = True,
+    stop_patterns: tuple[str, ...] = (),
+) -> tuple[int, str]:
+    """
+    Ejecuta un comando mostrando salida en vivo. Retorna (codigo, salida_completa).
+    Con echo=False solo captura la salida (modo lote, varios procesos a la vez).
+    Si una linea contiene alguno de stop_patterns, el proceso se detiene en
+    ese momento: el intento ya esta condenado y no vale la pena esperarlo.
+    """
+    if echo:
+        print_info(f"Ejecutando: {' '.join(cmd)}")
+        print("-" * 72)
 
     output_lines: list[str] = []
     proc = subprocess.Popen(
@@ -246,28 +304,132 @@ def run_command_live(cmd: list[str], *, cwd: str | None = None) -> tuple[int, st
     for line in proc.stdout:
         line = line.rstrip("\n\r")
         output_lines.append(line)
-        print(line)
-
+        if echo:
+            print(line)
+        lowered = line.lower()
+        matched = next((pattern for pattern in stop_patterns if pattern in lowered), None)
+        if matched:
+            proc.kill()
+            if echo:
+                print_warn(f"Patron de fallo detectado ('{matched}'): se detiene el proceso.")
+            break
+
+    proc.stdout.close()
     proc.wait()
-    print("-" * 72)
+    if echo:
+        print("-" * 72)
     return proc.returncode or 0, "\n".join(output_lines)
 
 
 # -----------------------------------------------------------------------------
-# Instalacion de dependencias
+# Hashes y verificacion de resultados
 # -----------------------------------------------------------------------------
 
 
-def sha256_file(path: Path) -> str:
-    import hashlib
-
+def sha256_file(path: Path, *, buffer: bytearray | None = None) -> str:
+    """
+    SHA-256 leyendo con readinto sobre un unico buffer reutilizado: no se
+    crea un objeto bytes por bloque, asi que un archivo de varios GB se
+    recorre a la velocidad del disco con memoria constante.
+    """
     digest = hashlib.sha256()
-    with path.open("rb") as fh:
-        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
-            digest.update(chunk)
+    view = memoryview(buffer if buffer is not None else bytearray(HASH_BUFFER_SIZE))
+    with path.open("rb", buffering=0) as fh:
+        while True:
+            size = fh.readinto(view)
+            if not size:
+                break
+            digest.update(view[:size])
     return digest.hexdigest()
 
 
+def sha256_files(paths: list[Path], *, workers: int | None = None) -> dict[Path, str]:
+    """
+    Hashea varios archivos en paralelo con hilos (hashlib libera el GIL
+    mientras calcula). Cada hilo usa su propio buffer.
+    """
+    if not paths:
+        return {}
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(paths, pool.map(sha256_file, paths)))
+
+
+def probe_duration(ffprobe: str | None, path: Path) -> float | None:
+    """Duracion en segundos segun ffprobe, o None si no se puede leer."""
+    if not ffprobe:
+        return None
+    try:
+        result = run_command(
+            [ffprobe, "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1", str(path)],
+            capture=True,
+        )
+        return round(float(result.stdout.strip().splitlines()[0]), 3)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def verification_path(output: Path) -> Path:
+    return output.with_name(output.name + VERIFY_SUFFIX)
+
+
+def write_verification_record(
+    output: Path, source: Path, method: str, ffprobe: str | None
+) -> dict:
+    """
+    Guarda junto al video reparado un registro con tamano, SHA-256 y
+    duracion del resultado y del archivo de origen. Ambos hashes se
+    calculan a la vez.
+    """
+    hashes = sha256_files([output, source])
+    record = {
+        "archivo": str(output),
+        "metodo": method,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "tamano": output.stat().st_size,
+        "sha256": hashes[output],
+        "duracion": probe_duration(ffprobe, output),
+        "origen": {
+            "archivo": str(source),
+            "tamano": source.stat().st_size,
+            "sha256": hashes[source],
+            "duracion": probe_duration(ffprobe, source),
+        },
+    }
+    with verification_path(output).open("w", encoding="utf-8") as fh:
+        json.dump(record, fh, indent=2, ensure_ascii=False)
+    return record
+
+
+def check_verification_record(output: Path) -> bool:
+    """Recalcula tamano y SHA-256 del video y los compara con su registro."""
+    record_path = verification_path(output)
+    try:
+        with record_path.open("r", encoding="utf-8") as fh:
+            record = json.load(fh)
+    except (json.JSONDecodeError, OSError) as exc:
+        print_err(f"No se pudo leer el registro {record_path}: {exc}")
+        return False
+
+    if not output.is_file():
+        print_err(f"No existe el archivo: {output}")
+        return False
+    if output.stat().st_size != record["tamano"]:
+        print_err(f"Tamano distinto: {output.stat().st_size} bytes (registro: {record['tamano']})")
+        return False
+    if sha256_file(output) != record["sha256"]:
+        print_err("El SHA-256 no coincide con el registro: el archivo cambio o esta danado.")
+        return False
+    print_ok(f"Verificado: {output.name} (sha256 {record['sha256'][:16]}...)")
+    return True
+
+
+# -----------------------------------------------------------------------------
+# Instalacion de dependencias
+# -----------------------------------------------------------------------------
+
+
 def download_file(url: str, dest: Path) -> None:
     dest.parent.mkdir(parents=True, exist_ok=True)
     req = urllib.request.Request(url, headers={"User-Agent": APP_NAME})
@@ -570,6 +732,363 @@ def default_output_path(corrupt: Path, suffix: str) -> Path:
     return corrupt.with_name(f"{corrupt.stem}_{suffix}{corrupt.suffix}")
 
 
+# -----------------------------------------------------------------------------
+# Analisis de la estructura MP4 (ISO-BMFF)
+# -----------------------------------------------------------------------------
+
+
+class HeaderReader:
+    """
+    Lectura de rangos pequenos de un archivo mapeado en memoria: solo se
+    cargan del disco las paginas que se tocan, no el archivo entero.
+    Cuenta los bytes leidos para mostrar el costo del analisis.
+    """
+
+    def __init__(self, fh) -> None:
+        self.size = os.fstat(fh.fileno()).st_size
+        self.bytes_read = 0
+        self._fh = fh
+        self._map = None
+        if self.size:
+            try:
+                self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError, OverflowError):
+                self._map = None  # p. ej. Python de 32 bits con archivos > 2 GB
+
+    def read(self, offset: int, length: int) -> bytes:
+        end = min(offset + length, self.size)
+        if offset >= end:
+            return b""
+        if self._map is not None:
+            data = self._map[offset:end]
+        else:
+            self._fh.seek(offset)
+            data = self._fh.read(end - offset)
+        self.bytes_read += len(data)
+        return data
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+
+
+def is_box_type(kind: bytes) -> bool:
+    return len(kind) == 4 and all(0x20 <= b <= 0x7E for b in kind)
+
+
+def walk_boxes(reader: HeaderReader, start: int, end: int, depth: int = 0) -> list[dict]:
+    """
+    Recorre las cajas entre start y end leyendo solo sus cabeceras (8 o 16
+    bytes). Una caja cuyo tamano declarado pasa del final del archivo se
+    marca como truncada; una cabecera ilegible detiene el recorrido.
+    """
+    boxes: list[dict] = []
+    offset = start
+    while offset + 8 <= end:
+        header = reader.read(offset, 16)
+        size, kind = struct.unpack_from(">I4s", header)
+        header_size = 8
+        if size == 1:
+            if len(header) < 16:
+                break
+            size = struct.unpack_from(">Q", header, 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = reader.size - offset  # la caja llega hasta el final del archivo
+
+        if not is_box_type(kind) or size < header_size:
+            boxes.append({"type": None, "offset": offset, "size": 0, "header": 0,
+                          "end": offset, "truncated": False, "children": []})
+            break
+
+        box = {
+            "type": kind.decode("ascii"),
+            "offset": offset,
+            "size": size,
+            "header": header_size,
+            "end": offset + size,
+            "truncated": offset + size > reader.size,
+            "children": [],
+        }
+        if box["type"] in MP4_CONTAINER_BOXES and depth < MP4_MAX_DEPTH:
+            box["children"] = walk_boxes(
+                reader, offset + header_size, min(box["end"], reader.size), depth + 1
+            )
+        boxes.append(box)
+        offset += size
+    return boxes
+
+
+def find_box(boxes: list[dict], *path: str) -> dict | None:
+    """Primera caja que sigue la ruta de tipos, p. ej. find_box(trak, "mdia", "hdlr")."""
+    current = None
+    for kind in path:
+        current = next((b for b in boxes if b["type"] == kind), None)
+        if current is None:
+            return None
+        boxes = current["children"]
+    return current
+
+
+def describe_track(reader: HeaderReader, trak: dict) -> dict:
+    """Tipo de pista (vide, soun, ...) y codec (avc1, hvc1, mp4a, ...) de un trak."""
+    track = {"tipo": None, "codec": None, "completa": not trak["truncated"]}
+    children = trak["children"]
+    hdlr = find_box(children, "mdia", "hdlr")
+    if hdlr:
+        # version/flags (4) + pre_defined (4) + handler_type (4)
+        data = reader.read(hdlr["offset"] + hdlr["header"] + 8, 4)
+        if is_box_type(data):
+            track["tipo"] = data.decode("ascii")
+    stsd = find_box(children, "mdia", "minf", "stbl", "stsd")
+    if stsd:
+        # version/flags (4) + entry_count (4) + primera entrada: tamano (4) + formato (4)
+        data = reader.read(stsd["offset"] + stsd["header"] + 12, 4)
+        if is_box_type(data):
+            track["codec"] = data.decode("ascii")
+    has_index = all(
+        find_box(children, "mdia", "minf", "stbl", kind) or find_box(children, "mdia", "minf", "stbl", alt)
+        for kind, alt in (("stsz", "stz2"), ("stco", "co64"))
+    )
+    track["completa"] = track["completa"] and has_index
+    return track
+
+
+def find_data_end(reader: HeaderReader, start: int) -> int:
+    """
+    Fin real de los datos a partir de start: descarta el relleno de ceros
+    que dejan algunas camaras al preasignar el archivo. Busqueda binaria
+    con bloques de 4 KB (el video comprimido nunca trae un bloque entero de
+    ceros, el relleno si): unas decenas de lecturas aunque el relleno
+    ocupe varios GB.
+    """
+    low, high = start, reader.size
+    while high - low > ZERO_PROBE_SIZE:
+        middle = low + (high - low) // 2
+        if reader.read(middle, ZERO_PROBE_SIZE).strip(b"\0"):
+            low = middle
+        else:
+            high = middle
+    return low + len(reader.read(low, high - low).rstrip(b"\0"))
+
+
+def diagnose_video(path: Path) -> dict:
+    """
+    Analiza la estructura del contenedor sin leer los datos de video y
+    decide la reparacion mas barata:
+
+    - "remux": el indice (moov) esta completo, o el archivo es fragmentado
+      o Matroska; ffmpeg puede copiar los flujos que existan.
+    - "untrunc": falta el moov, esta cortado o no hay estructura MP4
+      reconocible; hace falta reconstruirlo con un video de referencia.
+    """
+    diagnosis: dict = {
+        "archivo": str(path),
+        "tamano": 0,
+        "formato": "desconocido",
+        "cajas": [],
+        "moov": "ausente",
+        "pistas": [],
+        "mdat": None,
+        "fragmentado": False,
+        "fin_datos": 0,
+        "basura_desde": None,
+        "estrategia": "untrunc",
+        "motivo": "",
+        "bytes_leidos": 0,
+    }
+    with path.open("rb") as fh:
+        reader = HeaderReader(fh)
+        try:
+            diagnosis["tamano"] = reader.size
+            if reader.read(0, 4) == MATROSKA_MAGIC:
+                diagnosis["formato"] = "matroska"
+                diagnosis["fin_datos"] = reader.size
+                diagnosis["estrategia"] = "remux"
+                diagnosis["motivo"] = "Archivo Matroska: untrunc solo repara MP4/MOV."
+                return diagnosis
+
+            boxes = walk_boxes(reader, 0, reader.size)
+            valid = [b for b in boxes if b["type"]]
+            diagnosis["cajas"] = [
+                {"tipo": b["type"], "offset": b["offset"], "tamano": b["size"], "truncada": b["truncated"]}
+                for b in valid
+            ]
+            if boxes and boxes[-1]["type"] is None:
+                diagnosis["basura_desde"] = boxes[-1]["offset"]
+            if valid and valid[0]["type"] in ("ftyp", "moov", "mdat", "free", "wide", "skip"):
+                diagnosis["formato"] = "iso-bmff"
+
+            moov = find_box(valid, "moov")
+            if moov:
+                diagnosis["pistas"] = [
+                    describe_track(reader, trak) for trak in moov["children"] if trak["type"] == "trak"
+                ]
+                complete = (not moov["truncated"] and diagnosis["pistas"]
+                            and all(t["completa"] for t in diagnosis["pistas"]))
+                diagnosis["moov"] = "completo" if complete else "truncado"
+            diagnosis["fragmentado"] = any(b["type"] == "moof" for b in valid)
+
+            mdat = find_box(valid, "mdat")
+            last = valid[-1] if valid else None
+            if last and last["type"] == "mdat":
+                # Grabacion cortada: los datos pueden terminar antes que el archivo
+                diagnosis["fin_datos"] = find_data_end(reader, last["offset"] + last["header"])
+            else:
+                diagnosis["fin_datos"] = diagnosis["basura_desde"] or reader.size
+            if mdat:
+                data_start = mdat["offset"] + mdat["header"]
+                diagnosis["mdat"] = {
+                    "offset": mdat["offset"],
+                    "datos_desde": data_start,
+                    "tamano_declarado": mdat["size"],
+                    "disponible": max(0, min(mdat["end"], diagnosis["fin_datos"]) - data_start),
+                    "truncado": mdat["truncated"],
+                }
+        finally:
+            diagnosis["bytes_leidos"] = reader.bytes_read
+            reader.close()
+
+    if diagnosis["formato"] != "iso-bmff":
+        diagnosis["motivo"] = "No se reconoce una estructura MP4 al inicio del archivo."
+    elif diagnosis["moov"] == "completo":
+        diagnosis["estrategia"] = "remux"
+        diagnosis["motivo"] = "El indice (moov) esta completo; basta con copiar los flujos."
+        if diagnosis["mdat"] and diagnosis["mdat"]["truncado"]:
+            diagnosis["motivo"] += " Los datos (mdat) estan cortados: se perdera el final."
+    elif diagnosis["fragmentado"]:
+        diagnosis["estrategia"] = "remux"
+        diagnosis["motivo"] = "MP4 fragmentado: cada fragmento (moof) trae su propio indice."
+    elif diagnosis["moov"] == "truncado":
+        diagnosis["motivo"] = "El indice (moov) esta cortado o incompleto."
+    else:
+        diagnosis["motivo"] = "Falta el indice (moov): tipico de una grabacion interrumpida."
+    return diagnosis
+
+
+def print_diagnosis(diagnosis: dict) -> None:
+    print_info(f"Estructura: {diagnosis['formato']}, {diagnosis['tamano'] / (1024 * 1024):.2f} MB")
+    if diagnosis["cajas"]:
+        boxes = ", ".join(
+            b["tipo"] + (" (truncada)" if b["truncada"] else "") for b in diagnosis["cajas"][:12]
+        )
+        print(f"  Cajas: {boxes}")
+    print(f"  moov: {diagnosis['moov']}")
+    for track in diagnosis["pistas"]:
+        print(f"    pista {track['tipo'] or '?'} codec={track['codec'] or '?'}"
+              + ("" if track["completa"] else " (incompleta)"))
+    mdat = diagnosis["mdat"]
+    if mdat:
+        missing = mdat["offset"] + mdat["tamano_declarado"] - diagnosis["tamano"]
+        print(f"  mdat: {mdat['disponible'] / (1024 * 1024):.2f} MB de datos desde el byte {mdat['datos_desde']}"
+              + (f", faltan {missing / (1024 * 1024):.2f} MB" if mdat["truncado"] else ""))
+    if diagnosis["fin_datos"] < diagnosis["tamano"]:
+        print(f"  Fin real de los datos: byte {diagnosis['fin_datos']}"
+              f" ({(diagnosis['tamano'] - diagnosis['fin_datos']) / (1024 * 1024):.2f} MB de relleno o basura)")
+    print(f"  Bytes leidos para el analisis: {diagnosis['bytes_leidos']}")
+    print_info(f"Estrategia: {diagnosis['estrategia']}. {diagnosis['motivo']}")
+
+
+# -----------------------------------------------------------------------------
+# Perfil de la referencia (cache)
+# -----------------------------------------------------------------------------
+
+
+def load_reference_profiles() -> dict:
+    data = {"perfiles": {}, "rutas": {}}
+    try:
+        with REFERENCES_FILE.open("r", encoding="utf-8") as fh:
+            data.update(json.load(fh))
+    except (json.JSONDecodeError, OSError):
+        pass
+    return data
+
+
+def save_reference_profiles(data: dict) -> None:
+    # Temporal + os.replace: una ejecucion interrumpida no deja el JSON a medias
+    tmp = REFERENCES_FILE.with_name(f"{REFERENCES_FILE.name}.{os.getpid()}.tmp")
+    try:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=2)
+        os.replace(tmp, REFERENCES_FILE)
+    except OSError:
+        pass  # sin cache la proxima ejecucion vuelve a analizar la referencia
+
+
+def reference_profile(reference: Path) -> tuple[dict, bool]:
+    """
+    Codecs y pistas de la referencia, analizados una sola vez y guardados
+    por SHA-256. Si la ruta, el tamano y la fecha no cambiaron ni siquiera
+    se vuelve a calcular el hash. Retorna (perfil, venia_de_la_cache).
+    """
+    data = load_reference_profiles()
+    stat = reference.stat()
+    known = data["rutas"].get(str(reference))
+    if (known and known["tamano"] == stat.st_size and known["mtime"] == stat.st_mtime
+            and known["sha256"] in data["perfiles"]):
+        return data["perfiles"][known["sha256"]], True
+
+    digest = sha256_file(reference)
+    profile = data["perfiles"].get(digest)
+    cached = profile is not None
+    if profile is None:
+        diagnosis = diagnose_video(reference)
+        profile = {
+            "sha256": digest,
+            "tamano": stat.st_size,
+            "moov": diagnosis["moov"],
+            "pistas": diagnosis["pistas"],
+            "necesita_s": False,
+            "analizado": datetime.now().isoformat(timespec="seconds"),
+        }
+        data["perfiles"][digest] = profile
+    data["rutas"][str(reference)] = {"tamano": stat.st_size, "mtime": stat.st_mtime, "sha256": digest}
+    save_reference_profiles(data)
+    return profile, cached
+
+
+def update_reference_profile(profile: dict) -> None:
+    data = load_reference_profiles()
+    data["perfiles"][profile["sha256"]] = profile
+    save_reference_profiles(data)
+
+
+def describe_profile(profile: dict) -> str:
+    tracks = ", ".join(f"{t['tipo'] or '?'} {t['codec'] or '?'}" for t in profile["pistas"]) or "sin pistas"
+    return f"{tracks}; moov {profile['moov']}" + ("; suele necesitar -s" if profile["necesita_s"] else "")
+
+
+def reference_mismatch(diagnosis: dict, profile: dict) -> str | None:
+    """Aviso si el moov parcial del archivo danado usa codecs que la referencia no tiene."""
+    reference_codecs = {t["codec"] for t in profile["pistas"] if t["codec"]}
+    own_codecs = {t["codec"] for t in diagnosis.get("pistas", []) if t["codec"]}
+    extra = own_codecs - reference_codecs
+    if reference_codecs and extra:
+        return (f"Codecs distintos a la referencia ({', '.join(sorted(extra))} frente a "
+                f"{', '.join(sorted(reference_codecs))}).")
+    return None
+
+
+def skip_outcome(attempts: list[dict]) -> bool | None:
+    """
+    True si untrunc solo funciono con -s, False si solo funciono sin -s y
+    None si los intentos no permiten saberlo. No modifica el perfil: en un
+    lote los resultados se aplican juntos al terminar (learn_skip_preference).
+    """
+    untrunc_attempts = [a for a in attempts if a["metodo"].startswith("untrunc")]
+    if len(untrunc_attempts) >= 2 and untrunc_attempts[-1]["ok"] and not untrunc_attempts[0]["ok"]:
+        return untrunc_attempts[-1]["metodo"] == "untrunc -s"
+    return None
+
+
+def learn_skip_preference(profile: dict, outcomes: list[bool | None]) -> None:
+    """Recuerda si untrunc suele necesitar -s con esta referencia (mayoria de los casos conocidos)."""
+    known = [outcome for outcome in outcomes if outcome is not None]
+    if known:
+        profile["necesita_s"] = known.count(True) * 2 > len(known)
+
+
 # -----------------------------------------------------------------------------
 # Logica de reparacion
 # -----------------------------------------------------------------------------
@@ -588,31 +1107,179 @@ def build_untrunc_cmd(untrunc: str, reference: Path, corrupt: Path, *, skip_unkn
     return cmd
 
 
-def run_untrunc_repair(untrunc: str, reference: Path, corrupt: Path) -> tuple[bool, Path | None, str]:
-    expected = default_output_path(corrupt, "fixed")
+def repair_steps(strategy: str) -> list[str]:
+    """Orden de los pasos segun el diagnostico; el segundo es el respaldo."""
+    return ["untrunc", "remux"] if strategy == "untrunc" else ["remux", "untrunc"]
 
-    code, output = run_command_live(build_untrunc_cmd(untrunc, reference, corrupt, skip_unknown=False))
 
-    success = code == 0 and expected.is_file()
-    if success and not output_indicates_retry(output):
-        return True, expected, output
+def record_attempt(
+    attempts: list[dict] | None, method: str, code: int, ok: bool, start: float, **details
+) -> None:
+    if attempts is not None:
+        attempts.append({
+            "metodo": method,
+            "codigo": code,
+            "ok": ok,
+            "segundos": round(time.monotonic() - start, 2),
+            **details,
+        })
 
-    needs_retry = (not success) or output_indicates_retry(output)
-    if needs_retry:
-        print_warn("Reintentando untrunc con bandera -s (omitir secuencias desconocidas)...")
-        code2, output2 = run_command_live(
-            build_untrunc_cmd(untrunc, reference, corrupt, skip_unknown=True)
+
+def run_untrunc_repair(
+    untrunc: str,
+    reference: Path,
+    corrupt: Path,
+    *,
+    echo: bool = True,
+    attempts: list[dict] | None = None,
+    prefer_skip: bool = False,
+) -> tuple[bool, Path | None, str]:
+    """
+    Ejecuta untrunc y, si falla o avisa de errores estructurales, lo repite
+    con -s. Un intento sin -s se corta en cuanto aparece uno de
+    UNTRUNC_RETRY_PATTERNS. Con prefer_skip (la referencia ya necesito -s
+    en otros archivos) se empieza directamente con -s.
+    """
+    expected = default_output_path(corrupt, "fixed")
+    order = (True, False) if prefer_skip else (False, True)
+
+    outputs: list[str] = []
+    for number, skip_unknown in enumerate(order):
+        if number and echo:
+            if skip_unknown:
+                print_warn("Reintentando untrunc con bandera -s (omitir secuencias desconocidas)...")
+            else:
+                print_warn("Reintentando untrunc sin la bandera -s...")
+        start = time.monotonic()
+        code, output = run_command_live(
+            build_untrunc_cmd(untrunc, reference, corrupt, skip_unknown=skip_unknown),
+            echo=echo,
+            stop_patterns=() if skip_unknown else UNTRUNC_RETRY_PATTERNS,
         )
-        combined = output + "\n" + output2
-        if code2 == 0 and expected.is_file():
-            return True, expected, combined
-        return False, expected if expected.is_file() else None, combined
+        outputs.append(output)
+        ok = code == 0 and expected.is_file() and (skip_unknown or not output_indicates_retry(output))
+        record_attempt(attempts, "untrunc -s" if skip_unknown else "untrunc", code, ok, start)
+        if ok:
+            return True, expected, "\n".join(outputs)
+
+    return False, expected if expected.is_file() else None, "\n".join(outputs)
+
+
+def is_ffmpeg_error(line: str) -> bool:
+    lowered = line.lower()
+    if not any(level in lowered for level in FFMPEG_ERROR_LEVELS):
+        return False
+    return not any(pattern in lowered for pattern in FFMPEG_DTS_FIXUP_PATTERNS)
+
+
+def _pump_lines(stream, name: str, lines: queue.Queue) -> None:
+    for line in stream:
+        lines.put((name, line.rstrip("\n\r")))
+    lines.put((name, None))
 
-    return False, None, output
 
+def run_ffmpeg_monitored(
+    cmd: list[str],
+    *,
+    echo: bool = True,
+    stall_seconds: float = FFMPEG_STALL_SECONDS,
+) -> dict:
+    """
+    Ejecuta ffmpeg con -progress en stdout y lee a la vez el progreso y
+    stderr. Detiene el proceso si el tiempo de salida y los bytes escritos
+    no avanzan durante stall_seconds, o si hay mas de
+    FFMPEG_MAX_ERRORS_PER_SECOND lineas de nivel error por segundo de video
+    recuperado (a partir de FFMPEG_MIN_ERRORS errores; ver is_ffmpeg_error).
+    """
+    full_cmd = ([cmd[0], "-loglevel", FFMPEG_LOG_LEVEL] + cmd[1:-1]
+                + ["-progress", "pipe:1", "-nostats", cmd[-1]])
+    if echo:
+        print_info(f"Ejecutando: {' '.join(full_cmd)}")
+        print("-" * 72)
 
-def run_ffmpeg_remux(ffmpeg: str, corrupt: Path) -> tuple[bool, Path | None, str]:
+    proc = subprocess.Popen(
+        full_cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    assert proc.stdout is not None and proc.stderr is not None
+    lines: queue.Queue = queue.Queue()
+    for stream, name in ((proc.stdout, "progreso"), (proc.stderr, "stderr")):
+        threading.Thread(target=_pump_lines, args=(stream, name, lines), daemon=True).start()
+
+    output_lines: list[str] = []
+    errors = 0
+    out_seconds = 0.0
+    written = 0
+    aborted = None
+    open_streams = 2
+    last_advance = time.monotonic()
+    last_report = last_advance
+
+    while open_streams:
+        try:
+            name, line = lines.get(timeout=1.0)
+        except queue.Empty:
+            name, line = None, None
+        now = time.monotonic()
+
+        if name and line is None:
+            open_streams -= 1
+        elif name == "stderr":
+            output_lines.append(line)
+            if echo:
+                print(line)
+            if is_ffmpeg_error(line):
+                errors += 1
+        elif name == "progreso" and "=" in line:
+            key, _, value = line.partition("=")
+            if key in ("out_time_us", "out_time_ms") and value.strip().isdigit():
+                seconds = int(value) / 1_000_000  # out_time_ms tambien viene en microsegundos
+                if seconds > out_seconds:
+                    out_seconds, last_advance = seconds, now
+            elif key == "total_size" and value.strip().isdigit():
+                if int(value) > written:
+                    written, last_advance = int(value), now
+            elif key == "progress" and echo and now - last_report >= 5:
+                last_report = now
+                print_info(f"Recuperado: {out_seconds:.1f} s de video, {written / (1024 * 1024):.1f} MB")
+
+        if aborted is None:
+            if now - last_advance > stall_seconds:
+                aborted = f"sin progreso durante {stall_seconds:.0f} s"
+            elif errors >= FFMPEG_MIN_ERRORS and errors / max(out_seconds, 1.0) > FFMPEG_MAX_ERRORS_PER_SECOND:
+                aborted = f"{errors} errores en {out_seconds:.1f} s de video"
+            if aborted:
+                proc.kill()
+                if echo:
+                    print_warn(f"Se detiene ffmpeg: {aborted}.")
+                break  # sin esperar el cierre de las tuberias: la siguiente estrategia empieza ya
+
+    proc.wait()
+    if echo:
+        print("-" * 72)
+    return {
+        "codigo": proc.returncode or 0,
+        "salida": "\n".join(output_lines),
+        "abortado": aborted,
+        "errores": errors,
+        "duracion_recuperada": round(out_seconds, 3),
+    }
+
+
+def run_ffmpeg_remux(
+    ffmpeg: str,
+    corrupt: Path,
+    *,
+    echo: bool = True,
+    attempts: list[dict] | None = None,
+) -> tuple[bool, Path | None, str]:
     out_path = default_output_path(corrupt, "remux")
+    # Sin -movflags +faststart: esa segunda pasada reescribe todo el archivo
+    # al cerrar sin emitir progreso y la vigilancia la tomaria por un bloqueo
     strategies = [
         [
             ffmpeg, "-hide_banner", "-y",
@@ -620,7 +1287,6 @@ def run_ffmpeg_remux(ffmpeg: str, corrupt: Path) -> tuple[bool, Path | None, str
             "-err_detect", "ignore_err",
             "-i", str(corrupt),
             "-c", "copy",
-            "-movflags", "+faststart",
             str(out_path),
         ],
         [
@@ -633,51 +1299,337 @@ def run_ffmpeg_remux(ffmpeg: str, corrupt: Path) -> tuple[bool, Path | None, str
 
     combined_output: list[str] = []
     for idx, cmd in enumerate(strategies, start=1):
-        print_info(f"Estrategia ffmpeg #{idx}...")
-        code, output = run_command_live(cmd)
-        combined_output.append(output)
-        if code == 0 and out_path.is_file() and out_path.stat().st_size > 0:
+        if echo:
+            print_info(f"Estrategia ffmpeg #{idx}...")
+        start = time.monotonic()
+        run = run_ffmpeg_monitored(cmd, echo=echo)
+        combined_output.append(run["salida"])
+        ok = (run["abortado"] is None and run["codigo"] == 0
+              and out_path.is_file() and out_path.stat().st_size > 0)
+        record_attempt(
+            attempts, f"ffmpeg #{idx}", run["codigo"], ok, start,
+            duracion_recuperada=run["duracion_recuperada"],
+            errores=run["errores"],
+            abortado=run["abortado"],
+        )
+        if echo:
+            print_info(f"Duracion recuperada: {run['duracion_recuperada']:.1f} s"
+                       f" ({run['errores']} linea(s) de error)")
+        if ok:
             return True, out_path, "\n".join(combined_output)
 
     return False, None, "\n".join(combined_output)
 
 
+def report_repaired(out_file: Path, corrupt: Path, method: str, ffprobe: str | None) -> None:
+    print_info(f"Tamano: {out_file.stat().st_size / (1024 * 1024):.2f} MB")
+    print_info("Calculando SHA-256 y duracion del resultado...")
+    try:
+        record = write_verification_record(out_file, corrupt, method, ffprobe)
+    except OSError as exc:
+        print_warn(f"No se pudo guardar el registro de verificacion: {exc}")
+        return
+    if record["duracion"] is not None:
+        original = record["origen"]["duracion"]
+        print_info(f"Duracion: {record['duracion']:.1f} s"
+                   + (f" (origen: {original:.1f} s)" if original is not None else ""))
+    print_info(f"SHA-256: {record['sha256']}")
+    print_ok(f"Registro de verificacion: {verification_path(out_file)}")
+
+
 def repair_video(reference: Path, corrupt: Path) -> None:
     ffmpeg, untrunc = ensure_dependencies(interactive=False)
+    ffprobe = find_ffprobe(ffmpeg)
 
     print()
     print_info(f"Referencia: {reference}")
     print_info(f"Corrupto:   {corrupt}")
     print()
 
-    if untrunc:
-        print_info("Paso 1: Reparacion con untrunc")
-        ok, out_file, log = run_untrunc_repair(untrunc, reference, corrupt)
-        if ok and out_file:
-            print_ok(f"Video reparado con untrunc: {out_file}")
-            print_info(f"Tamano: {out_file.stat().st_size / (1024 * 1024):.2f} MB")
-            return
-        print_warn("untrunc no pudo reparar el archivo completamente.")
-        if out_file and out_file.is_file():
-            print_info(f"Se genero un archivo parcial: {out_file}")
-    else:
-        print_warn("untrunc no disponible. Se omitira la reparacion estructural.")
+    # El analisis solo lee cabeceras: decide el orden de los pasos
+    profile = None
+    try:
+        diagnosis = diagnose_video(corrupt)
+        print_diagnosis(diagnosis)
+        profile, _ = reference_profile(reference)
+        print_info(f"Referencia: {describe_profile(profile)}")
+        if profile["moov"] != "completo":
+            print_warn("La referencia tampoco tiene un indice (moov) completo; untrunc puede fallar.")
+        mismatch = reference_mismatch(diagnosis, profile)
+        if mismatch:
+            print_warn(mismatch + " Se intenta primero el remux.")
+            diagnosis["estrategia"] = "remux"
+    except OSError as exc:
+        print_warn(f"No se pudo analizar la estructura: {exc}")
+        diagnosis = {"estrategia": "untrunc"}
+    print()
 
-    if ffmpeg:
-        print()
-        print_info("Paso 2: Respaldo con ffmpeg (remux / copia de flujo)")
-        ok, out_file, _ = run_ffmpeg_remux(ffmpeg, corrupt)
-        if ok and out_file:
-            print_ok(f"Remux completado: {out_file}")
-            print_info(f"Tamano: {out_file.stat().st_size / (1024 * 1024):.2f} MB")
-            return
-        print_err("ffmpeg tampoco pudo recuperar el video.")
-    else:
-        print_err("ffmpeg no disponible. No hay mas opciones de respaldo.")
+    for number, step in enumerate(repair_steps(diagnosis["estrategia"]), start=1):
+        if number > 1:
+            print()
+        if step == "untrunc":
+            if not untrunc:
+                print_warn("untrunc no disponible. Se omitira la reparacion estructural.")
+                continue
+            print_info(f"Paso {number}: Reparacion con untrunc")
+            attempts: list[dict] = []
+            ok, out_file, log = run_untrunc_repair(
+                untrunc, reference, corrupt, attempts=attempts,
+                prefer_skip=bool(profile and profile["necesita_s"]),
+            )
+            if profile:
+                learn_skip_preference(profile, [skip_outcome(attempts)])
+                update_reference_profile(profile)
+            if ok and out_file:
+                print_ok(f"Video reparado con untrunc: {out_file}")
+                report_repaired(out_file, corrupt, attempts[-1]["metodo"], ffprobe)
+                return
+            print_warn("untrunc no pudo reparar el archivo completamente.")
+            if out_file and out_file.is_file():
+                print_info(f"Se genero un archivo parcial: {out_file}")
+        else:
+            if not ffmpeg:
+                print_err("ffmpeg no disponible. Se omitira el remux.")
+                continue
+            print_info(f"Paso {number}: ffmpeg (remux / copia de flujo)")
+            ok, out_file, _ = run_ffmpeg_remux(ffmpeg, corrupt)
+            if ok and out_file:
+                print_ok(f"Remux completado: {out_file}")
+                report_repaired(out_file, corrupt, "ffmpeg-remux", ffprobe)
+                return
+            print_warn("ffmpeg no pudo recuperar el video.")
 
     print_err("La reparacion fallo. Verifica que el video de referencia sea del mismo dispositivo/formato.")
 
 
+# -----------------------------------------------------------------------------
+# Reparacion por lotes
+# -----------------------------------------------------------------------------
+
+
+def collect_batch_files(folder: Path, reference: Path) -> list[Path]:
+    """Videos de la carpeta, sin la referencia ni resultados de reparaciones anteriores."""
+    files = []
+    for path in sorted(folder.iterdir()):
+        if not is_video_file(path) or path.resolve() == reference.resolve():
+            continue
+        if path.stem.endswith(REPAIRED_SUFFIXES):
+            continue
+        files.append(path)
+    return files
+
+
+def repair_batch_item(
+    reference: Path,
+    corrupt: Path,
+    ffmpeg: str | None,
+    untrunc: str | None,
+    ffprobe: str | None,
+    profile: dict | None = None,
+) -> dict:
+    """
+    Repara un archivo sin escribir en la consola (corre en paralelo con
+    otros) y devuelve el resultado con cada intento y su metodo. El perfil
+    de la referencia se comparte entre todos los archivos del lote y aqui
+    solo se lee; lo aprendido sobre -s queda en result["necesita_s"].
+    """
+    start = time.monotonic()
+    result: dict = {
+        "archivo": str(corrupt),
+        "estado": "fallido",
+        "estrategia": "untrunc",
+        "motivo": "",
+        "metodo": None,
+        "salida": None,
+        "intentos": [],
+        "segundos": 0.0,
+        "tamano": None,
+        "duracion": None,
+        "sha256": None,
+        "error": "",
+        "necesita_s": None,
+    }
+    try:
+        diagnosis = diagnose_video(corrupt)
+        result["estrategia"] = diagnosis["estrategia"]
+        result["motivo"] = diagnosis["motivo"]
+        mismatch = reference_mismatch(diagnosis, profile) if profile else None
+        if mismatch:
+            result["estrategia"] = "remux"
+            result["motivo"] = mismatch + " untrunc queda como respaldo."
+    except OSError as exc:
+        result["motivo"] = f"Sin diagnostico: {exc}"
+
+    try:
+        for step in repair_steps(result["estrategia"]):
+            if step == "untrunc" and untrunc:
+                ok, out_file, log = run_untrunc_repair(
+                    untrunc, reference, corrupt, echo=False, attempts=result["intentos"],
+                    prefer_skip=bool(profile and profile["necesita_s"]),
+                )
+                result["necesita_s"] = skip_outcome(result["intentos"])
+            elif step == "remux" and ffmpeg:
+                ok, out_file, log = run_ffmpeg_remux(
+                    ffmpeg, corrupt, echo=False, attempts=result["intentos"]
+                )
+            else:
+                continue
+            if ok and out_file:
+                result["estado"] = "reparado"
+                result["metodo"] = result["intentos"][-1]["metodo"]
+                result["salida"] = str(out_file)
+                result["error"] = ""
+                record = write_verification_record(out_file, corrupt, result["metodo"], ffprobe)
+                result["tamano"] = record["tamano"]
+                result["duracion"] = record["duracion"]
+                result["sha256"] = record["sha256"]
+                break
+            last = result["intentos"][-1] if result["intentos"] else {}
+            lines = [line for line in log.splitlines() if line.strip()]
+            if last.get("abortado"):
+                result["error"] = f"{last['metodo']} detenido: {last['abortado']}"
+            else:
+                result["error"] = lines[-1] if lines else f"{step} sin salida"
+    except OSError as exc:
+        result["error"] = str(exc)
+
+    result["segundos"] = round(time.monotonic() - start, 2)
+    return result
+
+
+def print_batch_summary(results: list[dict]) -> None:
+    print()
+    print("=" * 72)
+    print(f"  {'Archivo':<28} {'Estado':<9} {'Diagnostico':<11} {'Metodo':<11} {'Tiempo':>7}")
+    print("-" * 72)
+    for result in results:
+        name = Path(result["archivo"]).name
+        if len(name) > 28:
+            name = name[:25] + "..."
+        print(f"  {name:<28} {result['estado']:<9} {result['estrategia']:<11} "
+              f"{result['metodo'] or '-':<11} {result['segundos']:>6.1f}s")
+    print("-" * 72)
+
+    repaired = [r for r in results if r["estado"] == "reparado"]
+    methods: dict[str, int] = {}
+    for result in repaired:
+        methods[result["metodo"]] = methods.get(result["metodo"], 0) + 1
+    print(f"  Reparados: {len(repaired)} de {len(results)}")
+    if methods:
+        print("  Por metodo: " + ", ".join(f"{m} {n}" for m, n in sorted(methods.items())))
+    failed = [r for r in results if r["estado"] != "reparado"]
+    for result in failed:
+        print_warn(f"{Path(result['archivo']).name}: {result['error'] or 'sin detalle'}")
+    print("=" * 72)
+
+
+def write_batch_report(
+    report_path: Path,
+    reference: Path,
+    folder: Path,
+    jobs: int,
+    elapsed: float,
+    results: list[dict],
+    profile: dict | None = None,
+) -> None:
+    repaired = [r for r in results if r["estado"] == "reparado"]
+    report = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "referencia": str(reference),
+        "perfil_referencia": profile,
+        "carpeta": str(folder),
+        "procesos": jobs,
+        "segundos": round(elapsed, 2),
+        "resumen": {
+            "total": len(results),
+            "reparados": len(repaired),
+            "fallidos": len(results) - len(repaired),
+        },
+        "archivos": results,
+    }
+    with report_path.open("w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2, ensure_ascii=False)
+
+
+def repair_batch(
+    reference: Path, folder: Path, *, jobs: int = BATCH_DEFAULT_JOBS, report_path: Path | None = None
+) -> list[dict]:
+    """
+    Repara todos los videos de una carpeta con la misma referencia. Como
+    maximo `jobs` archivos a la vez, cada uno con su propio untrunc/ffmpeg.
+    """
+    ffmpeg, untrunc = ensure_dependencies(interactive=False)
+    if not ffmpeg and not untrunc:
+        print_err("No hay ni untrunc ni ffmpeg disponibles.")
+        return []
+    ffprobe = find_ffprobe(ffmpeg)
+
+    files = collect_batch_files(folder, reference)
+    if not files:
+        print_warn(f"No se encontraron videos para reparar en: {folder}")
+        return []
+
+    jobs = max(1, min(jobs, len(files)))
+    print()
+    print_info(f"Referencia: {reference}")
+    print_info(f"Carpeta:    {folder}")
+    print_info(f"{len(files)} video(s), {jobs} en paralelo")
+
+    # La referencia se analiza una vez para todo el lote (y queda en cache)
+    profile = None
+    try:
+        profile, cached = reference_profile(reference)
+        print_info(f"Perfil de la referencia{' (cache)' if cached else ''}: {describe_profile(profile)}")
+        if profile["moov"] != "completo":
+            print_warn("La referencia no tiene un indice (moov) completo; untrunc puede fallar.")
+    except OSError as exc:
+        print_warn(f"No se pudo analizar la referencia: {exc}")
+    print()
+
+    start = time.monotonic()
+    results: dict[Path, dict] = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(repair_batch_item, reference, corrupt, ffmpeg, untrunc, ffprobe, profile): corrupt
+            for corrupt in files
+        }
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                corrupt = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:  # un error inesperado no detiene el lote
+                    result = {"archivo": str(corrupt), "estado": "fallido", "estrategia": "-",
+                              "metodo": None, "intentos": [], "segundos": 0.0, "error": str(exc)}
+                results[corrupt] = result
+                label = "[OK]" if result["estado"] == "reparado" else "[ERROR]"
+                print(f"[{done}/{len(files)}] {label} {corrupt.name}"
+                      f" ({result['metodo'] or 'sin reparar'}, {result['segundos']:.1f}s)")
+        except KeyboardInterrupt:
+            for future in futures:
+                future.cancel()
+            print_warn("Lote interrumpido: se esperan los procesos en curso...")
+            raise
+    elapsed = time.monotonic() - start
+    if profile:
+        # Los hilos solo leyeron el perfil; lo aprendido se aplica una vez aqui
+        learn_skip_preference(profile, [r.get("necesita_s") for r in results.values()])
+        update_reference_profile(profile)
+
+    ordered = [results[corrupt] for corrupt in files]
+    print_batch_summary(ordered)
+    print_info(f"Tiempo total: {elapsed:.1f}s")
+
+    if report_path is None:
+        report_path = folder / f"{BATCH_REPORT_PREFIX}{datetime.now():%Y%m%d_%H%M%S}.json"
+    try:
+        write_batch_report(report_path, reference, folder, jobs, elapsed, ordered, profile)
+        print_ok(f"Reporte JSON: {report_path}")
+    except OSError as exc:
+        print_err(f"No se pudo escribir el reporte: {exc}")
+    return ordered
+
+
 # -----------------------------------------------------------------------------
 # Menus
 # -----------------------------------------------------------------------------
@@ -779,6 +1731,55 @@ def menu_repair() -> None:
     pause()
 
 
+def prompt_folder_path(label: str) -> Path | None:
+    while True:
+        raw = input(f"{label}: ").strip()
+        if not raw:
+            print_warn("Debes ingresar una ruta.")
+            continue
+        try:
+            path = normalize_path(raw)
+        except OSError as exc:
+            print_err(f"Ruta invalida: {exc}")
+            continue
+        if not path.is_dir():
+            print_err(f"No se encontro la carpeta: {path}")
+            continue
+        return path
+
+
+def menu_repair_batch() -> None:
+    print()
+    print_info("Selecciona el video de REFERENCIA (sano, del mismo origen).")
+    reference = prompt_file_path("Ruta del video de referencia")
+    if not reference:
+        return
+
+    print()
+    print_info("Selecciona la CARPETA con los videos corruptos.")
+    folder = prompt_folder_path("Ruta de la carpeta")
+    if not folder:
+        return
+
+    files = collect_batch_files(folder, reference)
+    print_info(f"Se encontraron {len(files)} video(s) para reparar.")
+    if not files:
+        pause()
+        return
+
+    raw = input(f"Procesos en paralelo [{BATCH_DEFAULT_JOBS}]: ").strip()
+    jobs = int(raw) if raw.isdigit() and int(raw) > 0 else BATCH_DEFAULT_JOBS
+
+    confirm = input("Iniciar reparacion por lotes? (s/n): ").strip().lower()
+    if confirm not in ("s", "si", "y", "yes"):
+        print_warn("Reparacion cancelada.")
+        pause()
+        return
+
+    repair_batch(reference, folder, jobs=jobs)
+    pause()
+
+
 def show_main_menu() -> None:
     while True:
         clear_screen()
@@ -796,20 +1797,23 @@ def show_main_menu() -> None:
 
         print("Menu principal:")
         print("  1. Reparar video truncado/corrupto")
-        print("  2. Verificar / instalar dependencias")
-        print("  3. Configurar ruta de untrunc")
-        print("  4. Salir")
+        print("  2. Reparar carpeta completa (lote)")
+        print("  3. Verificar / instalar dependencias")
+        print("  4. Configurar ruta de untrunc")
+        print("  5. Salir")
         print()
 
-        choice = input("Selecciona una opcion (1-4): ").strip()
+        choice = input("Selecciona una opcion (1-5): ").strip()
 
         if choice == "1":
             menu_repair()
         elif choice == "2":
-            menu_check_dependencies()
+            menu_repair_batch()
         elif choice == "3":
-            menu_configure_untrunc()
+            menu_check_dependencies()
         elif choice == "4":
+            menu_configure_untrunc()
+        elif choice == "5":
             print_info("Saliendo...")
             sys.exit(0)
         else:
@@ -829,6 +1833,11 @@ def parse_cli_args() -> dict:
         "untrunc_path": None,
         "install_deps": False,
         "no_menu": False,
+        "verify": None,
+        "diagnose": None,
+        "batch": None,
+        "jobs": BATCH_DEFAULT_JOBS,
+        "report": None,
     }
     argv = sys.argv[1:]
     i = 0
@@ -840,7 +1849,10 @@ def parse_cli_args() -> dict:
             print("  python 06_reparar_video_mp4.py")
             print("  python 06_reparar_video_mp4.py --install-deps")
             print("  python 06_reparar_video_mp4.py --reference OK.mp4 --corrupt BAD.mp4")
+            print("  python 06_reparar_video_mp4.py --reference OK.mp4 --batch CARPETA [--jobs 4] [--report lote.json]")
             print("  python 06_reparar_video_mp4.py --untrunc-path C:\\tools\\untrunc.exe")
+            print("  python 06_reparar_video_mp4.py --verify BAD_fixed.mp4")
+            print("  python 06_reparar_video_mp4.py --diagnose BAD.mp4")
             sys.exit(0)
         elif token == "--install-deps":
             args["install_deps"] = True
@@ -855,6 +1867,24 @@ def parse_cli_args() -> dict:
         elif token == "--untrunc-path" and i + 1 < len(argv):
             i += 1
             args["untrunc_path"] = argv[i]
+        elif token == "--verify" and i + 1 < len(argv):
+            i += 1
+            args["verify"] = argv[i]
+        elif token == "--diagnose" and i + 1 < len(argv):
+            i += 1
+            args["diagnose"] = argv[i]
+        elif token == "--batch" and i + 1 < len(argv):
+            i += 1
+            args["batch"] = argv[i]
+        elif token == "--jobs" and i + 1 < len(argv):
+            i += 1
+            if not argv[i].isdigit() or int(argv[i]) < 1:
+                print_err("--jobs debe ser un entero mayor que 0.")
+                sys.exit(1)
+            args["jobs"] = int(argv[i])
+        elif token == "--report" and i + 1 < len(argv):
+            i += 1
+            args["report"] = argv[i]
         i += 1
     return args
 
@@ -889,6 +1919,36 @@ def main() -> None:
         ensure_dependencies(interactive=False)
         sys.exit(0)
 
+    if args["verify"]:
+        try:
+            output = normalize_path(args["verify"])
+        except OSError as exc:
+            print_err(str(exc))
+            sys.exit(1)
+        sys.exit(0 if check_verification_record(output) else 1)
+
+    if args["diagnose"]:
+        try:
+            print_diagnosis(diagnose_video(normalize_path(args["diagnose"])))
+        except OSError as exc:
+            print_err(str(exc))
+            sys.exit(1)
+        sys.exit(0)
+
+    if args["reference"] and args["batch"]:
+        try:
+            reference = normalize_path(args["reference"])
+            folder = normalize_path(args["batch"])
+            report = normalize_path(args["report"]) if args["report"] else None
+        except OSError as exc:
+            print_err(str(exc))
+            sys.exit(1)
+        if not reference.is_file() or not folder.is_dir():
+            print_err("La referencia o la carpeta no existen.")
+            sys.exit(1)
+        results = repair_batch(reference, folder, jobs=args["jobs"], report_path=report)
+        sys.exit(0 if results and all(r["estado"] == "reparado" for r in results) else 1)
+
     if args["reference"] and args["corrupt"]:
         try:
             reference = normalize_path(args["reference"])